@@ -0,0 +1,929 @@
+"""
+Greedy Algorithm Assignment - Benchmarks
+
+Run with:  python benchmark.py <name> [--nodes N ...]
+
+Each benchmark prints a short table; sizes can be changed on the command line.
+The "suite" benchmark also writes its measurements as JSON (--output) and
+compares them against an earlier run (--compare).
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+import greedy_approach
+import greedy_engine
+import instrumentation
+from main import Node, NodeStore, Edge, RoadGraph, calculate_travel_cost, get_neighbors
+from exact_solver import exact_route, road_neighborhood
+from fair_routing import fair_route, first_service_times
+from fleet import partition_customers, plan_fleet
+from grasp import grasp_route
+from live_route import LiveRoute
+from road_dataset import open_dataset, write_dataset
+from local_search import improve_route
+from lookahead import lookahead_route
+from mn_dataset import MN_DEPOT, MN_GRAPH
+from multi_depot import plan_depots
+from road_network import RoadNetwork
+from route_audit import audit_routes
+from planning_service import PlanningService
+from priority_schedule import TimeWindows, priority_route, schedule_metrics
+from route_cache import RouteCache, graph_fingerprint
+from spatial_index import SpatialIndex, spatial_greedy_route
+from shortest_paths import ShortestPathCache
+from time_costs import TimeCosts, rush_hour_profile
+from tip_uncertainty import TipModel, evaluate_routes
+from travel_costs import TravelCosts
+from greedy_approach import greedy_company_route, greedy_driver_route, greedy_ethical_route
+from greedy_engine import CompanyProfit, DriverEarnings, FatigueEarnings, NodeArrays, greedy_route
+from sweep import sweep_thresholds, threshold_grid
+from synthetic_dataset import generate_instance, instance_summary
+from worker_pool import default_workers
+
+
+def _road_graph(n: int, seed: int = 0) -> RoadGraph:
+    """Seeded synthetic road network with n nodes (see synthetic_dataset.py)."""
+    return generate_instance(n, seed).graph
+
+
+def _best_of(fn: Callable[[], object], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_cache(sizes: List[int]):
+    """Route cache: routing (miss) versus fingerprint + lookup (hit), for a RoadGraph,
+    and hits for the same network passed as a plain edge list."""
+    print(f"{'nodes':>9} {'miss (s)':>9} {'hit (s)':>9} {'fingerprint (s)':>16} {'hit w/ known fp (ms)':>21} "
+          f"{'list hit (ms)':>14}")
+    for n in sizes:
+        graph = _road_graph(n)
+        depot = graph.nodes[0]
+        cache = RouteCache()
+        start = time.perf_counter()
+        cache.route("driver", graph.nodes, depot, graph, recover=True)
+        miss = time.perf_counter() - start
+        hit = _best_of(lambda: cache.route("driver", graph.nodes, depot, graph, recover=True))
+        fingerprint = graph_fingerprint(graph)
+        known = _best_of(lambda: cache.route("driver", graph.nodes, depot, graph,
+                                             fingerprint=fingerprint, recover=True))
+        # A fresh hash, as after a node change (the graph keeps its fingerprint otherwise)
+        rehash = _best_of(lambda: (graph.derived.pop("fingerprint", None), graph_fingerprint(graph)))
+        nodes = list(graph.nodes)
+        edges = [Edge(nodes[i], nodes[j]) for i in range(n) for j in graph.neighbor_indices(i) if i < j]
+        cache.route("driver", nodes, depot, edges, recover=True)
+        listed = _best_of(lambda: cache.route("driver", nodes, depot, edges, recover=True))
+        print(f"{n:>9} {miss:>9.3f} {hit:>9.3f} {rehash:>16.3f} "
+              f"{known * 1e3:>21.3f} {listed * 1e3:>14.3f}")
+
+
+def bench_closures(sizes: List[int], changes: int = 2_000):
+    """Road closures/reopenings on a RoadNetwork: per-change cost and tree survival."""
+    print(f"{'nodes':>9} {'changes':>8} {'us/change':>10} {'trees kept':>11} {'dropped':>8} "
+          f"{'us/impact':>10}")
+    rng = random.Random(2)
+    for n in sizes:
+        instance = generate_instance(n)
+        edges = instance.edges()
+        network = RoadNetwork(edges, instance.node_list())
+        route, _ = greedy_driver_route(None, instance.depot, instance.graph, recover=True)
+        network.track("vehicle", route, driven=1)
+        for _ in range(64):
+            # Warm the tree cache with queries from random sources
+            network.distance(route[rng.randrange(len(route))], route[rng.randrange(len(route))])
+        closed = []
+        start = time.perf_counter()
+        for _ in range(changes):
+            if closed and rng.random() < 0.5:
+                network.add_edge(closed.pop())
+            else:
+                edge = edges[rng.randrange(len(edges))]
+                if network.has_road(edge.u, edge.v):
+                    network.remove_edge(edge.u, edge.v)
+                    closed.append(edge)
+        per_change = (time.perf_counter() - start) / changes
+        impact = _best_of(lambda: network.impact("vehicle"), repeat=1)
+        print(f"{n:>9} {changes:>8} {per_change * 1e6:>10.1f} {network.cached_trees:>11} "
+              f"{network.trees_dropped:>8} {impact * 1e6:>10.0f}")
+
+
+def bench_costs(sizes: List[int]):
+    """Per-pair distance_to/calculate_travel_cost versus the batched cost store."""
+    print(f"{'nodes':>9} {'hops':>9} {'per-pair (s)':>13} {'batched (s)':>12} {'speedup':>8}")
+    for n in sizes:
+        graph = _road_graph(n)
+
+        def per_pair():
+            nodes = graph.nodes
+            for i, node in enumerate(nodes):
+                for j in graph.neighbor_indices(i):
+                    calculate_travel_cost(node.distance_to(nodes[j]))
+
+        slow = _best_of(per_pair)
+        fast = _best_of(lambda: TravelCosts(graph))
+        print(f"{n:>9} {len(graph.targets):>9} {slow:>13.4f} {fast:>12.4f} {slow / fast:>7.1f}x")
+
+
+def bench_routes(sizes: List[int]):
+    """Wall time of the three greedy strategies on a shared RoadGraph."""
+    print(f"{'nodes':>9} {'company (s)':>12} {'driver (s)':>11} {'ethical (s)':>12}")
+    for n in sizes:
+        graph = _road_graph(n)
+        depot = graph.nodes[0]
+        TravelCosts.for_graph(graph)
+        times = [_best_of(lambda: strategy(graph.nodes, depot, graph))
+                 for strategy in (greedy_company_route, greedy_driver_route, greedy_ethical_route)]
+        print(f"{n:>9} " + " ".join(f"{t:>11.4f}" for t in times))
+
+
+def bench_recovery(sizes: List[int]):
+    """Full-coverage routes with dead-end recovery, sharing one shortest-path cache."""
+    print(f"{'nodes':>9} {'served':>8} {'company (s)':>12} {'driver (s)':>11} "
+          f"{'ethical (s)':>12} {'trees':>6} {'hits':>7}")
+    for n in sizes:
+        graph = _road_graph(n)
+        depot = graph.nodes[0]
+        times = []
+        for strategy in (greedy_company_route, greedy_driver_route, greedy_ethical_route):
+            start = time.perf_counter()
+            route, _ = strategy(graph.nodes, depot, graph, recover=True)
+            times.append(time.perf_counter() - start)
+        cache = ShortestPathCache.for_graph(graph)
+        served = len({node.id for node in route}) - 1
+        print(f"{n:>9} {served:>8} " + " ".join(f"{t:>11.3f}" for t in times)
+              + f" {cache.misses:>6} {cache.hits:>7}")
+
+
+def bench_dataset(sizes: List[int]):
+    """Building a RoadGraph from Node/Edge objects versus mapping a binary dataset file."""
+    print(f"{'nodes':>9} {'roads':>9} {'file MB':>8} {'objects (s)':>12} {'mapped (ms)':>12} "
+          f"{'first route (s)':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            instance = generate_instance(n)
+            path = os.path.join(tmp, f"{n}.roads")
+            write_dataset(path, instance.graph)
+            nodes, edges = instance.node_list(), instance.edges()
+            objects = _best_of(lambda: RoadGraph(edges, nodes), repeat=1)
+            mapped = _best_of(lambda: open_dataset(path))
+            dataset = open_dataset(path)
+            start = time.perf_counter()
+            greedy_driver_route(dataset.nodes, dataset.nodes[0], dataset.graph)
+            first_route = time.perf_counter() - start
+            print(f"{n:>9} {dataset.graph.num_edges:>9} {os.path.getsize(path) / 1e6:>8.1f} "
+                  f"{objects:>12.3f} {mapped * 1e3:>12.3f} {first_route:>16.3f}")
+
+
+def bench_fairness(sizes: List[int]):
+    """Balance and fairness rules on the region frontier versus recovered
+    driver routes: earnings, time, and minutes until each region's first stop."""
+    for n in sizes:
+        graph = _road_graph(n)
+        depot = graph.nodes[0]
+        regions = NodeArrays.for_graph(graph).regions
+        if n == sizes[0]:
+            print(f"{'nodes':>9} {'rule':>9} {'total':>11} {'time (s)':>9} {'preferred':>10} "
+                  + " ".join(f"{name[:9] + ' (min)':>15}" for name in regions))
+        start = time.perf_counter()
+        route, total = greedy_driver_route(graph.nodes, depot, graph, recover=True)
+        rows = [("driver", total, time.perf_counter() - start, None, first_service_times(route, graph))]
+        for rule in ("balance", "fairness"):
+            start = time.perf_counter()
+            report = fair_route(graph, depot, rule, recover=True)
+            rows.append((rule, report.total, time.perf_counter() - start, report.preferred_share,
+                         report.first_service))
+        for rule, total, elapsed, share, first in rows:
+            kept = f"{share:.1%}" if share is not None else "-"
+            print(f"{n:>9} {rule:>9} {total:>11.2f} {elapsed:>9.3f} {kept:>10} "
+                  + " ".join(f"{first[name]:>15.1f}" for name in regions))
+
+
+def bench_fleet(sizes: List[int], vehicles: int = 8):
+    """Fleet planning time by worker count (partitioning, then one task per vehicle)."""
+    counts = sorted({1, default_workers()} | {w for w in (2, 4, 8, 16) if w < default_workers()})
+    print(f"{'nodes':>9} {'vehicles':>9} {'workers':>8} {'partition (s)':>14} {'plan (s)':>9} "
+          f"{'served':>8} {'customers/s':>12}")
+    for n in sizes:
+        graph = _road_graph(n)
+        depot = graph.nodes[0]
+        start = time.perf_counter()
+        partition_customers(graph, vehicles)
+        partition = time.perf_counter() - start
+        for workers in counts:
+            start = time.perf_counter()
+            plan = plan_fleet(graph, depot, vehicles, workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"{n:>9} {vehicles:>9} {workers:>8} {partition:>14.3f} {elapsed:>9.3f} "
+                  f"{plan.served:>8} {plan.served / elapsed:>12.0f}")
+
+
+def bench_grasp(sizes: List[int], starts: int = 64):
+    """Multi-start randomized greedy: best driver total and time by worker count."""
+    counts = sorted({1, default_workers()} | {w for w in (2, 4, 8, 16) if w < default_workers()})
+    print(f"{'nodes':>9} {'starts':>7} {'workers':>8} {'greedy':>11} {'best':>11} "
+          f"{'best start':>11} {'time (s)':>9} {'starts/s':>9}")
+    for n in sizes:
+        graph = _road_graph(n)
+        depot = graph.nodes[0]
+        greedy = greedy_driver_route(graph.nodes, depot, graph)[1]
+        for workers in counts:
+            result = grasp_route(graph, depot, starts=starts, workers=workers)
+            print(f"{n:>9} {starts:>7} {workers:>8} {greedy:>11.2f} {result.total:>11.2f} "
+                  f"{result.best_start:>11} {result.elapsed:>9.3f} {starts / result.elapsed:>9.1f}")
+
+
+def bench_sweep(sizes: List[int], grid: int = 16):
+    """Ethical-threshold grid sweep (grid x grid combinations) on recovered routes."""
+    combinations = threshold_grid(np.linspace(0.5, 12.0, grid), np.linspace(0.25, 6.0, grid))
+    print(f"{'nodes':>9} {'combos':>7} {'workers':>8} {'time (s)':>9} {'combos/s':>9} "
+          f"{'baseline':>11} {'best delta':>11} {'pareto':>7}")
+    for n in sizes:
+        graph = _road_graph(n)
+        start = time.perf_counter()
+        result = sweep_thresholds(graph, graph.nodes[0], combinations, recover=True)
+        elapsed = time.perf_counter() - start
+        print(f"{n:>9} {len(result):>7} {default_workers():>8} {elapsed:>9.3f} "
+              f"{len(result) / elapsed:>9.1f} {result.baseline:>11.2f} "
+              f"{result.table['delta'].max():>11.2f} {len(result.pareto):>7}")
+
+
+def bench_schedule(sizes: List[int]):
+    """Priority/time-window scheduler versus recovered driver routes, on windows
+    scaled so the driver route's finish time spans the five priority levels."""
+    print(f"{'nodes':>9} {'strategy':>9} {'total':>11} {'late':>7} {'lateness (h)':>13} "
+          f"{'violations':>11} {'inversions':>11} {'time (s)':>9}")
+    for n in sizes:
+        graph = _road_graph(n)
+        depot = graph.nodes[0]
+        start = time.perf_counter()
+        route, total = greedy_driver_route(graph.nodes, depot, graph, recover=True)
+        driver_time = time.perf_counter() - start
+        windows = TimeWindows.from_priority(graph, schedule_metrics(route, total, graph).finish_time / 5)
+        start = time.perf_counter()
+        scheduled = priority_route(graph, depot, windows=windows)
+        rows = [("driver", schedule_metrics(route, total, graph, windows), driver_time),
+                ("priority", scheduled, time.perf_counter() - start)]
+        for name, report, elapsed in rows:
+            print(f"{n:>9} {name:>9} {report.total:>11.2f} {report.late_stops:>7} "
+                  f"{report.total_lateness / 60:>13.1f} {report.priority_violations:>11} "
+                  f"{report.priority_inversions:>11} {elapsed:>9.3f}")
+
+
+def bench_exact(sizes: List[int], market: int = 10_000):
+    """Optimality gap of recovered greedy routes: road neighborhoods of the given
+    sizes around a market's first depot, and the Minnesota instance."""
+    print(f"{'instance':>9} {'objective':>10} {'greedy':>10} {'optimal':>10} {'gap %':>7} "
+          f"{'proven':>7} {'states':>10} {'peak MiB':>9} {'time (s)':>9}")
+    graph = _road_graph(market)
+    cases = [(str(n), road_neighborhood(graph, graph.nodes[0], n)) for n in sizes]
+    for name, sub in cases + [("mn", MN_GRAPH)]:
+        depot = MN_DEPOT if sub is MN_GRAPH else sub.nodes[0]
+        for label, objective in (("company", CompanyProfit()), ("driver", DriverEarnings())):
+            greedy = greedy_route(sub, depot, objective, recover=True)[1]
+            result = exact_route(sub, depot, objective)
+            print(f"{name:>9} {label:>10} {greedy:>10.2f} {result.total:>10.2f} "
+                  f"{100 * result.gap(greedy):>7.2f} {'yes' if result.optimal else 'no':>7} "
+                  f"{result.states:>10} {result.peak_bytes / 2 ** 20:>9.1f} {result.elapsed:>9.3f}")
+
+
+async def _load_test(graph: RoadGraph, work: list, clients: int) -> tuple:
+    """Send every (depot, strategy) request through a PlanningService from concurrent clients."""
+    async with PlanningService(graph) as service:
+        pending = iter(work)
+
+        async def client():
+            for depot, strategy in pending:
+                await service.plan(depot, strategy)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        return len(work) / (time.perf_counter() - start), service.stats()
+
+
+def bench_service(sizes: List[int], requests: int = 2_000, depots: int = 64):
+    """asyncio planning service under load from in-process clients, against planning
+    the same requests one after another with direct calls."""
+    print(f"{'nodes':>9} {'clients':>8} {'req/s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} "
+          f"{'mean batch':>11} {'dedup':>7} {'max queue':>10}")
+    for n in sizes:
+        graph = _road_graph(n)
+        rng = random.Random(0)
+        starts = [graph.nodes[i] for i in rng.sample(range(len(graph)), min(depots, len(graph)))]
+        work = [(rng.choice(starts), rng.choice(sorted(STRATEGIES))) for _ in range(requests)]
+        for depot, strategy in work[:depots]:
+            STRATEGIES[strategy](graph.nodes, depot, graph)
+        start = time.perf_counter()
+        for depot, strategy in work:
+            STRATEGIES[strategy](graph.nodes, depot, graph)
+        print(f"{n:>9} {'direct':>8} {requests / (time.perf_counter() - start):>9.0f}")
+        for clients in (1, 16, 256):
+            rate, stats = asyncio.run(_load_test(graph, work, clients))
+            print(f"{n:>9} {clients:>8} {rate:>9.0f} {stats['p50_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+                  f"{stats['mean_batch']:>11.1f} {stats['deduplicated']:>7} {stats['max_queue_depth']:>10}")
+
+
+def bench_depots(sizes: List[int], counts=(1, 4, 16)):
+    """Company routes from several depots given as an edge list: greedy_company_route per
+    depot (re-indexing the edges every call; its routes may stop at the other depots)
+    versus plan_depots with every depot competing for all customers, and partitioned."""
+    print(f"{'nodes':>9} {'depots':>7} {'per depot (s)':>14} {'competing (s)':>14} "
+          f"{'partitioned (s)':>16} {'best depot':>11} {'best total':>11} {'partitioned total':>18}")
+    workers = default_workers()
+    for n in sizes:
+        for count in counts:
+            instance = generate_instance(n)
+            store = instance.nodes
+            # Spread extra depots over the customers before any arrays are gathered
+            for row in np.linspace(0, n - 1, count, endpoint=False).astype(int)[1:].tolist():
+                store.is_depot[row] = 1
+            store.touch("is_depot")
+            depots = [node for node in store if node.is_depot]
+            edges = instance.edges()
+            nodes = list(store)
+
+            start = time.perf_counter()
+            for depot in depots:
+                greedy_company_route(nodes, depot, edges, recover=True)
+            separate = time.perf_counter() - start
+            start = time.perf_counter()
+            plan = plan_depots(edges, objective=CompanyProfit(), nodes=nodes, workers=workers,
+                               partition=False)
+            competing = time.perf_counter() - start
+            start = time.perf_counter()
+            shared = plan_depots(edges, objective=CompanyProfit(), nodes=nodes, workers=workers)
+            partitioned = time.perf_counter() - start
+            print(f"{n:>9} {count:>7} {separate:>14.3f} {competing:>14.3f} {partitioned:>16.3f} "
+                  f"{plan.best.depot.id:>11} {plan.best.total:>11.2f} {shared.total:>18.2f}")
+
+
+def bench_spatial(sizes: List[int], radius: float = 3.0, queries: int = 1_000, k: int = 8):
+    """Radius and top-k candidate queries: grid index versus a NumPy scan of every
+    customer, and the ethical strategy with the index as its candidate generator."""
+    print(f"{'nodes':>9} {'build (s)':>10} {'radius q/s':>11} {'scan q/s':>10} "
+          f"{'top-k q/s':>10} {'scan q/s':>10} {'route (s)':>10} {'stops':>7} {'total':>11}")
+    for n in sizes:
+        graph = _road_graph(n)
+        travel = TravelCosts.for_graph(graph)
+        rewards = NodeArrays.for_graph(graph).fees
+        start = time.perf_counter()
+        index = SpatialIndex.for_customers(graph, radius)
+        build = time.perf_counter() - start
+        points = np.random.default_rng(0).integers(len(graph), size=queries)
+        xs, ys = travel.x[points].tolist(), travel.y[points].tolist()
+        best = float(rewards.max())
+
+        def scan_radius():
+            for x, y in zip(xs, ys):
+                distances = np.hypot(travel.x - x, travel.y - y)
+                np.flatnonzero(distances <= radius)
+
+        def scan_top_k():
+            for x, y in zip(xs, ys):
+                scores = rewards - np.hypot(travel.x - x, travel.y - y) * travel.base_cost_per_mile
+                np.argpartition(-scores, k)[:k]
+
+        rates = [queries / _best_of(fn) for fn in (
+            lambda: [index.within(x, y, radius) for x, y in zip(xs, ys)], scan_radius,
+            lambda: [index.top_k(x, y, k, rewards, travel.base_cost_per_mile, best_value=best)
+                     for x, y in zip(xs, ys)], scan_top_k)]
+        start = time.perf_counter()
+        route, total = spatial_greedy_route(graph, graph.nodes[0], FatigueEarnings(), radius, recover=True)
+        elapsed = time.perf_counter() - start
+        print(f"{n:>9} {build:>10.4f} {rates[0]:>11.0f} {rates[1]:>10.0f} {rates[2]:>10.0f} "
+              f"{rates[3]:>10.0f} {elapsed:>10.3f} {len(route) - 2:>7} {total:>11.2f}")
+
+
+def bench_time_costs(sizes: List[int]):
+    """Recovered driver routes with flat costs versus the time-dependent cost tensor
+    (all roads flat, then half of them on a rush-hour profile, departing at 7:00),
+    plus the time to build the tensor and to update a profile."""
+    print(f"{'nodes':>9} {'build (s)':>10} {'flat (s)':>9} {'timed flat (s)':>15} {'timed rush (s)':>15} "
+          f"{'same route':>11} {'update (ms)':>12} {'rush total':>11}")
+    for n in sizes:
+        instance = generate_instance(n)
+        graph = instance.graph
+        depot = graph.nodes[0]
+        objective = DriverEarnings()
+        flat = lambda: greedy_route(graph, depot, objective, recover=True)
+        route, _ = flat()  # warms the shortest-path cache for every run below
+        start = time.perf_counter()
+        costs = TimeCosts(graph)
+        build = time.perf_counter() - start
+        timed = lambda: greedy_route(graph, depot, objective, recover=True, time_costs=costs, departure=420.0)
+        flat_time = _best_of(flat, repeat=1)
+        start = time.perf_counter()
+        same = [node.id for node in timed()[0]] == [node.id for node in route]
+        timed_time = time.perf_counter() - start
+
+        costs.set_profile("rush", rush_hour_profile())
+        costs.set_roads(instance.edges()[::2], profile="rush")
+        start = time.perf_counter()
+        _, rush_total = timed()
+        rush_time = time.perf_counter() - start
+        start = time.perf_counter()
+        costs.set_profile("rush", rush_hour_profile(peak=2.0))
+        update = time.perf_counter() - start
+        print(f"{n:>9} {build:>10.3f} {flat_time:>9.3f} {timed_time:>15.3f} {rush_time:>15.3f} "
+              f"{str(same):>11} {update * 1000:>12.2f} {rush_total:>11.2f}")
+
+
+def bench_tips(sizes: List[int], scenarios: int = 10_000, loop_scenarios: int = 20):
+    """Monte Carlo tip scenarios over the three recovered strategies' routes: batched
+    evaluation versus a per-scenario Python loop of earnings sums and route costs."""
+    print(f"{'nodes':>9} {'routes':>7} {'stops':>9} {'batched/s':>10} {'loop/s':>9} "
+          f"{'speedup':>8} {'driver mean':>12} {'q05':>11} {'P(eth>drv)':>11}")
+    model = TipModel()
+    for n in sizes:
+        graph = _road_graph(n)
+        depot = graph.nodes[0]
+        routes = {name: STRATEGIES[name](graph.nodes, depot, graph, recover=True)[0]
+                  for name in ("driver", "company", "ethical")}
+        start = time.perf_counter()
+        report = evaluate_routes(graph, routes, scenarios, model)
+        batched = scenarios / (time.perf_counter() - start)
+
+        arrays = NodeArrays.for_graph(graph)
+        travel = TravelCosts.for_graph(graph)
+        rng = np.random.default_rng(0)
+        start = time.perf_counter()
+        for _ in range(loop_scenarios):
+            rewards = model.sample(arrays.fees, arrays.tips, 1, rng)[0]
+            for route in routes.values():
+                served = {graph.index(node) for node in route} - {graph.index(depot)}
+                sum(float(rewards[i]) for i in served) - travel.route_cost(route)
+        loop = loop_scenarios / (time.perf_counter() - start)
+        driver = report.row("driver")
+        print(f"{n:>9} {len(routes):>7} {sum(map(len, routes.values())):>9} {batched:>10.0f} "
+              f"{loop:>9.1f} {batched / loop:>7.0f}x {driver['mean']:>12.2f} {driver['q05']:>11.2f} "
+              f"{report.row('ethical')['p_beat']:>11.3f}")
+
+
+def _random_walks(graph: RoadGraph, routes: int, stops: int, jump: float, seed: int = 0) -> List[List[Node]]:
+    """Depot-to-depot walks along roads that jump to a random node with probability jump."""
+    rng = random.Random(seed)
+    walks = []
+    for _ in range(routes):
+        walk = [0]
+        for _ in range(stops):
+            neighbors = graph.neighbor_indices(walk[-1])
+            if neighbors and rng.random() >= jump:
+                walk.append(rng.choice(neighbors))
+            else:
+                walk.append(rng.randrange(len(graph)))
+        walk.append(0)
+        walks.append([graph.nodes[i] for i in walk])
+    return walks
+
+
+def bench_audit(sizes: List[int], routes: int = 5_000, stops: int = 50):
+    """Auditing a batch of routes against the roads: one vectorized pass versus a
+    per-route loop of _route_cost plus a neighbor check for every hop."""
+    print(f"{'nodes':>9} {'routes':>7} {'hops':>9} {'audit (s)':>10} {'loop (s)':>9} "
+          f"{'speedup':>8} {'hops/s':>11} {'invalid':>8}")
+    for n in sizes:
+        graph = _road_graph(n)
+        walks = _random_walks(graph, routes, stops, jump=0.02)
+        audit_routes(graph, walks[:1])
+        start = time.perf_counter()
+        audit = audit_routes(graph, walks)
+        batched = time.perf_counter() - start
+
+        start = time.perf_counter()
+        invalid = 0
+        for walk in walks:
+            greedy_approach._route_cost(walk, graph)
+            invalid += any(b.id not in {node.id for node in graph.neighbors(a)}
+                           for a, b in zip(walk, walk[1:]) if a.id != b.id)
+        loop = time.perf_counter() - start
+        assert invalid == len(audit.invalid())
+        hops = routes * (stops + 1)
+        print(f"{n:>9} {routes:>7} {hops:>9} {batched:>10.3f} {loop:>9.3f} {loop / batched:>7.1f}x "
+              f"{hops / batched:>11.0f} {invalid:>8}")
+
+
+def _helper_scan(nodes: List[Node], graph: RoadGraph, neighbors: Callable, distance: Callable,
+                 cost: Callable) -> float:
+    """Baseline-style pass pricing every road of the given nodes through the helpers."""
+    total = 0.0
+    for node in nodes:
+        for other in neighbors(node, graph):
+            total += cost(distance(node, other))
+    return total
+
+
+def _unguarded_neighbors(node: Node, graph: RoadGraph) -> List[Node]:
+    return graph.neighbors(node)
+
+
+def _unguarded_distance(a: Node, b: Node) -> float:
+    return math.sqrt((a.x - b.x) ** 2 + (a.y - b.y) ** 2)
+
+
+def _unguarded_cost(distance: float, base_cost_per_mile: float = 0.50) -> float:
+    return distance * base_cost_per_mile
+
+
+def bench_instrumentation(sizes: List[int], scanned: int = 20_000):
+    """Recovered driver routes with instrumentation disabled, enabled, and disabled again;
+    then the main.py helpers with the profiler disabled versus copies without its check."""
+    print(f"{'nodes':>9} {'steps':>7} {'off (s)':>9} {'on (s)':>9} {'off again (s)':>14} "
+          f"{'on/off':>7} {'restored':>9}")
+    for n in sizes:
+        graph = _road_graph(n)
+        depot = graph.nodes[0]
+        originals = (greedy_approach.greedy_driver_route, greedy_engine._recover, ShortestPathCache.tree)
+        run = lambda: greedy_approach.greedy_driver_route(graph.nodes, depot, graph, recover=True)
+        run()
+        off = _best_of(run)
+        with instrumentation.Profiler() as prof:
+            on = _best_of(run)
+        off_again = _best_of(run)
+        restored = originals == (greedy_approach.greedy_driver_route, greedy_engine._recover,
+                                 ShortestPathCache.tree)
+        steps = (prof.calls["scoring"] + prof.calls["recovery"]) // 3
+        print(f"{n:>9} {steps:>7} {off:>9.4f} {on:>9.4f} {off_again:>14.4f} "
+              f"{on / off:>6.2f}x {str(restored):>9}")
+
+    print(f"\n{'nodes':>9} {'roads':>8} {'helper calls':>13} {'unguarded (s)':>14} {'off (s)':>9} "
+          f"{'overhead':>9} {'on (s)':>9}")
+    for n in sizes:
+        graph = _road_graph(n)
+        nodes = [graph.nodes[i] for i in range(min(n, scanned))]
+        helpers = lambda: _helper_scan(nodes, graph, get_neighbors, Node.distance_to,
+                                       calculate_travel_cost)
+        plain = _best_of(lambda: _helper_scan(nodes, graph, _unguarded_neighbors,
+                                              _unguarded_distance, _unguarded_cost))
+        off = _best_of(helpers)
+        with instrumentation.Profiler() as prof:
+            on = _best_of(helpers)
+        roads = sum(prof.neighbor_sizes.elements()) // 3
+        calls = sum(prof.calls[name] for name in ("get_neighbors", "distance_to",
+                                                  "calculate_travel_cost")) // 3
+        print(f"{n:>9} {roads:>8} {calls:>13} {plain:>14.4f} {off:>9.4f} "
+              f"{100 * (off / plain - 1):>8.1f}% {on:>9.4f}")
+
+
+def bench_lookahead(sizes: List[int], budget: float = 0.005):
+    """k-step lookahead driver routes, with and without recovery, under a per-dispatch
+    latency budget: earnings against depth 1, depth reached, table reuse, and how often
+    the searched move could not be shown to beat the one-step move in time."""
+    print(f"{'nodes':>9} {'recover':>8} {'depth':>6} {'total':>11} {'stops':>7} {'time (s)':>9} "
+          f"{'mean depth':>11} {'max dispatch (ms)':>18} {'expanded':>10} {'table hits':>11} "
+          f"{'kept greedy':>12} {'vs depth 1':>11}")
+    for n in sizes:
+        graph = _road_graph(n)
+        for recover in (False, True):
+            plain = None
+            for depth in (1, 2, 3, 4):
+                result = lookahead_route(graph, graph.nodes[0], depth, recover=recover, budget=budget)
+                plain = result.total if plain is None else plain
+                mean_depth = result.depths.mean() if len(result.depths) else 0.0
+                print(f"{n:>9} {'yes' if recover else 'no':>8} {depth:>6} {result.total:>11.2f} "
+                      f"{len(result.depths):>7} {result.elapsed:>9.3f} {mean_depth:>11.2f} "
+                      f"{result.max_dispatch * 1000:>18.2f} {result.expanded:>10} "
+                      f"{result.table['hits']:>11} {result.kept_greedy:>12} {result.total - plain:>+11.2f}")
+
+
+def bench_local_search(sizes: List[int]):
+    """Earnings gained by 2-opt/Or-opt on recovered driver routes under fixed time budgets."""
+    print(f"{'nodes':>9} {'budget (s)':>11} {'greedy':>11} {'improved':>11} {'moves':>6} {'used (s)':>9}")
+    for n in sizes:
+        graph = _road_graph(n)
+        route, total = greedy_driver_route(graph.nodes, graph.nodes[0], graph, recover=True)
+        for budget in (0.01, 0.1, 1.0):
+            start = time.perf_counter()
+            _, improved, trace = improve_route(route, graph, time_budget=budget)
+            used = time.perf_counter() - start
+            print(f"{n:>9} {budget:>11.2f} {total:>11.2f} {improved:>11.2f} {len(trace):>6} {used:>9.3f}")
+
+
+def bench_streaming(sizes: List[int], orders: int = 2_000):
+    """Per-order insertion time into a live route as the route grows."""
+    print(f"{'nodes':>9} {'route len':>10} {'orders':>7} {'placed':>7} {'us/order':>9}")
+    rng = random.Random(1)
+    for n in sizes:
+        graph = _road_graph(n)
+        route, _ = greedy_driver_route(graph.nodes, graph.nodes[0], graph, recover=True)
+        live = LiveRoute(route, graph)
+        stream = []
+        for k in range(orders):
+            # Each new customer sits between two consecutive planned stops
+            p = rng.randrange(1, len(route) - 1)
+            u, w = route[p], route[p + 1]
+            node = Node(n + k, (u.x + w.x) / 2 + rng.uniform(-0.2, 0.2),
+                        (u.y + w.y) / 2 + rng.uniform(-0.2, 0.2),
+                        delivery_fee=rng.uniform(8.0, 16.0), estimated_tip=rng.uniform(1.0, 5.0))
+            stream.append((node, [Edge(node, u), Edge(node, w)]))
+        start = time.perf_counter()
+        placed = sum(live.add_order(node, roads) is not None for node, roads in stream)
+        elapsed = time.perf_counter() - start
+        print(f"{n:>9} {len(route):>10} {orders:>7} {placed:>7} {elapsed / orders * 1e6:>9.1f}")
+
+
+class _DictNode:
+    """The original Node layout: a plain object with a per-instance __dict__."""
+
+    def __init__(self, node_id, x, y, delivery_fee, estimated_tip, region, priority, is_depot):
+        self.id = node_id
+        self.x = x
+        self.y = y
+        self.delivery_fee = delivery_fee
+        self.estimated_tip = estimated_tip
+        self.region = region
+        self.priority = priority
+        self.is_depot = is_depot
+
+
+def _traced_bytes(build: Callable[[], object]) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def bench_memory(sizes: List[int]):
+    """Bytes per node: __dict__ objects versus NodeStore rows and standalone Node(...)
+    views, all built from parsed rows."""
+    regions = [b"downtown", b"suburban", b"rural"]
+
+    def rows(n):
+        rng = random.Random(0)
+        for i in range(n):
+            # Fresh objects per row, as when the dataset is parsed from a file
+            yield (i, rng.uniform(-50, 50), rng.uniform(-50, 50), rng.uniform(8, 16),
+                   rng.uniform(1, 5), regions[i % 3].decode(), rng.randint(1, 5), i == 0)
+
+    print(f"{'nodes':>9} {'dict B/node':>12} {'store B/node':>13} {'ratio':>6} "
+          f"{'Node B/node':>12} {'ratio':>6}")
+    for n in sizes:
+        legacy = _traced_bytes(lambda: [_DictNode(*row) for row in rows(n)])
+
+        def columnar():
+            store = NodeStore()
+            for row in rows(n):
+                store.append(*row)
+            return store
+
+        compact = _traced_bytes(columnar)
+        views = _traced_bytes(lambda: [Node(*row) for row in rows(n)])
+        print(f"{n:>9} {legacy / n:>12.1f} {compact / n:>13.1f} {legacy / compact:>5.1f}x "
+              f"{views / n:>12.1f} {legacy / views:>5.1f}x")
+
+
+# ============================================================================
+# SUITE: machine-readable results for comparing runs
+# ============================================================================
+
+STRATEGIES = {
+    "company": greedy_company_route,
+    "driver": greedy_driver_route,
+    "ethical": greedy_ethical_route,
+}
+
+
+def _measure(fn: Callable[[], object], repeat: int, reset: Callable[[], None] = lambda: None):
+    """
+    Best wall time over repeat untraced runs, then the peak traced memory of one more.
+
+    Returns:
+        Tuple[float, int, object]: (seconds, peak bytes above the starting point, last result)
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        reset()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    reset()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def _run_metadata(seed: int, repeat: int) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "seed": seed,
+        "repeat": repeat,
+    }
+
+
+def run_suite(sizes: List[int], seed: int = 0, repeat: int = 3,
+              recover_limit: int = 10_000) -> dict:
+    """
+    Time every strategy on synthetic instances of each size.
+
+    For each size the instance is generated, indexed (cost store and node
+    arrays) and then routed by each strategy, with and without dead-end
+    recovery (recovery only up to recover_limit nodes). Every phase gets
+    its best wall time and its peak traced memory.
+
+    Args:
+        sizes (List[int]): Instance sizes in nodes
+        seed (int): Generator seed, the same for every size
+        repeat (int): Timed runs per strategy (the best is kept)
+        recover_limit (int): Largest size routed with recover=True
+
+    Returns:
+        dict: {"meta": run metadata, "instances": per-size summaries,
+        "results": one flat record per (nodes, phase, recover)}
+    """
+    results: List[dict] = []
+    instances: List[dict] = []
+
+    def record(n, phase, recover, seconds, peak, **extra):
+        row = {"nodes": n, "phase": phase, "recover": recover,
+               "seconds": seconds, "peak_bytes": peak}
+        row.update(extra)
+        results.append(row)
+        served = f"{extra['served']:>8} {extra['total']:>14.2f}" if extra else ""
+        print(f"{n:>9} {phase:>8} {'yes' if recover else 'no':>8} {seconds:>10.4f} "
+              f"{peak / 1e6:>10.1f} {served}", flush=True)
+
+    for n in sizes:
+        seconds, peak, instance = _measure(lambda: generate_instance(n, seed), 1)
+        record(n, "generate", False, seconds, peak)
+        instances.append(instance_summary(instance))
+        graph, depot = instance.graph, instance.depot
+
+        def build_index():
+            graph.derived.clear()
+            TravelCosts.for_graph(graph)
+            NodeArrays.for_graph(graph)
+
+        seconds, peak, _ = _measure(build_index, 1)
+        record(n, "index", False, seconds, peak)
+
+        for recover in (False, True):
+            if recover and n > recover_limit:
+                continue
+            # Recovery runs start from an empty shortest-path cache each time
+            reset = (lambda: graph.derived.pop("shortest_paths", None)) if recover else (lambda: None)
+            for name, strategy in STRATEGIES.items():
+                seconds, peak, (route, total) = _measure(
+                    lambda: strategy(instance.nodes, depot, graph, recover=recover),
+                    repeat if n < 1_000_000 else 1, reset)
+                record(n, name, recover, seconds, peak, route_length=len(route),
+                       served=len({node.id for node in route}) - 1, total=total)
+
+    return {"meta": _run_metadata(seed, repeat), "instances": instances, "results": results}
+
+
+_NOISE_FLOOR = 1e-3
+
+
+def _result_key(row: dict):
+    return row["nodes"], row["phase"], row["recover"]
+
+
+def compare_results(current: dict, previous: dict, tolerance: float = 0.10) -> List[dict]:
+    """
+    Match two suite runs record by record and report the change in time and memory.
+
+    Args:
+        current (dict): Output of run_suite
+        previous (dict): An earlier run_suite output (e.g. loaded from JSON)
+        tolerance (float): Relative slowdown beyond which a record is flagged
+
+    Returns:
+        List[dict]: One entry per shared record with time and peak-memory ratios
+        (current / previous), whether it regressed, and whether the route changed
+    """
+    earlier: Dict[tuple, dict] = {_result_key(row): row for row in previous["results"]}
+    report = []
+    for row in current["results"]:
+        old = earlier.get(_result_key(row))
+        if old is None:
+            continue
+        time_ratio = row["seconds"] / old["seconds"] if old["seconds"] else float("inf")
+        memory_ratio = row["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else float("inf")
+        report.append({
+            "nodes": row["nodes"], "phase": row["phase"], "recover": row["recover"],
+            "time_ratio": time_ratio, "memory_ratio": memory_ratio,
+            # Sub-millisecond phases are too noisy to flag on ratio alone
+            "regressed": (time_ratio > 1.0 + tolerance
+                          and row["seconds"] - old["seconds"] > _NOISE_FLOOR),
+            "route_changed": (row.get("total"), row.get("route_length"))
+                             != (old.get("total"), old.get("route_length")),
+        })
+    return report
+
+
+def bench_suite(sizes: List[int], output: Optional[str] = None, compare: Optional[str] = None,
+                seed: int = 0, tolerance: float = 0.10):
+    """All three strategies on 10^2..10^6-node synthetic instances, with JSON output and comparison."""
+    print(f"{'nodes':>9} {'phase':>8} {'recover':>8} {'time (s)':>10} {'peak (MB)':>10} "
+          f"{'served':>8} {'total':>14}")
+    current = run_suite(sizes, seed=seed)
+    if output:
+        with open(output, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"wrote {len(current['results'])} results to {output}")
+    if compare:
+        with open(compare) as f:
+            previous = json.load(f)
+        report = compare_results(current, previous, tolerance)
+        print(f"\ncompared with {compare} (commit {previous['meta'].get('commit')}, "
+              f"{previous['meta'].get('timestamp')})")
+        print(f"{'nodes':>9} {'phase':>8} {'recover':>8} {'time':>8} {'memory':>8}")
+        for entry in report:
+            flags = (" SLOWER" if entry["regressed"] else "") + \
+                    (" ROUTE CHANGED" if entry["route_changed"] else "")
+            print(f"{entry['nodes']:>9} {entry['phase']:>8} {'yes' if entry['recover'] else 'no':>8} "
+                  f"{entry['time_ratio']:>7.2f}x {entry['memory_ratio']:>7.2f}x{flags}")
+
+
+BENCHMARKS = {
+    "audit": bench_audit,
+    "cache": bench_cache,
+    "closures": bench_closures,
+    "costs": bench_costs,
+    "dataset": bench_dataset,
+    "depots": bench_depots,
+    "exact": bench_exact,
+    "fairness": bench_fairness,
+    "fleet": bench_fleet,
+    "grasp": bench_grasp,
+    "instrumentation": bench_instrumentation,
+    "local-search": bench_local_search,
+    "lookahead": bench_lookahead,
+    "memory": bench_memory,
+    "recovery": bench_recovery,
+    "routes": bench_routes,
+    "schedule": bench_schedule,
+    "service": bench_service,
+    "spatial": bench_spatial,
+    "streaming": bench_streaming,
+    "sweep": bench_sweep,
+    "time-costs": bench_time_costs,
+    "tips": bench_tips,
+    "suite": bench_suite,
+}
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+SUITE_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+EXACT_SIZES = [12, 16, 20, 22]
+DEPOT_SIZES = [1_000, 4_000]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("name", choices=sorted(BENCHMARKS))
+    parser.add_argument("--nodes", type=int, nargs="+",
+                        help=f"instance sizes (default {DEFAULT_SIZES}; suite: {SUITE_SIZES}; "
+                             f"exact: {EXACT_SIZES}; depots: {DEPOT_SIZES})")
+    parser.add_argument("--seed", type=int, default=0, help="suite: generator seed")
+    parser.add_argument("--output", help="suite: write results to this JSON file")
+    parser.add_argument("--compare", help="suite: compare with results from an earlier --output")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="suite: relative slowdown reported as a regression")
+    args = parser.parse_args()
+    if args.name == "suite":
+        bench_suite(args.nodes or SUITE_SIZES, args.output, args.compare, args.seed, args.tolerance)
+    elif args.name == "exact":
+        bench_exact(args.nodes or EXACT_SIZES)
+    elif args.name == "depots":
+        bench_depots(args.nodes or DEPOT_SIZES)
+    else:
+        BENCHMARKS[args.name](args.nodes or DEFAULT_SIZES)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+"""
+Greedy Algorithm Assignment - Exact Routes for Small Instances
+
+Finds the best possible route under an objective, to measure how far the
+greedy strategies are from optimal. A route starts at the depot, stops at
+any subset of the customers it can reach, in any order, and drives back
+to the depot; between stops it follows the shortest road path (the road
+distance closure), passing through other nodes without stopping. Its
+value is the reward of every stop minus the road cost of all driving,
+the same total greedy_route reports with recover=True.
+
+The search is Held-Karp dynamic programming over bitsets: the states with
+c stops are (set of stops, last stop) pairs, kept as NumPy arrays of
+bitmasks, last stops, values and parent positions, and each layer is
+built from the previous one in a few vectorized passes. Branch-and-bound
+prunes every layer: a state survives only if an optimistic bound can
+still beat the best complete route so far. The bound takes a minimum
+spanning tree over the remaining customers and the depot, and lets every
+customer give up at most its reward for its tree edge (a route through
+them is a spanning path, so it costs at least the tree). The tree is
+built on road costs plus a penalty per customer, found once by
+subgradient steps (as in the Held-Karp 1-tree bound) so that the tree
+looks like a path: each stop on a route is entered and left once, so the
+penalties cancel out of every route's total while the tree bound comes
+close to the real cost. It is capped by every positive reward left
+minus the trip home from the last stop. The incumbent starts as the
+recovered greedy route, and a first pass that keeps only the best beam
+states per layer usually improves it before the exhaustive pass begins.
+The layers kept for rebuilding the route are capped at max_bytes; a
+search that would exceed the cap stops and reports the best route found
+without proof of optimality.
+"""
+
+import time
+from typing import List, Optional, Union
+
+import numpy as np
+
+from main import Node, Edge, RoadGraph, as_road_graph
+from greedy_engine import DriverEarnings, NodeArrays, Objective, greedy_route
+from shortest_paths import ShortestPathCache
+from travel_costs import TravelCosts
+
+# Bytes per stored state: mask (int64), last stop (int8), value (float64), parent (int32)
+_STATE_BYTES = 8 + 1 + 8 + 4
+# States handled at once when computing bounds
+_CHUNK = 1 << 16
+# Subgradient steps spent choosing the tree bound's penalties
+_PENALTY_STEPS = 200
+
+
+class ExactResult:
+    """
+    Outcome of an exact search.
+
+    Attributes:
+        route (List[Node]): Best route found, from the depot back to the depot
+        total (float): Its value (rewards minus road travel cost)
+        optimal (bool): True if the search finished, so no route is better
+        customers (int): Reachable customers searched over
+        states (int): DP states that survived pruning, over all layers
+        peak_bytes (int): Most memory held by state tables at once
+        elapsed (float): Wall-clock seconds
+    """
+
+    def __init__(self, route: List[Node], total: float, optimal: bool, customers: int,
+                 states: int, peak_bytes: int, elapsed: float):
+        self.route = route
+        self.total = total
+        self.optimal = optimal
+        self.customers = customers
+        self.states = states
+        self.peak_bytes = peak_bytes
+        self.elapsed = elapsed
+
+    def gap(self, total: float) -> float:
+        """Relative shortfall of another route's total from this one (0.0 = optimal)."""
+        if self.total == 0:
+            return 0.0
+        return (self.total - total) / abs(self.total)
+
+    def __repr__(self):
+        return (f"ExactResult(total={self.total:.2f}, optimal={self.optimal}, "
+                f"customers={self.customers}, states={self.states}, "
+                f"peak={self.peak_bytes / 2**20:.1f}MiB, elapsed={self.elapsed:.3f}s)")
+
+
+def road_neighborhood(graph: RoadGraph, center: Node, size: int) -> RoadGraph:
+    """
+    The first size nodes reached from center by breadth-first search, with
+    every road between them, as a RoadGraph of the same Node objects.
+    """
+    start = graph.index(center)
+    keep = [start]
+    local = {start: 0}
+    offsets, targets = graph.offsets, graph.targets
+    for u in keep:
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            if len(keep) == size:
+                break
+            if v not in local:
+                local[v] = len(keep)
+                keep.append(v)
+    sub_offsets, sub_targets = [0], []
+    for u in keep:
+        sub_targets.extend(local[v] for v in targets[offsets[u]:offsets[u + 1]] if v in local)
+        sub_offsets.append(len(sub_targets))
+    return RoadGraph.from_csr([graph.nodes[i] for i in keep], sub_offsets, sub_targets)
+
+
+def exact_route(edges: Union[List[Edge], RoadGraph], depot: Node,
+                objective: Optional[Objective] = None, nodes: Optional[List[Node]] = None,
+                max_bytes: int = 256 * 2**20, beam: int = 2_000) -> ExactResult:
+    """
+    Best route over every subset and order of the reachable customers.
+
+    Args:
+        edges (List[Edge] | RoadGraph): Road connections, or their index
+        depot (Node): The starting depot location
+        objective (Objective): What a stop is worth, e.g. CompanyProfit() or
+            DriverEarnings() (default: DriverEarnings); only its rewards are used
+        nodes (List[Node]): Optional nodes to index along with the edges
+        max_bytes (int): Memory cap for the state tables
+        beam (int): States per layer in the heuristic pass that finds the
+            first incumbent
+
+    Returns:
+        ExactResult: Best route and total, and whether it is proven optimal
+
+    Raises:
+        ValueError: If more than 62 customers are reachable (states are int64 bitsets)
+    """
+    begin = time.perf_counter()
+    graph = as_road_graph(edges, nodes)
+    objective = objective if objective is not None else DriverEarnings()
+    arrays = NodeArrays.for_graph(graph)
+    rate = TravelCosts.for_graph(graph).base_cost_per_mile
+    paths = ShortestPathCache.for_graph(graph)
+    d = graph.index(depot)
+    customers = [v for v, _ in paths.tree(d).settled() if v != d and not arrays.is_depot[v]]
+    k = len(customers)
+    if k > 62:
+        raise ValueError(f"{k} reachable customers is too many for an exact search (at most 62)")
+
+    # Road cost between every pair of points; point 0 is the depot, point i + 1 customer i
+    points = [d] + customers
+    cost = np.array([[paths.tree(a).distance(b) for b in points] for a in points]) * rate
+    reward = objective.rewards(arrays)[customers] if k else np.zeros(0)
+
+    # The recovered greedy route, or staying home, is the first incumbent;
+    # a beam search (the same layers, each cut to its most promising
+    # states) usually improves it enough to prune most of the exact search
+    greedy, greedy_total = greedy_route(graph, depot, objective, recover=True)
+    if greedy_total < 0:
+        greedy, greedy_total = [depot], 0.0
+    tables = _Tables(reward, cost)
+    best_total, order, _, _, _ = _search(tables, greedy_total, max_bytes, beam)
+    best_total, order, optimal, states, peak = _search(tables, best_total, max_bytes, None, order)
+
+    if order is None:
+        route = greedy
+    else:
+        stops = [d]
+        for target in [customers[i] for i in order] + [d]:
+            stops.extend(paths.path(stops[-1], target)[1:])
+        route = [graph.nodes[i] for i in stops]
+    return ExactResult(route, best_total, optimal, k, states, peak, time.perf_counter() - begin)
+
+
+class _Tables:
+    """Costs and rewards between the customers (point 0 of cost is the depot)."""
+
+    def __init__(self, reward: np.ndarray, cost: np.ndarray):
+        k = len(reward)
+        self.k = k
+        self.reward = reward
+        self.start = reward - cost[0, 1:]
+        self.step = reward[None, :] - cost[1:, 1:]  # step[i, j]: customer i to customer j
+        self.home = cost[1:, 0]
+        self.road = cost[1:, 1:]
+        # The same costs with the depot moved to the end
+        order = np.append(np.arange(1, k + 1), 0)
+        self.closure = cost[np.ix_(order, order)]
+        # Tree bound inputs: costs plus both ends' penalties, and rewards
+        # plus twice the penalty (a stop's two roads each carry it once)
+        self.penalty = _penalties(reward, self.closure)
+        self.tree_cost = self.closure + self.penalty[:, None] + self.penalty[None, :]
+        self.tree_reward = reward + 2 * self.penalty[:k]
+
+
+def _bits(masks: np.ndarray, k: int) -> np.ndarray:
+    """(len(masks), k) boolean matrix of the bits of each mask."""
+    octets = masks.astype("<i8").view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(octets, axis=1, bitorder="little")[:, :k].view(bool)
+
+
+def _search(tables: _Tables, best_total: float, max_bytes: int, beam: Optional[int],
+            order: Optional[List[int]] = None):
+    """
+    Layered Held-Karp with pruning against best_total.
+
+    Every layer is kept sorted by stop set, so the states a new stop j
+    grows from one layer come out sorted too, and duplicates (the same set
+    reached with different last stops) are merged without sorting.
+
+    With a beam, every layer keeps only its beam states with the highest
+    bounds, so the result is a heuristic.
+
+    Returns:
+        tuple: (best total, customer order of the best route or the order
+        passed in if nothing beat best_total, whether the search was
+        exhaustive, states kept, peak bytes)
+    """
+    k = tables.k
+    masks = np.left_shift(1, np.arange(k, dtype=np.int64))
+    ends = np.arange(k, dtype=np.int8)
+    values = tables.start.copy()
+    parents = np.full(k, -1, dtype=np.int32)
+    layers = []
+    best_state = None
+    stored = states = peak = 0
+    exhaustive = True
+    while len(masks):
+        complete = values - tables.home[ends]
+        i = int(np.argmax(complete))
+        if complete[i] > best_total:
+            best_total, best_state = float(complete[i]), (len(layers), i)
+
+        bounds = _bound(tables, masks, ends, values)
+        keep = bounds >= best_total - 1e-9
+        if beam is not None and np.count_nonzero(keep) > beam:
+            keep &= bounds >= np.partition(bounds[keep], -beam)[-beam]
+            exhaustive = False
+        if best_state is not None and best_state[0] == len(layers):
+            # Keep the best complete state (the beam may cut it) and re-index it
+            keep[i] = True
+            best_state = (len(layers), int(np.count_nonzero(keep[:i])))
+        masks, ends, values, parents = masks[keep], ends[keep], values[keep], parents[keep]
+        layers.append((ends, parents))
+        stored += len(masks) * _STATE_BYTES
+        states += len(masks)
+
+        bits = _bits(masks, k)
+        step = tables.step[ends.astype(np.intp)]
+        next_layer = []
+        pending = 0
+        for j in range(k):
+            free = np.flatnonzero(~bits[:, j])
+            if not len(free):
+                continue
+            grown = masks[free] | (1 << j)
+            gained = values[free] + step[free, j]
+            # One state per new stop set: the best way to end at j
+            starts = np.flatnonzero(np.concatenate(([True], grown[1:] != grown[:-1])))
+            best = np.maximum.reduceat(gained, starts)
+            hits = np.flatnonzero(gained == np.repeat(best, np.diff(np.append(starts, len(grown)))))
+            group = np.searchsorted(starts, hits, side="right")
+            chosen = hits[np.concatenate(([True], group[1:] != group[:-1]))]
+            next_layer.append((grown[chosen], np.full(len(chosen), j, dtype=np.int8),
+                               gained[chosen], free[chosen].astype(np.int32)))
+            pending += len(chosen) * _STATE_BYTES
+            peak = max(peak, stored + pending + len(free) * 3 * 8)
+            if peak > max_bytes:
+                break
+        if peak > max_bytes:
+            exhaustive = False
+            break
+        if not next_layer:
+            break
+        masks, ends, values, parents = (np.concatenate(column) for column in zip(*next_layer))
+        by_set = np.argsort(masks, kind="stable")
+        masks, ends, values, parents = masks[by_set], ends[by_set], values[by_set], parents[by_set]
+
+    if best_state is not None:
+        layer, i = best_state
+        order = []
+        while layer >= 0:
+            layer_ends, layer_parents = layers[layer]
+            order.append(int(layer_ends[i]))
+            i = int(layer_parents[i])
+            layer -= 1
+        order.reverse()
+    return best_total, order, exhaustive, states, peak
+
+
+def _bound(tables: _Tables, masks: np.ndarray, ends: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Optimistic total of the best route extending each state (masks sorted):
+    its value, plus the spanning-tree bound of its stop set less the
+    cheapest (penalized) road from the last stop to an unvisited customer
+    or home, or plus every positive unvisited reward less the trip home,
+    whichever is lower.
+    """
+    k = tables.k
+    bounds = np.empty(len(masks))
+    for start in range(0, len(masks), _CHUNK):
+        stop = start + _CHUNK
+        mask = masks[start:stop]
+        first = np.flatnonzero(np.concatenate(([True], mask[1:] != mask[:-1])))
+        group = np.repeat(np.arange(len(first)), np.diff(np.append(first, len(mask))))
+        free = ~_bits(mask[first], k)
+        end = ends[start:stop].astype(np.intp)
+        # The last stop's own penalty cancels against its one road out
+        onward = tables.road[end] + tables.penalty[:k]
+        leave = np.minimum(np.where(free[group], onward, np.inf).min(axis=1), tables.home[end])
+        rest = np.minimum(_tree_bound(tables, free)[group] - leave,
+                          (free @ np.maximum(tables.reward, 0.0))[group] - tables.home[end])
+        bounds[start:stop] = values[start:stop] + rest
+    return bounds
+
+
+def _tree_bound(tables: _Tables, free: np.ndarray) -> np.ndarray:
+    """
+    Per stop set (rows of free), the most the rest of a route can add apart
+    from leaving the last stop.
+
+    Driving from the first remaining stop home spans the stops made, so it
+    costs at least their minimum spanning tree with the depot. Grown from
+    the depot, the tree over all unvisited customers has an edge up to
+    every customer, and any customer a route skips saves at most that edge.
+    So no route beats the sum, over unvisited customers, of the reward
+    minus the tree edge, or zero where the edge costs more than the reward.
+    Costs and rewards are the penalized ones, which this holds for as well.
+    """
+    road = tables.tree_cost
+    rows = np.arange(len(free))
+    # inf on the depot and visited customers, which are never added again
+    blocked = np.zeros((len(free), tables.k + 1))
+    blocked[:, :-1][~free] = np.inf
+    blocked[:, -1] = np.inf
+    dist = road[-1] + blocked
+    reward = np.append(tables.tree_reward, 0.0)
+    total = np.where(free, tables.tree_reward, 0.0).sum(axis=1)
+    # Every state of a layer has the same number of unvisited customers
+    for _ in range(int(free[0].sum()) if len(free) else 0):
+        pick = np.argmin(dist, axis=1)
+        # Dropping this customer saves at most its tree edge
+        total -= np.minimum(dist[rows, pick], reward[pick])
+        blocked[rows, pick] = np.inf
+        np.minimum(dist, road[pick], out=dist)
+        dist += blocked
+    return total
+
+
+def _penalties(reward: np.ndarray, closure: np.ndarray) -> np.ndarray:
+    """
+    Per-point penalties (the depot, last, stays at 0) that make the tree
+    bound over all customers as low as possible.
+
+    Every customer the tree keeps (reward above its edge) should have
+    exactly one kept child, as on a path. Subgradient steps lower the
+    penalty of customers with none, which draws more tree edges to them,
+    and raise it where there are several. Any penalties give a valid
+    bound; these just make it tight.
+    """
+    k = len(reward)
+    penalty = np.zeros(k + 1)
+    if k == 0:
+        return penalty
+    best, best_penalty = np.inf, penalty
+    step = float(closure[:k, k].mean()) / 4
+    rows = np.arange(k)
+    for _ in range(_PENALTY_STEPS):
+        cost = closure + penalty[:, None] + penalty[None, :]
+        parent = _tree_parents(cost)
+        gain = reward + 2 * penalty[:k] - cost[rows, parent]
+        bound = float(np.maximum(gain, 0.0).sum())
+        if bound < best:
+            best, best_penalty = bound, penalty.copy()
+        kept = (gain > 0).astype(np.float64)
+        slope = np.append(kept, 0.0)
+        np.subtract.at(slope, parent, kept)
+        slope[k] = 0.0
+        if not slope.any():
+            break
+        penalty = penalty - step * slope
+        step *= 0.97
+    return best_penalty
+
+
+def _tree_parents(cost: np.ndarray) -> np.ndarray:
+    """Parent of every customer in the minimum spanning tree grown from the depot (the last point)."""
+    k = len(cost) - 1
+    dist = cost[k, :k].copy()
+    parent = np.full(k, k)
+    done = np.zeros(k, dtype=bool)
+    for _ in range(k):
+        j = int(np.argmin(np.where(done, np.inf, dist)))
+        done[j] = True
+        closer = ~done & (cost[j, :k] < dist)
+        dist[closer] = cost[j, :k][closer]
+        parent[closer] = j
+    return parent
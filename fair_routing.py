@@ -0,0 +1,359 @@
+"""
+Greedy Algorithm Assignment - Fairness and Balance Routing Rules
+
+The two Part C rules besides fatigue:
+
+- "balance": every region gets early service. The next stop should be in
+  the region that has had the smallest share of its customers served so
+  far (among regions with customers left).
+- "fairness": alternate between high-tip and low-tip regions. Regions are
+  ranked by the mean tip of their customers and split into tip levels
+  (two by default); the next stop should be in a region of a different
+  level from the last stop's region.
+
+Unvisited customers sit in a RegionFrontier: one heap per region, best
+reward on top, with the best reward of every region kept in an array as
+customers are removed. A step takes the best road neighbor in a preferred
+region, found with one vectorized mask over the neighbor block. If no
+neighbor is preferred, the frontier hands out the tops of the preferred
+regions, best first, and the route drives by road to the first one within
+max_detour; only when none is in reach does it fall back to the best
+neighbor of any region. A pick therefore costs O(degree + regions) array
+work and O(log n) heap work, never a scan of the customers.
+
+As in the engine's recovery, a detour stops at the first unvisited
+customer its road passes. first_service_times() reports, for any route,
+how long each region waited for its first stop.
+"""
+
+import heapq
+import math
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from main import Node, Edge, RoadGraph, as_road_graph
+from greedy_engine import DriverEarnings, NodeArrays, Objective, stop_on_path
+from shortest_paths import ShortestPathCache, ShortestPathTree
+from travel_costs import TravelCosts
+
+RULES = ("balance", "fairness")
+
+
+class RegionFrontier:
+    """
+    Unvisited customers bucketed by region.
+
+    Attributes:
+        level (np.ndarray): Tip level per region (0 = lowest tips)
+        open (np.ndarray): True for every dense index still to be served
+        remaining (np.ndarray): Unvisited customers per region
+        served (np.ndarray): Stops made per region
+        best (np.ndarray): Best reward left per region (-inf once empty)
+    """
+
+    def __init__(self, region: np.ndarray, level: np.ndarray, rewards: np.ndarray,
+                 members: np.ndarray):
+        """
+        Args:
+            region (np.ndarray): Region code per dense index
+            level (np.ndarray): Tip level per region code
+            rewards (np.ndarray): Reward per dense index (orders each region)
+            members (np.ndarray): Boolean mask of the customers to hold
+        """
+        self.level = level
+        self.region = region
+        self.open = members.copy()
+        self.remaining = np.bincount(region[members], minlength=len(level))
+        self.served = np.zeros(len(level), dtype=np.intp)
+        self.best = np.full(len(level), -math.inf)
+        self._sizes = np.maximum(self.remaining, 1)
+        self._rewards = rewards.tolist()
+        self._heaps: List[List[Tuple[float, int]]] = [[] for _ in range(len(level))]
+        for j in np.flatnonzero(members).tolist():
+            self._heaps[int(region[j])].append((-self._rewards[j], j))
+        for r, heap in enumerate(self._heaps):
+            heapq.heapify(heap)
+            if heap:
+                self.best[r] = -heap[0][0]
+
+    def __contains__(self, j: int) -> bool:
+        return bool(self.open[j])
+
+    def remove(self, j: int):
+        """Record a stop at customer j."""
+        if not self.open[j]:
+            return
+        self.open[j] = False
+        r = int(self.region[j])
+        self.remaining[r] -= 1
+        self.served[r] += 1
+        heap = self._heaps[r]
+        while heap and not self.open[heap[0][1]]:
+            heapq.heappop(heap)
+        self.best[r] = -heap[0][0] if heap else -math.inf
+
+    def tops(self, wanted: np.ndarray) -> Iterator[int]:
+        """Best customer of each wanted region, best reward first."""
+        for r in np.argsort(-np.where(wanted, self.best, -math.inf), kind="stable").tolist():
+            if not wanted[r] or self.best[r] == -math.inf:
+                return
+            yield self._heaps[r][0][1]
+
+    def preferred(self, rule: str, last_region: int) -> np.ndarray:
+        """
+        Regions the rule would like the next stop to come from.
+
+        Returns:
+            np.ndarray: Boolean mask over regions (all False when every
+            region with customers is equally acceptable)
+        """
+        left = self.remaining > 0
+        if rule == "balance":
+            if not left.any():
+                return left
+            share = self.served / self._sizes
+            wanted = left & (share == share[left].min())
+        elif last_region < 0:
+            return np.zeros(len(left), dtype=bool)
+        else:
+            wanted = left & (self.level != self.level[last_region])
+        if (wanted == left).all():
+            wanted[:] = False
+        return wanted
+
+
+class FairRouteReport:
+    """
+    A route built under a fairness or balance rule.
+
+    Attributes:
+        route (List[Node]): Route from the depot back to the depot
+        total (float): Rewards minus road travel cost
+        rule (str): The rule followed
+        stops (int): Customers stopped at
+        detours (int): Steps that drove past the road neighbors to a preferred region
+        preferred_share (float): Share of steps, among those that had a
+            preference, whose stop came from a preferred region
+        first_service (Dict[str, float]): Minutes after departure of each
+            region's first stop (inf if it got none)
+    """
+
+    def __init__(self, route: List[Node], total: float, rule: str):
+        self.route = route
+        self.total = total
+        self.rule = rule
+        self.stops = 0
+        self.detours = 0
+        self.preferred_share = 0.0
+        self.first_service: Dict[str, float] = {}
+
+    def __repr__(self):
+        return (f"FairRouteReport(rule={self.rule!r}, total={self.total:.2f}, stops={self.stops}, "
+                f"preferred={self.preferred_share:.0%})")
+
+
+def region_tip_levels(region: np.ndarray, tips: np.ndarray, members: np.ndarray,
+                      levels: int, regions: int) -> np.ndarray:
+    """
+    Tip level per region: regions ranked by their customers' mean tip and
+    split into equal-sized levels (0 = lowest tips).
+
+    Args:
+        region (np.ndarray): Region code per dense index
+        tips (np.ndarray): Estimated tip per dense index
+        members (np.ndarray): Boolean mask of the customers to count
+        levels (int): Number of tip levels
+        regions (int): Number of region codes
+
+    Returns:
+        np.ndarray: Level per region code (regions without customers get 0)
+    """
+    counts = np.bincount(region[members], minlength=regions)
+    sums = np.bincount(region[members], weights=tips[members], minlength=regions)
+    present = np.flatnonzero(counts)
+    level = np.zeros(regions, dtype=np.intp)
+    if levels <= 1 or len(present) < 2:
+        return level
+    means = sums[present] / counts[present]
+    rank = np.empty(len(present), dtype=np.intp)
+    rank[np.argsort(means, kind="stable")] = np.arange(len(present))
+    level[present] = rank * levels // len(present)
+    return level
+
+
+def first_service_times(route: List[Node], edges: Union[List[Edge], RoadGraph],
+                        speed: float = 30.0, nodes: Optional[List[Node]] = None) -> Dict[str, float]:
+    """
+    Minutes from departure until each region's first stop.
+
+    A region's first stop is the first visit to any of its customers;
+    hops are timed by TravelCosts.hop_minutes.
+
+    Args:
+        route (List[Node]): Route to evaluate, starting at the depot
+        edges (List[Edge] | RoadGraph): Road connections, or their index
+        speed (float): Driving speed in distance units per hour
+        nodes (List[Node]): Optional nodes to index along with the edges
+
+    Returns:
+        Dict[str, float]: Minutes by region name, inf for regions never served
+    """
+    graph = as_road_graph(edges, nodes)
+    arrays = NodeArrays.for_graph(graph)
+    travel = TravelCosts.for_graph(graph)
+    first = {name: math.inf for name in arrays.regions}
+    if len(route) < 2:
+        return first
+    stops = np.array([graph.index(node) for node in route], dtype=np.intp)
+    clock = np.concatenate(([0.0], np.cumsum(travel.hop_minutes(stops, speed))))
+    customer = ~arrays.is_depot[stops]
+    # np.unique gives each region's earliest position in the route
+    codes, position = np.unique(arrays.region[stops[customer]], return_index=True)
+    for code, minutes in zip(codes.tolist(), clock[customer][position].tolist()):
+        first[arrays.regions[code]] = minutes
+    return first
+
+
+# ============================================================================
+# ROUTING
+# ============================================================================
+
+def fair_route(edges: Union[List[Edge], RoadGraph], depot: Node, rule: str = "balance",
+               objective: Optional[Objective] = None, nodes: Optional[List[Node]] = None,
+               levels: int = 2, max_detour: float = 5.0, recover: bool = False,
+               speed: float = 30.0, customers: Optional[np.ndarray] = None) -> FairRouteReport:
+    """
+    Build a greedy route that follows a balance or fairness rule.
+
+    Args:
+        edges (List[Edge] | RoadGraph): Road connections, or their index
+        depot (Node): The starting depot location
+        rule (str): "balance" (least-served region next, by share of its
+            customers) or "fairness" (alternate high-tip and low-tip regions)
+        objective (Objective): Decides what a stop is worth (default: DriverEarnings)
+        nodes (List[Node]): Optional nodes to index along with the edges
+        levels (int): Region tip levels (2 = low-tip and high-tip regions)
+        max_detour (float): Farthest road distance driven to reach a preferred
+            customer when no neighbor is preferred (0 = neighbors only)
+        recover (bool): At a dead end, drive by road to the best reachable
+            customer of any region instead of stopping
+        speed (float): Driving speed for first_service, in distance units per hour
+        customers (np.ndarray): Boolean mask by dense index of the nodes this
+            route may stop at; None allows all
+
+    Returns:
+        FairRouteReport: Route, total and how well the rule was kept
+    """
+    if rule not in RULES:
+        raise ValueError(f"unknown rule {rule!r}; expected one of {RULES}")
+    graph = as_road_graph(edges, nodes)
+    objective = objective if objective is not None else DriverEarnings()
+    travel = TravelCosts.for_graph(graph)
+    arrays = NodeArrays.for_graph(graph)
+    paths = ShortestPathCache.for_graph(graph) if recover or max_detour > 0 else None
+    rate = travel.base_cost_per_mile
+    rewards = objective.rewards(arrays)
+
+    d = graph.index(depot)
+    members = ~arrays.is_depot
+    if customers is not None:
+        members &= customers
+    members[d] = False
+    region = arrays.region.astype(np.intp)
+    level = region_tip_levels(region, arrays.tips, members, levels, max(len(arrays.regions), 1))
+    frontier = RegionFrontier(region, level, rewards, members)
+    offsets = graph.offsets
+    reward_list = rewards.tolist()
+
+    stops = [d]
+    total = 0.0
+    last_region = -1
+    detours = wanted_steps = kept_steps = 0
+    while True:
+        current = stops[-1]
+        wanted = frontier.preferred(rule, last_region)
+        start, end = offsets[current], offsets[current + 1]
+        candidates = travel.targets[start:end]
+        scores = np.where(frontier.open[candidates], rewards[candidates] - travel.costs[start:end],
+                          -np.inf)
+        path, distance = None, None
+        if wanted.any():
+            preferred = np.where(wanted[region[candidates]], scores, -np.inf)
+            k = int(np.argmax(preferred)) if len(preferred) else 0
+            if len(preferred) and preferred[k] > -np.inf:
+                path, distance = [current, int(candidates[k])], float(travel.lengths[start + k])
+            elif paths is not None and max_detour > 0:
+                tree = paths.tree(current)
+                for j in frontier.tops(wanted):
+                    if _within(tree, j, max_detour):
+                        path = tree.path(j)
+                        detours += 1
+                        break
+        if path is None and len(scores) and scores.max() > -np.inf:
+            k = int(np.argmax(scores))
+            path, distance = [current, int(candidates[k])], float(travel.lengths[start + k])
+        if path is None and recover:
+            path = _best_reachable(paths.tree(current), frontier, reward_list,
+                                   float(frontier.best.max()), rate)
+        if path is None:
+            break
+
+        path = stop_on_path(path, lambda i: i in frontier)
+        j = path[-1]
+        if distance is None:
+            distance = paths.distance(current, j)
+        if wanted.any():
+            wanted_steps += 1
+            kept_steps += bool(wanted[region[j]])
+        total += float(rewards[j]) - distance * rate
+        frontier.remove(j)
+        last_region = int(region[j])
+        stops.extend(path[1:])
+
+    current = stops[-1]
+    if current != d:
+        road_home = paths.path(current, d) if recover else []
+        if road_home:
+            total -= paths.distance(current, d) * rate
+            stops.extend(road_home[1:])
+        else:
+            total -= travel.cost(current, d)
+            stops.append(d)
+
+    report = FairRouteReport([graph.nodes[i] for i in stops], total, rule)
+    report.stops = int(frontier.served.sum())
+    report.detours = detours
+    report.preferred_share = kept_steps / wanted_steps if wanted_steps else 1.0
+    report.first_service = first_service_times(report.route, graph, speed)
+    return report
+
+
+def _within(tree: ShortestPathTree, target: int, limit: float) -> bool:
+    """Whether target is at most limit away by road, expanding the tree no further than limit."""
+    if target in tree.dist:
+        return tree.dist[target] <= limit
+    for v, distance in tree.settled():
+        if distance > limit:
+            return False
+        if v == target:
+            return True
+    return False
+
+
+def _best_reachable(tree: ShortestPathTree, frontier: RegionFrontier, rewards: List[float],
+                    bound: float, rate: float) -> Optional[List[int]]:
+    """
+    Road path to the unvisited customer with the best reward minus road
+    cost, searched outward until even the bound cannot win.
+
+    Returns:
+        Optional[List[int]]: Path from the tree's source, or None if none is in reach
+    """
+    best, best_score = -1, -math.inf
+    for v, distance in tree.settled():
+        if bound - distance * rate < best_score:
+            break
+        if v in frontier and rewards[v] - distance * rate > best_score:
+            best, best_score = v, rewards[v] - distance * rate
+    return tree.path(best) if best >= 0 else None
@@ -0,0 +1,254 @@
+"""
+Greedy Algorithm Assignment - Multi-Vehicle Fleet Planning
+
+Splits the customers of one depot among K vehicles and plans each
+vehicle's route with the shared greedy engine, one vehicle per task on a
+GraphPool, so partitions are planned in parallel.
+
+Partitioning works in two levels. Vehicles are first shared out among
+regions (downtown, suburban, rural) in proportion to their customer
+counts; each region's customers are then split into spatial clusters by
+k-means, and every customer joins the cluster whose seed reaches it first
+over roads inside the region, so a partition is a connected piece of road
+network wherever the region itself is connected. Each vehicle starts at
+the depot and drives (with dead-end recovery) to reach its partition.
+"""
+
+from collections import deque
+from typing import List, Optional, Union
+
+import numpy as np
+
+from main import Node, Edge, RoadGraph, as_road_graph
+from greedy_engine import DriverEarnings, NodeArrays, Objective, greedy_route
+from travel_costs import TravelCosts
+from worker_pool import GraphPool
+
+
+class VehicleRoute:
+    """
+    One vehicle's share of a fleet plan.
+
+    Attributes:
+        vehicle (int): Vehicle number
+        route (List[Node]): Route from the depot back to the depot
+        total (float): Route total under the planning objective
+        assigned (int): Customers in the vehicle's partition
+        served (int): Customers the route actually stops at
+    """
+
+    def __init__(self, vehicle: int, route: List[Node], total: float, assigned: int, served: int):
+        self.vehicle = vehicle
+        self.route = route
+        self.total = total
+        self.assigned = assigned
+        self.served = served
+
+    def __repr__(self):
+        return (f"VehicleRoute(vehicle={self.vehicle}, served={self.served}/{self.assigned}, "
+                f"total={self.total:.2f})")
+
+
+class FleetPlan:
+    """
+    Routes for every vehicle of a fleet.
+
+    Attributes:
+        vehicles (List[VehicleRoute]): Per-vehicle routes, by vehicle number
+        assignment (np.ndarray): Vehicle number per dense node index (-1 for depots)
+        total (float): Sum of the vehicle totals
+        served (int): Customers served by some vehicle
+        unserved (List[Node]): Customers no vehicle could reach
+    """
+
+    def __init__(self, vehicles: List[VehicleRoute], assignment: np.ndarray, unserved: List[Node]):
+        self.vehicles = vehicles
+        self.assignment = assignment
+        self.total = sum(vehicle.total for vehicle in vehicles)
+        self.served = sum(vehicle.served for vehicle in vehicles)
+        self.unserved = unserved
+
+    def __repr__(self):
+        return (f"FleetPlan({len(self.vehicles)} vehicles, served={self.served}, "
+                f"unserved={len(self.unserved)}, total={self.total:.2f})")
+
+
+# ============================================================================
+# PARTITIONING
+# ============================================================================
+
+def partition_customers(graph: RoadGraph, vehicles: int, seed: int = 0,
+                        by_region: bool = True) -> np.ndarray:
+    """
+    Assign every customer to one of the vehicles.
+
+    Args:
+        graph (RoadGraph): Road network (depots are never assigned)
+        vehicles (int): Number of vehicles
+        seed (int): Seed for the k-means initialization
+        by_region (bool): Keep regions apart when there are at least as
+            many vehicles as regions with customers
+
+    Returns:
+        np.ndarray: Vehicle number per dense node index (-1 for depots)
+    """
+    if vehicles < 1:
+        raise ValueError("need at least one vehicle")
+    arrays = NodeArrays.for_graph(graph)
+    travel = TravelCosts.for_graph(graph)
+    rng = np.random.default_rng(seed)
+    labels = np.full(len(graph), -1, dtype=np.intp)
+    customers = np.flatnonzero(~arrays.is_depot)
+    if len(customers) == 0:
+        return labels
+
+    groups = [customers]
+    if by_region:
+        by_code = [customers[arrays.region[customers] == code] for code in range(len(arrays.regions))]
+        by_code = [group for group in by_code if len(group)]
+        if vehicles >= len(by_code):
+            groups = by_code
+    shares = _apportion([len(group) for group in groups], vehicles)
+
+    first = 0
+    for group, k in zip(groups, shares):
+        k = min(k, len(group))
+        seeds, centers = _kmeans_seeds(travel.x[group], travel.y[group], k, rng)
+        member = np.zeros(len(graph), dtype=bool)
+        member[group] = True
+        owner = _grow(graph, member, group[seeds])
+        # Customers cut off from every seed inside the region join the nearest center
+        cut_off = group[owner[group] < 0]
+        if len(cut_off):
+            dx = travel.x[cut_off, None] - centers[None, :, 0]
+            dy = travel.y[cut_off, None] - centers[None, :, 1]
+            owner[cut_off] = np.argmin(dx * dx + dy * dy, axis=1)
+        labels[group] = owner[group] + first
+        first += k
+    return labels
+
+
+def _apportion(sizes: List[int], seats: int) -> List[int]:
+    """Largest-remainder apportionment with at least one seat per group."""
+    extra = seats - len(sizes)
+    quotas = np.array(sizes, dtype=np.float64) / sum(sizes) * extra
+    shares = np.floor(quotas).astype(int)
+    for i in np.argsort(-(quotas - shares), kind="stable")[:extra - shares.sum()]:
+        shares[i] += 1
+    return [int(share) + 1 for share in shares]
+
+
+def _kmeans_seeds(x: np.ndarray, y: np.ndarray, k: int, rng: np.random.Generator,
+                  iterations: int = 10, sample: int = 50_000):
+    """
+    k-means++ over a sample of the points, then Lloyd iterations.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (index of the point nearest each
+        center, distinct per center; (k, 2) array of centers)
+    """
+    points = np.column_stack([x, y])
+    fit = points if len(points) <= sample else points[rng.choice(len(points), sample, replace=False)]
+    centers = np.empty((k, 2))
+    centers[0] = fit[rng.integers(len(fit))]
+    nearest = ((fit - centers[0]) ** 2).sum(axis=1)
+    for c in range(1, k):
+        total = nearest.sum()
+        pick = rng.choice(len(fit), p=nearest / total) if total > 0 else rng.integers(len(fit))
+        centers[c] = fit[pick]
+        nearest = np.minimum(nearest, ((fit - centers[c]) ** 2).sum(axis=1))
+    for _ in range(iterations):
+        label = np.argmin(((fit[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2), axis=1)
+        for c in range(k):
+            members = fit[label == c]
+            if len(members):
+                centers[c] = members.mean(axis=0)
+
+    seeds = np.empty(k, dtype=np.intp)
+    taken = np.zeros(len(points), dtype=bool)
+    for c in range(k):
+        dist = ((points - centers[c]) ** 2).sum(axis=1)
+        dist[taken] = np.inf
+        seeds[c] = int(np.argmin(dist))
+        taken[seeds[c]] = True
+    return seeds, centers
+
+
+def _grow(graph: RoadGraph, member: np.ndarray, seeds: np.ndarray) -> np.ndarray:
+    """Multi-source BFS over roads between members; owner per node (-1 if unreached)."""
+    owner = np.full(len(graph), -1, dtype=np.intp)
+    offsets, targets = graph.offsets, graph.targets
+    allowed = member.tolist()
+    claimed = owner.tolist()
+    queue = deque()
+    for label, s in enumerate(seeds.tolist()):
+        claimed[s] = label
+        queue.append(s)
+    while queue:
+        u = queue.popleft()
+        label = claimed[u]
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            if allowed[v] and claimed[v] < 0:
+                claimed[v] = label
+                queue.append(v)
+    return np.array(claimed, dtype=np.intp)
+
+
+# ============================================================================
+# PLANNING
+# ============================================================================
+
+def _plan_vehicle(graph: RoadGraph, task) -> tuple:
+    depot, objective, stops, recover = task
+    customers = np.zeros(len(graph), dtype=bool)
+    customers[stops] = True
+    route, total = greedy_route(graph, graph.nodes[depot], objective, recover=recover,
+                                customers=customers)
+    return [graph.index(node) for node in route], total
+
+
+def plan_fleet(edges: Union[List[Edge], RoadGraph], depot: Node, vehicles: int,
+               objective: Optional[Objective] = None, nodes: Optional[List[Node]] = None,
+               workers: Optional[int] = None, recover: bool = True, seed: int = 0,
+               by_region: bool = True) -> FleetPlan:
+    """
+    Split the customers among vehicles and plan every vehicle's route in parallel.
+
+    Args:
+        edges (List[Edge] | RoadGraph): Road connections, or their index
+        depot (Node): Depot every vehicle starts from and returns to
+        vehicles (int): Number of vehicles
+        objective (Objective): Greedy scoring rule (default: DriverEarnings)
+        nodes (List[Node]): Optional nodes to index along with the edges
+        workers (int): Worker processes (default: one per available CPU)
+        recover (bool): Use dead-end recovery (needed to reach partitions
+            that do not touch the depot)
+        seed (int): Seed for the spatial clustering
+        by_region (bool): Keep regions apart when partitioning
+
+    Returns:
+        FleetPlan: Per-vehicle routes and totals, and the customer assignment
+    """
+    graph = as_road_graph(edges, nodes)
+    objective = objective if objective is not None else DriverEarnings()
+    labels = partition_customers(graph, vehicles, seed, by_region)
+    d = graph.index(depot)
+    labels[d] = -1
+    order = np.argsort(labels, kind="stable")
+    bounds = np.searchsorted(labels[order], np.arange(vehicles + 1))
+    tasks = [(d, objective, order[bounds[v]:bounds[v + 1]], recover) for v in range(vehicles)]
+
+    with GraphPool(graph, workers) as pool:
+        results = pool.map(_plan_vehicle, tasks)
+
+    routes = []
+    served = np.zeros(len(graph), dtype=bool)
+    for v, (stops, total) in enumerate(results):
+        assigned = tasks[v][2]
+        visited = np.zeros(len(graph), dtype=bool)
+        visited[stops] = True
+        hits = int(visited[assigned].sum())
+        served[assigned[visited[assigned]]] = True
+        routes.append(VehicleRoute(v, [graph.nodes[i] for i in stops], total, len(assigned), hits))
+    unserved = [graph.nodes[i] for i in np.flatnonzero((labels >= 0) & ~served)]
+    return FleetPlan(routes, labels, unserved)
@@ -0,0 +1,127 @@
+"""
+Greedy Algorithm Assignment - Multi-Start Randomized Greedy (GRASP)
+
+Runs many randomized greedy constructions and keeps the best route. Each
+construction uses the engine's restricted candidate list: at every step
+it picks at random among the candidates scoring close to the best one.
+Start 0 is always the plain deterministic greedy route, so the result is
+never worse than the single-pass strategy under the same objective.
+
+Every start draws from its own random stream, spawned from one seed, so a
+start builds the same route no matter which worker runs it. Starts are
+sent to a GraphPool in fixed-size batches and results are consumed in
+start order. Without a time budget the best route is therefore a
+function of the seed and the number of starts only, and is identical for
+any number of workers or batch size.
+
+With a time budget the search stops after the last batch that finished
+in time, so how many starts run depends on the machine and the worker
+count; the result is still the best of a prefix of the same sequence of
+starts (starts_run says how long), but not reproducible run to run.
+"""
+
+import time
+from typing import List, Optional, Union
+
+import numpy as np
+
+from main import Node, Edge, RoadGraph, as_road_graph
+from greedy_engine import DriverEarnings, Objective, greedy_route
+from worker_pool import GraphPool
+
+
+class GraspResult:
+    """
+    Outcome of a multi-start search.
+
+    Attributes:
+        route (List[Node]): Best route found
+        total (float): Its total under the objective
+        best_start (int): Start that produced it (0 is the plain greedy route)
+        totals (np.ndarray): Total of every start that ran, in start order
+        starts_run (int): Starts completed before the budget ran out
+        elapsed (float): Wall-clock seconds
+    """
+
+    def __init__(self, route: List[Node], total: float, best_start: int,
+                 totals: np.ndarray, elapsed: float):
+        self.route = route
+        self.total = total
+        self.best_start = best_start
+        self.totals = totals
+        self.starts_run = len(totals)
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return (f"GraspResult(total={self.total:.2f}, best_start={self.best_start}, "
+                f"starts_run={self.starts_run}, elapsed={self.elapsed:.3f}s)")
+
+
+def _run_batch(graph: RoadGraph, task) -> tuple:
+    """Run a batch of starts; return every start's total and the batch's best route."""
+    depot, objective, alpha, recover, seed, first, count = task
+    totals = []
+    best_route, best_total = None, float("-inf")
+    for start in range(first, first + count):
+        # The same stream SeedSequence(seed).spawn() would give this start
+        stream = np.random.SeedSequence(seed, spawn_key=(start,))
+        rng = None if start == 0 else np.random.default_rng(stream)
+        route, total = greedy_route(graph, graph.nodes[depot], objective, recover=recover,
+                                    rng=rng, alpha=alpha)
+        totals.append(total)
+        if total > best_total:
+            best_route, best_total = route, total
+    return totals, [graph.index(node) for node in best_route]
+
+
+def grasp_route(edges: Union[List[Edge], RoadGraph], depot: Node,
+                objective: Optional[Objective] = None, starts: int = 100,
+                alpha: float = 0.3, seed: int = 0, nodes: Optional[List[Node]] = None,
+                recover: bool = False, workers: Optional[int] = None,
+                time_budget: Optional[float] = None, batch: int = 8) -> GraspResult:
+    """
+    Best route over many seeded randomized greedy constructions.
+
+    Args:
+        edges (List[Edge] | RoadGraph): Road connections, or their index
+        depot (Node): The starting depot location
+        objective (Objective): Scoring rule, e.g. CompanyProfit(), DriverEarnings()
+            or FatigueEarnings() (default: DriverEarnings)
+        starts (int): Constructions to run, including the plain greedy one
+        alpha (float): Restricted candidate list width (see greedy_route)
+        seed (int): Root seed every start's random stream is spawned from
+        nodes (List[Node]): Optional nodes to index along with the edges
+        recover (bool): Use dead-end recovery in every construction
+        workers (int): Worker processes (default: one per available CPU)
+        time_budget (float): Stop after the last batch finished within this
+            many seconds (at least one batch always runs); None for no limit.
+            A budget makes the number of starts, and so the result, depend on
+            timing; leave it None for results identical across worker counts
+        batch (int): Starts per task
+
+    Returns:
+        GraspResult: Best route and total, with every completed start's total
+    """
+    if starts < 1:
+        raise ValueError("need at least one start")
+    graph = as_road_graph(edges, nodes)
+    objective = objective if objective is not None else DriverEarnings()
+    d = graph.index(depot)
+    tasks = [(d, objective, alpha, recover, seed, first, min(batch, starts - first))
+             for first in range(0, starts, batch)]
+
+    begin = time.perf_counter()
+    totals: List[float] = []
+    best_total, best_start, best_stops = float("-inf"), -1, None
+    with GraphPool(graph, workers) as pool:
+        for batch_totals, stops in pool.imap(_run_batch, tasks):
+            # Ties go to the earliest start, as in a sequential run
+            k = int(np.argmax(batch_totals))
+            if batch_totals[k] > best_total:
+                best_total, best_start, best_stops = batch_totals[k], len(totals) + k, stops
+            totals.extend(batch_totals)
+            if time_budget is not None and time.perf_counter() - begin >= time_budget:
+                break
+    elapsed = time.perf_counter() - begin
+    return GraspResult([graph.nodes[i] for i in best_stops], best_total, best_start,
+                       np.array(totals), elapsed)
@@ -4,15 +4,26 @@ Greedy Algorithm Assignment - Greedy Approach Implementation
 You should implement greedy algorithms in this file.
 """
 
-from typing import List, Tuple
-from main import Node, Edge, get_neighbors, calculate_travel_cost, print_route_summary
+from typing import List, Optional, Tuple, Union
+from main import Node, Edge, RoadGraph, print_route_summary
+from travel_costs import TravelCosts, route_travel_cost
+from greedy_engine import greedy_route, CompanyProfit, DriverEarnings, FatigueEarnings
+from fair_routing import RULES, fair_route
+from lookahead import lookahead_route
+from spatial_index import spatial_greedy_route
+from time_costs import TimeCosts
 
 
 # ============================================================================
 # PART A: COMPANY'S GREEDY ALGORITHM 
 # ============================================================================
 
-def greedy_company_route(nodes: List[Node], depot: Node, edges: List[Edge]) -> Tuple[List[Node], float]:
+def greedy_company_route(nodes: List[Node], depot: Node, edges: Union[List[Edge], RoadGraph],
+                         recover: bool = False, lookahead: int = 1,
+                         budget: Optional[float] = None,
+                         time_costs: Optional[TimeCosts] = None,
+                         departure: float = 0.0,
+                         radius: Optional[float] = None) -> Tuple[List[Node], float]:
     """
     Part A: Implement the company's greedy algorithm.
     
@@ -29,7 +40,21 @@ def greedy_company_route(nodes: List[Node], depot: Node, edges: List[Edge]) -> T
     Args:
         nodes (List[Node]): All delivery locations including depot
         depot (Node): The starting depot location
-        edges (List[Edge]): All road connections between cities
+        edges (List[Edge] | RoadGraph): All road connections between cities
+            (pass a prebuilt RoadGraph to skip re-indexing the edges)
+        recover (bool): At a dead end, drive by road to the best reachable
+            unvisited customer instead of stopping (see greedy_engine)
+        lookahead (int): Score each neighbor by the best continuation of this
+            many hops (1 = one-step greedy; see lookahead.py)
+        budget (float): Seconds per lookahead decision before the search keeps
+            the deepest level it finished; None (default) searches every
+            level, so the route does not depend on machine speed
+        time_costs (TimeCosts): Charge each hop by road and departure time
+            (see time_costs.py); None uses the flat cost per mile
+        departure (float): Clock time at the depot, in minutes after midnight
+        radius (float): Treat every customer within this straight-line
+            distance as a neighbor, found with a spatial index, instead of
+            following the edges (see spatial_index.py); None uses the roads
         
     Returns:
         Tuple[List[Node], float]: (route as list of nodes, total profit)
@@ -37,57 +62,18 @@ def greedy_company_route(nodes: List[Node], depot: Node, edges: List[Edge]) -> T
     TODO: Students implement this function
     """
     # START YOUR IMPLEMENTATION HERE
-    
-    # Hints:
-    # - Use get_neighbors(current_node, edges) to find connected cities
-    # - Use current_node.distance_to(neighbor) to get distance
-    # - Use calculate_travel_cost(distance) to get travel cost
-    # - Keep track of visited customers using a set of IDs
-    # - Calculate profit = neighbor.delivery_fee - travel_cost
-    # - Choose the neighbor with the highest profit at each step
-    # - Only consider unvisited customer neighbors (not depot, not already visited)
-    # - Don't forget to return to the depot at the end
-    depot_id = depot.id
-    visited = set()
-    route: List[Node] = [depot]
-    total_profit = 0.0
-    current_node = depot
-
-    while True: 
-        neighbors = get_neighbors(current_node, edges)
-        candidates = []
-        for n in neighbors:
-            if n.id != depot_id and n.id not in visited:
-                candidates.append(n)
-        if not candidates:
-            break
-
-        best = None
-        best_profit = float('-inf')
-        for n in candidates:
-            distance = current_node.distance_to(n)
-            travel_cost = calculate_travel_cost(distance)
-            profit = n.delivery_fee - travel_cost
-            if profit > best_profit:
-                best_profit = profit
-                best = n
-        
-        move_distance = current_node.distance_to(best)
-        move_cost = calculate_travel_cost(move_distance)
-        total_profit += best.delivery_fee - move_cost
-        visited.add(best.id)
-        route.append(best)
-        current_node = best
-
-    if current_node.id != depot_id:
-        return_distance = current_node.distance_to(depot)
-        return_cost = calculate_travel_cost(return_distance)
-        total_profit -= return_cost
-        route.append(depot)
-    
-    return route, total_profit
+    if radius is not None:
+        if lookahead > 1 or time_costs is not None:
+            raise ValueError("radius does not support lookahead or time-dependent costs")
+        return spatial_greedy_route(_spatial_nodes(nodes, edges), depot, CompanyProfit(), radius, recover)
+    if lookahead > 1:
+        if time_costs is not None:
+            raise ValueError("lookahead does not support time-dependent costs")
+        result = lookahead_route(edges, depot, lookahead, CompanyProfit(), nodes, recover, budget)
+        return result.route, result.total
+    return greedy_route(edges, depot, CompanyProfit(), nodes, recover,
+                        time_costs=time_costs, departure=departure)
 
-        
     # END YOUR IMPLEMENTATION
 
 
@@ -95,7 +81,12 @@ def greedy_company_route(nodes: List[Node], depot: Node, edges: List[Edge]) -> T
 # PART B: DRIVER'S GREEDY ALGORITHM - STUDENT IMPLEMENTATION
 # ============================================================================
 
-def greedy_driver_route(nodes: List[Node], depot: Node, edges: List[Edge]) -> Tuple[List[Node], float]:
+def greedy_driver_route(nodes: List[Node], depot: Node, edges: Union[List[Edge], RoadGraph],
+                        recover: bool = False, lookahead: int = 1,
+                        budget: Optional[float] = None,
+                        time_costs: Optional[TimeCosts] = None,
+                        departure: float = 0.0,
+                        radius: Optional[float] = None) -> Tuple[List[Node], float]:
     """
     Part B: Implement the driver's greedy algorithm.
     
@@ -112,7 +103,21 @@ def greedy_driver_route(nodes: List[Node], depot: Node, edges: List[Edge]) -> Tu
     Args:
         nodes (List[Node]): All delivery locations including depot
         depot (Node): The starting depot location
-        edges (List[Edge]): All road connections between cities
+        edges (List[Edge] | RoadGraph): All road connections between cities
+            (pass a prebuilt RoadGraph to skip re-indexing the edges)
+        recover (bool): At a dead end, drive by road to the best reachable
+            unvisited customer instead of stopping (see greedy_engine)
+        lookahead (int): Score each neighbor by the best continuation of this
+            many hops (1 = one-step greedy; see lookahead.py)
+        budget (float): Seconds per lookahead decision before the search keeps
+            the deepest level it finished; None (default) searches every
+            level, so the route does not depend on machine speed
+        time_costs (TimeCosts): Charge each hop by road and departure time
+            (see time_costs.py); None uses the flat cost per mile
+        departure (float): Clock time at the depot, in minutes after midnight
+        radius (float): Treat every customer within this straight-line
+            distance as a neighbor, found with a spatial index, instead of
+            following the edges (see spatial_index.py); None uses the roads
         
     Returns:
         Tuple[List[Node], float]: (route as list of nodes, total earnings)
@@ -120,68 +125,18 @@ def greedy_driver_route(nodes: List[Node], depot: Node, edges: List[Edge]) -> Tu
     TODO: Students implement this function
     """
     # START YOUR IMPLEMENTATION HERE
-    
-    # Hints:
-    # - Similar to Part A, but now consider tips too
-    # - Use get_neighbors(current_node, edges) to find connected cities
-    # - Calculate earnings = neighbor.delivery_fee + neighbor.estimated_tip - travel_cost
-    # - Choose the neighbor with the highest earnings at each step
-    # - Keep track of total earnings (fees + tips - costs)
-    
-    # Example modification from Part A:
-    # earnings = neighbor.delivery_fee + neighbor.estimated_tip - travel_cost
-    
-    current_city = depot
-    visited = set()
-    route = [depot]
-    total_earnings = 0.0
-
-    while True:
-        neighbors = get_neighbors(current_city, edges)
+    if radius is not None:
+        if lookahead > 1 or time_costs is not None:
+            raise ValueError("radius does not support lookahead or time-dependent costs")
+        return spatial_greedy_route(_spatial_nodes(nodes, edges), depot, DriverEarnings(), radius, recover)
+    if lookahead > 1:
+        if time_costs is not None:
+            raise ValueError("lookahead does not support time-dependent costs")
+        result = lookahead_route(edges, depot, lookahead, DriverEarnings(), nodes, recover, budget)
+        return result.route, result.total
+    return greedy_route(edges, depot, DriverEarnings(), nodes, recover,
+                        time_costs=time_costs, departure=departure)
 
-        # only unvisited customers (not the depot)
-        candidates = []
-        for city in neighbors:
-            if city.id != depot.id and city.id not in visited:
-                candidates.append(city)
-
-        if len(candidates) == 0:
-            break
-
-        best = None
-        best_earnings = float('-inf')
-
-        for city in candidates:
-            distance = current_city.distance_to(city)
-            move_cost = calculate_travel_cost(distance)
-            earnings = city.delivery_fee + city.estimated_tip - move_cost
-            if earnings > best_earnings:
-                best_earnings = earnings
-                best = city
-
-        if best is None:
-            break  # safety
-
-        # move to best and update totals
-        move_distance = current_city.distance_to(best)
-        move_cost = calculate_travel_cost(move_distance)
-        total_earnings += best.delivery_fee + best.estimated_tip - move_cost
-
-        route.append(best)
-        visited.add(best.id)      
-        current_city = best
-
-    # return to depot
-    if current_city != depot:
-        return_distance = current_city.distance_to(depot)
-        return_cost = calculate_travel_cost(return_distance)
-        total_earnings -= return_cost
-        route.append(depot)
-
-    return route, total_earnings
-
-    
-    
     # END YOUR IMPLEMENTATION
 
 
@@ -189,7 +144,11 @@ def greedy_driver_route(nodes: List[Node], depot: Node, edges: List[Edge]) -> Tu
 # PART C: ETHICAL GREEDY ALGORITHM - STUDENT IMPLEMENTATION
 # ============================================================================
 
-def greedy_ethical_route(nodes: List["Node"], depot: "Node", edges: List["Edge"], long_hop_threshold: float = 6.0, short_hop_limit: float = 3.0 ) -> Tuple[List["Node"], float]:
+def greedy_ethical_route(nodes: List["Node"], depot: "Node", edges: Union[List["Edge"], RoadGraph], long_hop_threshold: float = 6.0, short_hop_limit: float = 3.0,
+                         recover: bool = False, ethical_rule: str = "fatigue",
+                         time_costs: Optional[TimeCosts] = None,
+                         departure: float = 0.0,
+                         radius: Optional[float] = None) -> Tuple[List["Node"], float]:
     """
     Part C: Implement an ethically-modified greedy algorithm.
     
@@ -204,8 +163,19 @@ def greedy_ethical_route(nodes: List["Node"], depot: "Node", edges: List["Edge"]
     Args:
         nodes (List[Node]): All delivery locations including depot
         depot (Node): The starting depot location
-        edges (List[Edge]): All road connections between cities
-        ethical_rule (str): Which ethical rule to apply
+        edges (List[Edge] | RoadGraph): All road connections between cities
+            (pass a prebuilt RoadGraph to skip re-indexing the edges)
+        recover (bool): At a dead end, drive by road to the best reachable
+            unvisited customer instead of stopping (see greedy_engine)
+        ethical_rule (str): Which ethical rule to apply: "fatigue" (uses the
+            two hop thresholds), or "fairness" / "balance" (see fair_routing)
+        time_costs (TimeCosts): Charge each hop by road and departure time
+            ("fatigue" only; see time_costs.py)
+        departure (float): Clock time at the depot, in minutes after midnight
+        radius (float): Treat every customer within this straight-line
+            distance as a neighbor, found with a spatial index, instead of
+            following the edges ("fatigue" only, which then applies
+            short_hop_limit to those hops; see spatial_index.py)
         
     Returns:
         Tuple[List[Node], float]: (route as list of nodes, total profit/earnings)
@@ -213,118 +183,62 @@ def greedy_ethical_route(nodes: List["Node"], depot: "Node", edges: List["Edge"]
     TODO: Students implement this function with ethical modifications
     """
     # START YOUR IMPLEMENTATION HERE
-    
-    # Hints:
-    # - Start with either your Part A or Part B algorithm as a base
-    # - Add ethical considerations to the greedy selection process
-    # - Use get_neighbors(current_node, edges) to find connected cities
-    # - Examples:
-    #   * Fairness: Give bonus/penalty based on tip equity
-    #   * Fatigue: Penalize long consecutive drives
-    #   * Balance: Encourage visiting different regions early
-    # - You can modify the scoring function to include ethical factors
-    # - Compare results with and without ethical modifications
- 
-   
-    current_city = depot
-    visited_ids = set()
-    route: List["Node"] = [depot]
-    total_earnings = 0.0
-
-    last_hop_distance = 0.0  # track distance of last move
-
-    def score(next_city: "Node") -> float:
-        """Calculate driver's immediate earnings for visiting next_city."""
-        d = current_city.distance_to(next_city)
-        cost = calculate_travel_cost(d)
-        return next_city.delivery_fee + next_city.estimated_tip - cost
-
-    while True:
-        # Gather unvisited neighboring customers (not the depot)
-        neighbors = get_neighbors(current_city, edges)
-        candidates: List["Node"] = []
-        for city in neighbors:
-            if city.id != depot.id and city.id not in visited_ids:
-                candidates.append(city)
-
-        if len(candidates) == 0:
-            break  # no unvisited neighbors
-
-        # Apply fatigue rule if last hop was long
-        restricted = candidates
-        if last_hop_distance > long_hop_threshold:
-            short_neighbors: List["Node"] = []
-            for city in candidates:
-                d = current_city.distance_to(city)
-                if d <= short_hop_limit:
-                    short_neighbors.append(city)
-            if len(short_neighbors) > 0:
-                restricted = short_neighbors
-
-        # Pick neighbor with highest earnings
-        best_city = None
-        best_gain = float("-inf")
-        for city in restricted:
-            gain = score(city)
-            if gain > best_gain:
-                best_gain = gain
-                best_city = city
-
-        if best_city is None:
-            break 
-
-        # Move to the best city and update totals
-        move_distance = current_city.distance_to(best_city)
-        move_cost = calculate_travel_cost(move_distance)
-        total_earnings += best_city.delivery_fee + best_city.estimated_tip - move_cost
-
-        route.append(best_city)
-        visited_ids.add(best_city.id)
-        current_city = best_city
-        last_hop_distance = move_distance  
+    if ethical_rule in RULES:
+        if time_costs is not None or radius is not None:
+            raise ValueError(f"the {ethical_rule!r} rule does not support time-dependent costs or radius")
+        report = fair_route(edges, depot, ethical_rule, DriverEarnings(), nodes, recover=recover)
+        return report.route, report.total
+    if ethical_rule != "fatigue":
+        raise ValueError(f"unknown ethical rule {ethical_rule!r}")
+    objective = FatigueEarnings(long_hop_threshold, short_hop_limit)
+    if radius is not None:
+        if time_costs is not None:
+            raise ValueError("radius does not support time-dependent costs")
+        return spatial_greedy_route(_spatial_nodes(nodes, edges), depot, objective, radius, recover)
+    return greedy_route(edges, depot, objective, nodes, recover,
+                        time_costs=time_costs, departure=departure)
 
-    # Return to depot and subtract the travel cost
-    if current_city != depot:
-        back_distance = current_city.distance_to(depot)
-        back_cost = calculate_travel_cost(back_distance)
-        total_earnings -= back_cost
-        route.append(depot)
-
-    return route, total_earnings
-    
     # END YOUR IMPLEMENTATION
 
 
 # ============================================================================
 # TESTING FUNCTIONS
 # ============================================================================
-def _route_cost(route: List[Node]) -> float:
-    """Sum travel cost along the route using calculate_travel_cost."""
+def _spatial_nodes(nodes: List[Node], edges: Union[List[Edge], RoadGraph]) -> Union[List[Node], RoadGraph]:
+    """The nodes to index for a radius route: a prebuilt RoadGraph's, else the given list."""
+    return edges if isinstance(edges, RoadGraph) else nodes
+
+
+def _route_cost(route: List[Node], edges: Union[List[Edge], RoadGraph, None] = None) -> float:
+    """
+    Sum travel cost along the route using the precomputed cost store.
+    
+    Pass the RoadGraph the route was planned on to reuse its coordinate
+    arrays; otherwise the hop costs are computed in one batch from the route.
+    """
     if not route or len(route) < 2:
         return 0.0
-    total = 0.0
-    for i in range(len(route) - 1):
-        d = route[i].distance_to(route[i+1])
-        total += calculate_travel_cost(d)
-    return total
+    if isinstance(edges, RoadGraph):
+        return TravelCosts.for_graph(edges).route_cost(route)
+    return route_travel_cost(route)
 
 
 def test_mn_data():
     """Test implementations with Minnesota data."""
     try:
-        from mn_dataset import MN_NODES, MN_DEPOT, MN_EDGES
+        from mn_dataset import MN_NODES, MN_DEPOT, MN_EDGES, MN_GRAPH
         
         print("\n" + "="*60)
         print("TESTING WITH MINNESOTA DATA")
         print("="*60)
         
         print(f"Minnesota nodes: {len(MN_NODES)}")
-        print(f"Minnesota edges: {len(MN_EDGES)}")
+        print(f"Minnesota edges: {len(MN_EDGES)} ({MN_GRAPH.num_edges} distinct roads)")
         print(f"Minnesota depot: {MN_DEPOT}")
         
         # Test Part A on larger dataset
         try:
-            route_a_mn, profit_a_mn = greedy_company_route(MN_NODES, MN_DEPOT, MN_EDGES)
+            route_a_mn, profit_a_mn = greedy_company_route(MN_NODES, MN_DEPOT, MN_GRAPH)
             print(f"\nCompany algorithm on MN data: ${profit_a_mn:.2f} profit")
             print(f"Route length: {len(route_a_mn)} stops")
         except NotImplementedError:
@@ -334,8 +248,8 @@ def test_mn_data():
 
         # Part B: Driver Greedy 
         try:
-            route_b_mn, earn_b_mn = greedy_driver_route(MN_NODES, MN_DEPOT, MN_EDGES)
-            cost_b = _route_cost(route_b_mn)
+            route_b_mn, earn_b_mn = greedy_driver_route(MN_NODES, MN_DEPOT, MN_GRAPH)
+            cost_b = _route_cost(route_b_mn, MN_GRAPH)
             print("\n--- PART B: DRIVER GREEDY ---")
             print_route_summary(route_b_mn, earn_b_mn, cost_b)
         except Exception as e:
@@ -345,10 +259,10 @@ def test_mn_data():
         try:
             # tweak thresholds if your distances are on a different scale
             route_c_mn, earn_c_mn = greedy_ethical_route(
-                MN_NODES, MN_DEPOT, MN_EDGES,
+                MN_NODES, MN_DEPOT, MN_GRAPH,
                 long_hop_threshold=2.0, short_hop_limit=1.0
             )
-            cost_c = _route_cost(route_c_mn)
+            cost_c = _route_cost(route_c_mn, MN_GRAPH)
             print("\n--- PART C: ETHICAL (FATIGUE) ---")
             print_route_summary(route_c_mn, earn_c_mn, cost_c)
 
@@ -359,6 +273,17 @@ def test_mn_data():
         except Exception as e:
             print(f"\nError in Part C on MN data: {e}")
 
+        # Part B again, recovering from dead ends instead of stopping
+        try:
+            route_r_mn, earn_r_mn = greedy_driver_route(MN_NODES, MN_DEPOT, MN_GRAPH, recover=True)
+            cost_r = _route_cost(route_r_mn, MN_GRAPH)
+            served = len({node.id for node in route_r_mn}) - 1
+            print("\n--- PART B WITH DEAD-END RECOVERY ---")
+            print_route_summary(route_r_mn, earn_r_mn, cost_r)
+            print(f"Customers served: {served} of {len(MN_NODES) - 1}")
+        except Exception as e:
+            print(f"\nError in Part B recovery on MN data: {e}")
+
         
             
     except ImportError:
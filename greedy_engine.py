@@ -0,0 +1,456 @@
+"""
+Greedy Algorithm Assignment - Shared Greedy Engine
+
+One greedy loop for every strategy. At each step the whole frontier of
+neighbors is scored in a single NumPy operation, with the visited set
+(which starts out holding the depot) applied as a mask. Strategies differ
+only in their Objective: what a stop is worth, how a candidate is scored,
+and which candidates are allowed.
+
+With recover=True a dead end no longer ends the route: the engine drives
+over the road network to the best reachable unvisited customer, using the
+graph's cached shortest-path trees, and returns to the depot by road.
+
+Hop costs come from TravelCosts, or with a TimeCosts model from its
+precomputed tensor row for the driver's clock at each departure.
+
+When an instrumentation Profiler is enabled, each run reports its setup,
+scoring, recovery and depot-return time, plus per-step latency and
+frontier sizes (see instrumentation.py).
+"""
+
+import time
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+import instrumentation
+from main import Node, Edge, RoadGraph, as_road_graph
+from shortest_paths import ShortestPathCache, ShortestPathTree
+from time_costs import TimeCosts
+from travel_costs import TravelCosts, common_store, node_column
+
+
+class NodeArrays:
+    """
+    Node attributes gathered into NumPy arrays by dense graph index.
+
+    Attributes:
+        fees (np.ndarray): delivery_fee per node
+        tips (np.ndarray): estimated_tip per node
+        priority (np.ndarray): priority per node (1=highest)
+        is_depot (np.ndarray): True for depot nodes
+        region (np.ndarray): Region code per node
+        regions (List[str]): Region names, indexed by code
+        node_version (int): graph.node_version(*COLUMNS) the arrays were gathered at
+    """
+
+    COLUMNS = ("delivery_fee", "estimated_tip", "priority", "is_depot", "region_code")
+
+    def __init__(self, graph: RoadGraph):
+        nodes = graph.nodes
+        self.node_version = graph.node_version(*self.COLUMNS)
+        self.fees = node_column(nodes, "delivery_fee", np.float64)
+        self.tips = node_column(nodes, "estimated_tip", np.float64)
+        self.priority = node_column(nodes, "priority", np.int8)
+        self.is_depot = node_column(nodes, "is_depot", np.int8).astype(bool)
+        store = common_store(nodes)
+        if store is not None:
+            self.regions = list(store.regions)
+            self.region = node_column(nodes, "region_code", np.uint16).astype(np.intp)
+        else:
+            self.regions = sorted({node.region for node in nodes})
+            codes = {name: code for code, name in enumerate(self.regions)}
+            self.region = np.fromiter((codes[node.region] for node in nodes),
+                                      dtype=np.intp, count=len(nodes))
+
+    @classmethod
+    def for_graph(cls, graph: RoadGraph) -> "NodeArrays":
+        """Return the graph's node arrays, gathering them again if a node changed since."""
+        arrays = cls.cached(graph)
+        if arrays is None:
+            arrays = cls(graph)
+            graph.derived["node_arrays"] = arrays
+        return arrays
+
+    @classmethod
+    def cached(cls, graph: RoadGraph) -> Optional["NodeArrays"]:
+        """The graph's node arrays if they are gathered and current, else None."""
+        arrays = graph.derived.get("node_arrays")
+        if arrays is None or arrays.node_version != graph.node_version(*cls.COLUMNS):
+            return None
+        return arrays
+
+
+class RouteState:
+    """
+    Mutable state of one greedy run, visible to objectives.
+
+    Attributes:
+        graph (RoadGraph): The road network being routed on
+        arrays (NodeArrays): Node attributes by dense index
+        depot (int): Dense index of the depot
+        current (int): Dense index of the current position
+        visited (np.ndarray): Boolean mask of nodes that can no longer be stops
+            (visited ones, the depot, and any outside the run's customers)
+        stops (List[int]): Dense indices driven through so far, starting at the depot
+        last_hop_distance (float): Length of the most recent hop
+        region_served (np.ndarray): Number of stops made in each region
+    """
+
+    def __init__(self, graph: RoadGraph, arrays: NodeArrays, depot: int):
+        self.graph = graph
+        self.arrays = arrays
+        self.depot = depot
+        self.current = depot
+        self.visited = np.zeros(len(graph), dtype=bool)
+        self.visited[depot] = True
+        self.stops: List[int] = [depot]
+        self.last_hop_distance = 0.0
+        self.region_served = np.zeros(max(len(arrays.regions), 1), dtype=np.intp)
+
+    def move(self, j: int, distance: float):
+        """Record a hop to the node at dense index j."""
+        self.visited[j] = True
+        self.stops.append(j)
+        self.current = j
+        self.last_hop_distance = distance
+        self.region_served[self.arrays.region[j]] += 1
+
+    def pass_through(self, j: int):
+        """Drive through the node at dense index j without making a stop."""
+        self.stops.append(j)
+        self.current = j
+
+
+# ============================================================================
+# OBJECTIVES
+# ============================================================================
+
+class Objective:
+    """
+    Scoring rule for the greedy engine.
+
+    rewards() gives what each stop adds to the route total before travel
+    cost; score() ranks the current frontier (reward - hop cost by
+    default); allowed() can narrow the frontier further. bonus_bound is
+    the most score() can add on top of reward - cost, which lets dead-end
+    recovery stop searching once farther customers cannot win. reads_route
+    is set when score() or allowed() look at more of the RouteState than
+    the current position and the visited mask (the last hop, regions
+    served), so a search cannot reuse results across routes that differ
+    only in that history.
+    """
+
+    include_tips = False
+    bonus_bound = 0.0
+    reads_route = False
+
+    def rewards(self, arrays: NodeArrays) -> np.ndarray:
+        """Per-node value counted in the route total."""
+        if self.include_tips:
+            return arrays.fees + arrays.tips
+        return arrays.fees.copy()
+
+    def allowed(self, state: RouteState, lengths: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Narrow the mask of unvisited candidates (default: no restriction)."""
+        return mask
+
+    def score(self, state: RouteState, candidates: np.ndarray, rewards: np.ndarray,
+              costs: np.ndarray) -> np.ndarray:
+        """Score every candidate at once; the highest score is chosen."""
+        return rewards[candidates] - costs
+
+
+class CompanyProfit(Objective):
+    """Part A: delivery_fee - travel_cost."""
+
+
+class DriverEarnings(Objective):
+    """Part B: delivery_fee + estimated_tip - travel_cost."""
+
+    include_tips = True
+
+
+class FatigueEarnings(DriverEarnings):
+    """
+    Part C: driver earnings with the fatigue rule.
+
+    After a hop longer than long_hop_threshold, only neighbors within
+    short_hop_limit are considered, if there are any.
+    """
+
+    reads_route = True
+
+    def __init__(self, long_hop_threshold: float = 6.0, short_hop_limit: float = 3.0):
+        self.long_hop_threshold = long_hop_threshold
+        self.short_hop_limit = short_hop_limit
+
+    def allowed(self, state: RouteState, lengths: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        if state.last_hop_distance > self.long_hop_threshold:
+            short = mask & (lengths <= self.short_hop_limit)
+            if short.any():
+                return short
+        return mask
+
+
+class PriorityEarnings(DriverEarnings):
+    """
+    Driver earnings plus a bonus for urgent stops.
+
+    A stop with priority p scores an extra weight * (5 - p), so priority 1
+    gets the largest bonus. The bonus only affects the choice, not the total.
+    """
+
+    def __init__(self, weight: float = 2.0):
+        self.weight = weight
+        self.bonus_bound = weight * 4
+
+    def score(self, state: RouteState, candidates: np.ndarray, rewards: np.ndarray,
+              costs: np.ndarray) -> np.ndarray:
+        urgency = 5 - state.arrays.priority[candidates].astype(np.float64)
+        return rewards[candidates] - costs + self.weight * urgency
+
+
+class RegionBalanceEarnings(DriverEarnings):
+    """
+    Driver earnings plus a bonus for regions that have had few stops.
+
+    A candidate in a region already served k times scores an extra
+    weight / (1 + k). The bonus only affects the choice, not the total.
+    """
+
+    reads_route = True
+
+    def __init__(self, weight: float = 5.0):
+        self.weight = weight
+        self.bonus_bound = weight
+
+    def score(self, state: RouteState, candidates: np.ndarray, rewards: np.ndarray,
+              costs: np.ndarray) -> np.ndarray:
+        served = state.region_served[state.arrays.region[candidates]]
+        return rewards[candidates] - costs + self.weight / (1.0 + served)
+
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+def greedy_route(edges: Union[List[Edge], RoadGraph], depot: Node, objective: Objective,
+                 nodes: Union[List[Node], None] = None,
+                 recover: bool = False,
+                 customers: Optional[np.ndarray] = None,
+                 rng: Optional[np.random.Generator] = None,
+                 alpha: float = 0.0,
+                 time_costs: Optional[TimeCosts] = None,
+                 departure: float = 0.0) -> Tuple[List[Node], float]:
+    """
+    Build a route greedily under the given objective.
+
+    Starting at the depot, repeatedly move to the best-scoring unvisited
+    neighbor until none is left, then return to the depot in a straight line.
+
+    With recover=True, a dead end triggers a drive along the shortest road
+    path to the best reachable unvisited customer (scored with the road
+    distance as its travel cost), and the final return to the depot follows
+    roads too. Nodes driven through on the way appear in the route but are
+    not counted as stops.
+
+    Args:
+        edges (List[Edge] | RoadGraph): Road connections, or their index
+        depot (Node): The starting depot location
+        objective (Objective): Scoring rule (e.g. CompanyProfit())
+        nodes (List[Node]): Optional nodes to index along with the edges
+        recover (bool): Keep going past dead ends until every reachable customer is visited
+        customers (np.ndarray): Boolean mask by dense index of the nodes this
+            route may stop at (e.g. one vehicle's share); None allows all.
+            Other nodes can still be driven through during recovery.
+        rng (np.random.Generator): Makes the construction randomized (GRASP):
+            each step picks uniformly among the candidates scoring within
+            alpha of the best, relative to the spread of scores
+        alpha (float): Width of that restricted candidate list, from 0
+            (always the best, as without rng) to 1 (any allowed candidate)
+        time_costs (TimeCosts): Time-dependent road costs of this graph (so
+            edges must be the RoadGraph it was built for); each hop is charged
+            for its departure time (recovery still ranks candidates by road
+            distance at the flat rate, but is charged at the timed cost)
+        departure (float): Clock time at the depot, in minutes after midnight
+
+    Returns:
+        Tuple[List[Node], float]: (route as list of nodes, total reward - travel cost)
+
+    Raises:
+        ValueError: If time_costs was built for a different graph
+    """
+    probe = instrumentation.current()
+    if probe is not None:
+        clock = time.perf_counter
+        phase_start = clock()
+    graph = as_road_graph(edges, nodes)
+    if time_costs is not None and time_costs.graph is not graph:
+        raise ValueError("time_costs was built for a different graph")
+    travel = TravelCosts.for_graph(graph)
+    arrays = NodeArrays.for_graph(graph)
+    paths = ShortestPathCache.for_graph(graph) if recover else None
+    state = RouteState(graph, arrays, graph.index(depot))
+    if customers is not None:
+        state.visited |= ~customers
+    rewards = objective.rewards(arrays)
+    offsets = graph.offsets
+    total = 0.0
+    minutes = departure
+    hop_costs = travel.costs if time_costs is None else time_costs.sync().hop_costs(minutes)
+    if probe is not None:
+        probe.add_phase("setup", clock() - phase_start)
+
+    while True:
+        if probe is not None:
+            step_start = clock()
+        start, end = offsets[state.current], offsets[state.current + 1]
+        candidates = travel.targets[start:end]
+        mask = ~state.visited[candidates]
+        if not mask.any():
+            if paths is None:
+                break
+            before = len(state.stops) - 1
+            gain = _recover(state, objective, rewards, travel, paths.tree(state.current))
+            if probe is not None:
+                elapsed = clock() - step_start
+                probe.count("recovery")
+                probe.add_phase("recovery", elapsed)
+                probe.step(elapsed)
+            if gain is None:
+                break
+            if time_costs is not None:
+                cost, minutes = time_costs.path_cost(state.stops[before:], minutes)
+                gain = float(rewards[state.current]) - cost
+                hop_costs = time_costs.hop_costs(minutes)
+            total += gain
+            continue
+        lengths = travel.lengths[start:end]
+        costs = hop_costs[start:end]
+        mask = objective.allowed(state, lengths, mask)
+        scores = np.where(mask, objective.score(state, candidates, rewards, costs), -np.inf)
+        k = int(np.argmax(scores)) if rng is None else _restricted_choice(scores, mask, rng, alpha)
+        j = int(candidates[k])
+        total += float(rewards[j] - costs[k])
+        state.move(j, float(lengths[k]))
+        if time_costs is not None:
+            minutes += time_costs.minutes(float(lengths[k]))
+            hop_costs = time_costs.hop_costs(minutes)
+        if probe is not None:
+            elapsed = clock() - step_start
+            probe.count("scoring")
+            probe.add_phase("scoring", elapsed)
+            probe.neighbors(end - start)
+            probe.step(elapsed)
+
+    if probe is not None:
+        phase_start = clock()
+    if state.current != state.depot:
+        road_home = paths.path(state.current, state.depot) if paths is not None else []
+        if road_home:
+            if time_costs is None:
+                total -= paths.distance(state.current, state.depot) * travel.base_cost_per_mile
+            else:
+                total -= time_costs.path_cost(road_home, minutes)[0]
+            for i in road_home[1:]:
+                state.pass_through(i)
+        else:
+            if time_costs is None:
+                total -= travel.cost(state.current, state.depot)
+            else:
+                total -= time_costs.straight_cost(travel.distance(state.current, state.depot), minutes)
+            state.stops.append(state.depot)
+    if probe is not None:
+        probe.add_phase("depot_return", clock() - phase_start)
+
+    return [graph.nodes[i] for i in state.stops], total
+
+
+def _restricted_choice(scores: np.ndarray, mask: np.ndarray, rng: np.random.Generator,
+                       alpha: float) -> int:
+    """Pick uniformly among allowed candidates within alpha of the best score."""
+    best = scores.max()
+    worst = scores[mask].min()
+    choices = np.flatnonzero(mask & (scores >= best - alpha * (best - worst)))
+    if len(choices) == 1:
+        return int(choices[0])
+    return int(choices[rng.integers(len(choices))])
+
+
+def _settled_blocks(tree: ShortestPathTree, size: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Group a tree's settled nodes into (indices, distances) arrays, nearest first."""
+    block: List[int] = []
+    dists: List[float] = []
+    for v, d in tree.settled():
+        block.append(v)
+        dists.append(d)
+        if len(block) == size:
+            yield np.array(block, dtype=np.intp), np.array(dists)
+            block, dists = [], []
+    if block:
+        yield np.array(block, dtype=np.intp), np.array(dists)
+
+
+def stop_on_path(path: List[int], is_open: Callable[[int], bool]) -> List[int]:
+    """
+    Cut a road path at the first node after its start that is still open.
+
+    A drive along a road path makes its stop at the first customer it
+    passes, not necessarily the one the path was planned to; recovery and
+    the detours of the other routing modes all follow this rule.
+
+    Args:
+        path (List[int]): Dense node indices from the current position on
+        is_open (Callable[[int], bool]): Whether a node can still be stopped at
+
+    Returns:
+        List[int]: The path up to and including that node (the whole path if
+        none before its end is open)
+    """
+    for k in range(1, len(path)):
+        if is_open(path[k]):
+            return path[:k + 1]
+    return path
+
+
+def _recover(state: RouteState, objective: Objective, rewards: np.ndarray,
+             travel: TravelCosts, tree: ShortestPathTree, block: int = 64) -> Optional[float]:
+    """
+    Drive from a dead end to the best reachable unvisited customer.
+
+    The tree is expanded outward in blocks and the search stops once even
+    the best remaining reward cannot beat the best candidate found, given
+    the extra distance. If the shortest path passes another unvisited
+    customer first, the stop is made there instead.
+
+    Returns:
+        Optional[float]: Reward minus road cost of the stop, or None if nothing is reachable
+    """
+    unvisited = ~state.visited
+    if not unvisited.any():
+        return None
+    bound = float(rewards[unvisited].max()) + objective.bonus_bound
+    rate = travel.base_cost_per_mile
+    best, best_score = -1, float("-inf")
+    for candidates, dists in _settled_blocks(tree, block):
+        mask = ~state.visited[candidates]
+        if mask.any():
+            mask = objective.allowed(state, dists, mask)
+            scores = np.where(mask, objective.score(state, candidates, rewards, dists * rate), -np.inf)
+            k = int(np.argmax(scores))
+            if scores[k] > best_score:
+                best, best_score = int(candidates[k]), float(scores[k])
+        if bound - dists[-1] * rate < best_score:
+            break
+    if best < 0:
+        return None
+
+    path = stop_on_path(tree.path(best), lambda i: not state.visited[i])
+    for i in path[1:-1]:
+        state.pass_through(i)
+    target = path[-1]
+    distance = tree.dist[target]
+    state.move(target, distance)
+    return float(rewards[target] - distance * rate)
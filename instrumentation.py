@@ -0,0 +1,246 @@
+"""
+Greedy Algorithm Assignment - Opt-in Instrumentation
+
+Answers "where did the time go?" for a slow dispatch. A Profiler records
+call counts, neighbor-list sizes, a per-step latency histogram and the
+total time spent in each phase of route construction (setup, candidate
+scoring, dead-end recovery, depot return), and exports them as a dict,
+as JSON, or as a pstats file that cProfile tooling can read.
+
+Usage:
+    with Profiler() as prof:
+        greedy_driver_route(nodes, depot, graph)
+    print(prof.to_json())
+
+Nothing is wrapped until a Profiler is enabled. Enabling swaps timed
+wrappers in for the engine's own call sites: the strategies and the
+greedy_route they call, as looked up in greedy_approach.py, dead-end
+recovery in greedy_engine.py, and shortest-path tree lookups. Only those
+module attributes are rebound: a name copied elsewhere with "from ...
+import" keeps the original and is not timed, while the engine's phase
+timers, frontier sizes and step histogram (scoring and recovery steps)
+cover every greedy_route run however it is reached. Disabling puts the
+originals back.
+
+The helpers in main.py (Node.distance_to, get_neighbors and
+calculate_travel_cost) are called far too often to wrap. They count
+their own calls, and get_neighbors the size of every neighbor list, into
+main._probe, which is None unless a Profiler is enabled; so they are
+counted under any name they were imported as. While disabled, those
+helpers and the greedy engine each pay one "is a profiler active" check
+per call or step (benchmark.py instrumentation measures it).
+"""
+
+import json
+import marshal
+import sys
+import time
+from collections import Counter
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Upper bounds of the step-latency histogram buckets, in microseconds;
+# the last bucket holds everything slower
+LATENCY_BUCKETS_US = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384, 65536]
+
+_active: Optional["Profiler"] = None
+
+
+class Profiler:
+    """
+    Counters, histograms and phase timers for route construction.
+
+    Attributes:
+        calls (Counter): Calls per instrumented function or engine event
+        function_time (Dict[str, float]): Seconds spent inside each instrumented function
+        phase_time (Dict[str, float]): Seconds spent in each engine phase
+        neighbor_sizes (Counter): How often a frontier of each size was seen
+        step_latency (List[int]): Greedy step counts per LATENCY_BUCKETS_US bucket
+    """
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self.function_time: Dict[str, float] = {}
+        self.phase_time: Dict[str, float] = {}
+        self.neighbor_sizes: Counter = Counter()
+        self.step_latency: List[int] = [0] * (len(LATENCY_BUCKETS_US) + 1)
+        self._origin: Dict[str, Tuple[str, int]] = {}
+
+    # ------------------------------------------------------------------
+    # Recording (called by wrappers and the engine)
+    # ------------------------------------------------------------------
+
+    def count(self, name: str, n: int = 1):
+        """Add n to the call counter for name."""
+        self.calls[name] += n
+
+    def add_phase(self, phase: str, seconds: float):
+        """Add seconds to an engine phase."""
+        self.phase_time[phase] = self.phase_time.get(phase, 0.0) + seconds
+
+    def neighbors(self, size: int):
+        """Record the size of one neighbor list or frontier."""
+        self.neighbor_sizes[size] += 1
+
+    def step(self, seconds: float):
+        """Record the latency of one greedy step."""
+        micros = seconds * 1e6
+        for bucket, bound in enumerate(LATENCY_BUCKETS_US):
+            if micros < bound:
+                break
+        else:
+            bucket = len(LATENCY_BUCKETS_US)
+        self.step_latency[bucket] += 1
+
+    def _timed(self, name: str, fn: Callable) -> Callable:
+        code = getattr(fn, "__code__", None)
+        if code is not None:
+            self._origin[name] = (code.co_filename, code.co_firstlineno)
+        calls = self.calls
+        function_time = self.function_time
+        clock = time.perf_counter
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                calls[name] += 1
+                function_time[name] = function_time.get(name, 0.0) + clock() - start
+        return wrapper
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def as_dict(self) -> dict:
+        """All measurements as plain Python data (JSON-serializable)."""
+        labels = [f"<{bound}us" for bound in LATENCY_BUCKETS_US] + [f">={LATENCY_BUCKETS_US[-1]}us"]
+        return {
+            "calls": dict(self.calls),
+            "function_time": dict(self.function_time),
+            "phase_time": dict(self.phase_time),
+            "neighbor_sizes": {str(size): n for size, n in sorted(self.neighbor_sizes.items())},
+            "step_latency": dict(zip(labels, self.step_latency)),
+        }
+
+    def to_json(self, path: Optional[str] = None, indent: int = 2) -> str:
+        """
+        Serialize as_dict() to JSON.
+
+        Args:
+            path (str): Also write the JSON to this file, if given
+            indent (int): JSON indentation
+
+        Returns:
+            str: The JSON text
+        """
+        text = json.dumps(self.as_dict(), indent=indent)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    def stats(self) -> dict:
+        """
+        Measurements in the raw format pstats uses.
+
+        Instrumented functions keep their source file and line; engine
+        phases appear as functions named "phase:<name>" in greedy_engine.py.
+        """
+        stats = {}
+        for name, seconds in self.function_time.items():
+            filename, line = self._origin.get(name, ("~", 0))
+            n = self.calls[name]
+            stats[(filename, line, name)] = (n, n, seconds, seconds, {})
+        for phase, seconds in self.phase_time.items():
+            n = self.calls.get(phase, 1)
+            stats[("greedy_engine.py", 0, f"phase:{phase}")] = (n, n, seconds, seconds, {})
+        return stats
+
+    def dump_stats(self, path: str):
+        """Write a file readable by pstats.Stats(path) and tools such as snakeviz."""
+        with open(path, "wb") as f:
+            marshal.dump(self.stats(), f)
+
+    # ------------------------------------------------------------------
+    # Context manager
+    # ------------------------------------------------------------------
+
+    def __enter__(self) -> "Profiler":
+        enable(self)
+        return self
+
+    def __exit__(self, *exc):
+        disable()
+
+
+# ============================================================================
+# ENABLE / DISABLE
+# ============================================================================
+
+# Engine call sites swapped for timed wrappers while enabled: (module name,
+# class name or None for a module-level function, attribute). Each is
+# looked up at call time by the code that uses it, so the swap is seen.
+_CALL_SITES = [
+    ("greedy_approach", None, "greedy_company_route"),
+    ("greedy_approach", None, "greedy_driver_route"),
+    ("greedy_approach", None, "greedy_ethical_route"),
+    ("greedy_approach", None, "greedy_route"),
+    ("greedy_engine", None, "_recover"),
+    ("shortest_paths", "ShortestPathCache", "tree"),
+]
+
+# Originals replaced by enable(): (owner, attribute, original)
+_patched: List[Tuple[object, str, Callable]] = []
+
+
+def current() -> Optional[Profiler]:
+    """The enabled Profiler, or None when instrumentation is off."""
+    return _active
+
+
+def enable(profiler: Optional[Profiler] = None) -> Profiler:
+    """
+    Start recording into a Profiler (a new one if none is given).
+
+    Args:
+        profiler (Profiler): Where to record
+
+    Returns:
+        Profiler: The profiler now recording
+    """
+    global _active
+    disable()
+    profiler = profiler if profiler is not None else Profiler()
+    import main
+    import greedy_approach  # noqa: F401  (loaded so its call sites can be wrapped)
+
+    for module_name, class_name, attribute in _CALL_SITES:
+        owner = sys.modules[module_name]
+        if class_name is not None:
+            owner = getattr(owner, class_name)
+        original = owner.__dict__[attribute]
+        setattr(owner, attribute, profiler._timed(attribute, original))
+        _patched.append((owner, attribute, original))
+    main._probe = profiler
+    _active = profiler
+    return profiler
+
+
+def disable() -> Optional[Profiler]:
+    """
+    Stop recording and restore the original functions.
+
+    Returns:
+        Optional[Profiler]: The profiler that was recording, if any
+    """
+    global _active
+    if "main" in sys.modules:
+        sys.modules["main"]._probe = None
+    while _patched:
+        owner, attribute, original = _patched.pop()
+        setattr(owner, attribute, original)
+    profiler, _active = _active, None
+    return profiler
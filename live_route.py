@@ -0,0 +1,228 @@
+"""
+Greedy Algorithm Assignment - Live Routes with Streaming Orders
+
+A LiveRoute holds a route that a driver is already following and accepts
+new customers one at a time. Each new stop goes into the cheapest
+feasible gap using cheapest-insertion deltas: a gap between consecutive
+stops u -> w qualifies only if roads u-new and new-w exist and the driver
+has not yet driven u -> w. Gaps are found through the new node's own
+roads, so an insertion costs O(degree) no matter how long the route is.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from main import Node, Edge, RoadGraph, as_road_graph, calculate_travel_cost
+from greedy_engine import DriverEarnings, Objective
+from travel_costs import TravelCosts
+
+
+class LiveRoute:
+    """
+    A route being driven, with cheapest insertion of newly arriving stops.
+
+    Stops are kept in a doubly linked list of entries, so inserting never
+    shifts the rest of the route. A node can appear in several entries
+    (routes built with recovery drive through some nodes more than once).
+
+    Attributes:
+        total (float): Rewards of all stops minus travel cost of all hops
+        base_cost_per_mile (float): Cost per unit distance for new roads
+    """
+
+    def __init__(self, route: List[Node], edges: Union[List[Edge], RoadGraph],
+                 committed: int = 1, objective: Optional[Objective] = None,
+                 base_cost_per_mile: float = 0.50):
+        """
+        Args:
+            route (List[Node]): Planned route, starting at the depot
+            edges (List[Edge] | RoadGraph): Roads the route was planned on
+            committed (int): Number of leading stops already driven (at least the depot)
+            objective (Objective): How stops are valued (default: DriverEarnings)
+            base_cost_per_mile (float): Cost per unit distance
+        """
+        if not route:
+            raise ValueError("route must contain at least the depot")
+        self._graph = as_road_graph(edges)
+        self._travel = TravelCosts.for_graph(self._graph, base_cost_per_mile)
+        self.base_cost_per_mile = base_cost_per_mile
+        self._include_tips = (objective if objective is not None else DriverEarnings()).include_tips
+        self._roads: Dict[int, Dict[int, float]] = {}
+        self._entries: Dict[int, List[int]] = {}
+        self._node_of: List[Node] = []
+        self._next: List[int] = []
+        self._prev: List[int] = []
+        self._driven: List[bool] = []
+        self._pending: Dict[int, Node] = {}
+
+        for node in route:
+            self._new_entry(node)
+        for h in range(len(route)):
+            self._next[h] = h + 1 if h + 1 < len(route) else -1
+            self._prev[h] = h - 1
+        self._head = 0
+        self._tail = len(route) - 1
+        self._last_driven = max(1, min(committed, len(route))) - 1
+        for h in range(self._last_driven + 1):
+            self._driven[h] = True
+
+        depot = route[0]
+        # A route built without recovery returns to the depot in a straight
+        # line; keep allowing that for whatever stop ends up last
+        self._straight_return = (len(route) >= 2 and route[-1].id == depot.id
+                                 and self._road(route[-2], route[-1]) is None)
+        self._depot_id = depot.id
+        stops = {node.id: node for node in route if node.id != depot.id}
+        self.total = sum(self._reward(node) for node in stops.values())
+        self.total -= sum(self._hop(a, b) for a, b in zip(route, route[1:]))
+
+    # ------------------------------------------------------------------
+    # Road bookkeeping
+    # ------------------------------------------------------------------
+
+    def _new_entry(self, node: Node) -> int:
+        h = len(self._node_of)
+        self._node_of.append(node)
+        self._next.append(-1)
+        self._prev.append(-1)
+        self._driven.append(False)
+        self._entries.setdefault(node.id, []).append(h)
+        return h
+
+    def _roads_of(self, node: Node) -> Dict[int, float]:
+        roads = self._roads.get(node.id)
+        if roads is None:
+            roads = {}
+            if node in self._graph:
+                i = self._graph.index(node)
+                for j, _, cost in self._travel.hops(i):
+                    roads[self._graph.nodes[j].id] = cost
+            self._roads[node.id] = roads
+        return roads
+
+    def _road(self, a: Node, b: Node) -> Optional[float]:
+        return self._roads_of(a).get(b.id)
+
+    def _hop(self, a: Node, b: Node) -> float:
+        cost = self._road(a, b)
+        if cost is None:
+            cost = calculate_travel_cost(a.distance_to(b), self.base_cost_per_mile)
+        return cost
+
+    def _reward(self, node: Node) -> float:
+        if self._include_tips:
+            return node.delivery_fee + node.estimated_tip
+        return node.delivery_fee
+
+    def add_road(self, edge: Edge):
+        """Add a road (e.g. one connecting a new customer) in O(1)."""
+        cost = calculate_travel_cost(edge.get_distance(), self.base_cost_per_mile)
+        self._roads_of(edge.u)[edge.v.id] = cost
+        self._roads_of(edge.v)[edge.u.id] = cost
+
+    # ------------------------------------------------------------------
+    # Orders
+    # ------------------------------------------------------------------
+
+    def _best_gap(self, node: Node) -> Optional[Tuple[float, int]]:
+        """Cheapest (delta, entry) such that node fits between entry and its successor."""
+        best: Optional[Tuple[float, int]] = None
+        roads = self._roads_of(node)
+        for u_id, into in roads.items():
+            for h in self._entries.get(u_id, ()):
+                nxt = self._next[h]
+                if nxt < 0 or self._driven[nxt]:
+                    continue
+                u, w = self._node_of[h], self._node_of[nxt]
+                out = roads.get(w.id)
+                if out is None:
+                    closing = nxt == self._tail and w.id == self._depot_id
+                    if not (closing and self._straight_return):
+                        continue
+                    out = calculate_travel_cost(node.distance_to(w), self.base_cost_per_mile)
+                delta = into + out - self._hop(u, w)
+                if best is None or delta < best[0]:
+                    best = (delta, h)
+        return best
+
+    def add_order(self, node: Node, edges: Iterable[Edge] = ()) -> Optional[float]:
+        """
+        Insert a new customer at its cheapest feasible position.
+
+        Args:
+            node (Node): The new customer
+            edges (Iterable[Edge]): Roads connecting it to the network
+
+        Returns:
+            Optional[float]: Change in total (reward - insertion cost), or
+            None if no feasible gap exists yet (the order is kept in pending
+            and retried when a later order opens a gap next to it)
+            
+        Raises:
+            ValueError: If the customer is already on the route or pending
+        """
+        if node.id in self._entries:
+            raise ValueError(f"node {node.id} is already on the route")
+        if node.id in self._pending:
+            raise ValueError(f"node {node.id} is already pending")
+        for edge in edges:
+            self.add_road(edge)
+        gain = self._insert(node)
+        if gain is None:
+            self._pending[node.id] = node
+            return None
+        self._retry_pending(node)
+        return gain
+
+    def _insert(self, node: Node) -> Optional[float]:
+        best = self._best_gap(node)
+        if best is None:
+            return None
+        delta, h = best
+        new = self._new_entry(node)
+        nxt = self._next[h]
+        self._next[h], self._prev[new] = new, h
+        self._next[new], self._prev[nxt] = nxt, new
+        gain = self._reward(node) - delta
+        self.total += gain
+        return gain
+
+    def _retry_pending(self, placed: Node):
+        """Retry waiting orders that have a road to the stop just placed."""
+        roads = self._roads_of(placed)
+        waiting = [node for node in self._pending.values() if node.id in roads]
+        for node in waiting:
+            if node.id in self._pending and self._insert(node) is not None:
+                del self._pending[node.id]
+                self._retry_pending(node)
+
+    def advance(self, stops: int = 1):
+        """Mark the next stops as driven; gaps before them are no longer offered."""
+        h = self._last_driven
+        for _ in range(stops):
+            if self._next[h] < 0:
+                break
+            h = self._next[h]
+            self._driven[h] = True
+        self._last_driven = h
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    @property
+    def pending(self) -> List[Node]:
+        """Orders that could not be placed yet, oldest first."""
+        return list(self._pending.values())
+
+    @property
+    def route(self) -> List[Node]:
+        """The current route, in driving order."""
+        out = []
+        h = self._head
+        while h >= 0:
+            out.append(self._node_of[h])
+            h = self._next[h]
+        return out
+
+    def __len__(self) -> int:
+        return len(self._node_of)
@@ -0,0 +1,209 @@
+"""
+Greedy Algorithm Assignment - Local Search Post-Optimization
+
+Improves a finished route with 2-opt and Or-opt moves that keep every
+hop on a real road. The stops on the route never change, only their
+order, so a move changes the total only through travel cost and is
+scored by its cost delta from a handful of hop lookups.
+
+Only roads to each node's nearest neighbors (neighbor_limit of them) are
+tried as new hops, and the search stops when no move improves the route
+or when the time or move budget runs out.
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from main import Node, Edge, RoadGraph, as_road_graph
+from greedy_engine import DriverEarnings, NodeArrays, Objective
+from travel_costs import TravelCosts
+
+_EPSILON = 1e-9
+
+
+class _HopCosts:
+    """Road costs and nearest-neighbor lists, filled in lazily per node."""
+
+    def __init__(self, graph: RoadGraph, neighbor_limit: int):
+        self.graph = graph
+        self.travel = TravelCosts.for_graph(graph)
+        self.neighbor_limit = neighbor_limit
+        self._roads: Dict[int, Dict[int, float]] = {}
+        self._nearest: Dict[int, List[int]] = {}
+
+    def roads(self, a: int) -> Dict[int, float]:
+        roads = self._roads.get(a)
+        if roads is None:
+            start, end = self.graph.offsets[a], self.graph.offsets[a + 1]
+            roads = dict(zip(self.graph.targets[start:end], self.travel.costs[start:end].tolist()))
+            self._roads[a] = roads
+        return roads
+
+    def nearest(self, a: int) -> List[int]:
+        nearest = self._nearest.get(a)
+        if nearest is None:
+            roads = self.roads(a)
+            nearest = sorted(roads, key=roads.__getitem__)[:self.neighbor_limit]
+            self._nearest[a] = nearest
+        return nearest
+
+    def road(self, a: int, b: int) -> Optional[float]:
+        """Cost of the road a-b, or None if there is no such road."""
+        return self.roads(a).get(b)
+
+    def hop(self, a: int, b: int) -> float:
+        """Cost of an existing hop: the road if there is one, else the straight line."""
+        cost = self.roads(a).get(b)
+        return cost if cost is not None else self.travel.cost(a, b)
+
+
+def improve_route(route: List[Node], edges: Union[List[Edge], RoadGraph],
+                  objective: Optional[Objective] = None,
+                  time_budget: Optional[float] = None,
+                  max_moves: Optional[int] = None,
+                  neighbor_limit: int = 8,
+                  max_segment: int = 3) -> Tuple[List[Node], float, List[dict]]:
+    """
+    Improve a greedy route with road-respecting 2-opt and Or-opt moves.
+
+    Args:
+        route (List[Node]): Route returned by one of the greedy strategies
+        edges (List[Edge] | RoadGraph): Road connections the route was planned on
+        objective (Objective): How stops are valued in the total (default: DriverEarnings)
+        time_budget (float): Wall-clock seconds to spend, or None for no limit
+        max_moves (int): Improving moves to apply at most, or None for no limit
+        neighbor_limit (int): Nearest road neighbors tried per node
+        max_segment (int): Longest segment Or-opt will relocate
+
+    Returns:
+        Tuple[List[Node], float, List[dict]]: (improved route, new total, trace).
+        Each trace entry has the move name, its gain ("delta", always
+        positive), the running total and the elapsed seconds.
+    """
+    graph = as_road_graph(edges)
+    objective = objective if objective is not None else DriverEarnings()
+    costs = _HopCosts(graph, neighbor_limit)
+    seq = [graph.index(node) for node in route]
+
+    rewards = objective.rewards(NodeArrays.for_graph(graph))
+    depot = seq[0] if seq else -1
+    stops = np.array(sorted(set(seq) - {depot}), dtype=np.intp)
+    reward_total = float(rewards[stops].sum()) if len(stops) else 0.0
+    cost_total = sum(costs.hop(a, b) for a, b in zip(seq, seq[1:]))
+    total = reward_total - cost_total
+
+    # A route built without recovery returns to the depot in a straight
+    # line; keep allowing that for whatever node ends up last
+    straight_return = len(seq) >= 2 and costs.road(seq[-2], seq[-1]) is None
+
+    def link(a: int, b: int, closing: bool) -> Optional[float]:
+        cost = costs.road(a, b)
+        if cost is None and closing and straight_return:
+            cost = costs.travel.cost(a, b)
+        return cost
+
+    start_time = time.perf_counter()
+    trace: List[dict] = []
+
+    def out_of_budget() -> bool:
+        if max_moves is not None and len(trace) >= max_moves:
+            return True
+        return time_budget is not None and time.perf_counter() - start_time >= time_budget
+
+    improved = True
+    while improved and not out_of_budget():
+        improved = False
+        positions = _positions(seq)
+        for i in range(len(seq) - 1):
+            if out_of_budget():
+                break
+            move = (_two_opt(seq, i, costs, link, positions)
+                    or _or_opt(seq, i, costs, link, positions, max_segment))
+            if move is None:
+                continue
+            name, delta, new_seq = move
+            seq[:] = new_seq
+            positions = _positions(seq)
+            total += delta
+            trace.append({"move": name, "delta": delta, "total": total,
+                          "elapsed": time.perf_counter() - start_time})
+            improved = True
+
+    return [graph.nodes[i] for i in seq], total, trace
+
+
+def _positions(seq: List[int]) -> Dict[int, List[int]]:
+    positions: Dict[int, List[int]] = {}
+    for p, v in enumerate(seq):
+        positions.setdefault(v, []).append(p)
+    return positions
+
+
+def _two_opt(seq, i, costs, link, positions):
+    """
+    First improving 2-opt move whose new hop starts at seq[i].
+
+    Replaces hops (a, b) and (c, d) with (a, c) and (b, d) by reversing
+    seq[i + 1 .. j], where c = seq[j] is a near road neighbor of a.
+    """
+    last = len(seq) - 1
+    a, b = seq[i], seq[i + 1]
+    removed_ab = costs.hop(a, b)
+    for c in costs.nearest(a):
+        for j in positions.get(c, ()):
+            if j <= i + 1 or j >= last:
+                continue
+            d = seq[j + 1]
+            ac = costs.road(a, c)
+            bd = link(b, d, closing=(j + 1 == last))
+            if bd is None:
+                continue
+            delta = removed_ab + costs.hop(c, d) - ac - bd
+            if delta > _EPSILON:
+                return "2-opt", delta, seq[:i + 1] + seq[i + 1:j + 1][::-1] + seq[j + 1:]
+    return None
+
+
+def _or_opt(seq, s, costs, link, positions, max_segment):
+    """
+    First improving Or-opt move for a segment starting at seq[s].
+
+    Moves seq[s .. s + length - 1] (length up to max_segment) between two
+    other consecutive stops, keeping or reversing its direction.
+    """
+    last = len(seq) - 1
+    if s == 0:
+        return None
+    for length in range(1, max_segment + 1):
+        e = s + length - 1
+        if e >= last:
+            break
+        p, first, tail, n = seq[s - 1], seq[s], seq[e], seq[e + 1]
+        bridge = link(p, n, closing=(e + 1 == last))
+        if bridge is None:
+            continue
+        gain = costs.hop(p, first) + costs.hop(tail, n) - bridge
+        if gain <= _EPSILON:
+            continue
+        # Forward: x -> first .. tail -> y, with x a near neighbor of first.
+        # Reversed: x -> tail .. first -> y, with x a near neighbor of tail.
+        for head, end, reverse in ((first, tail, False), (tail, first, True)):
+            for x in costs.nearest(head):
+                for t in positions.get(x, ()):
+                    if s - 1 <= t <= e or t >= last:
+                        continue
+                    y = seq[t + 1]
+                    into = costs.road(x, head)
+                    out = link(end, y, closing=(t + 1 == last))
+                    if out is None:
+                        continue
+                    delta = gain - (into + out - costs.hop(x, y))
+                    if delta > _EPSILON:
+                        segment = seq[s:e + 1][::-1] if reverse else seq[s:e + 1]
+                        rest = seq[:s] + seq[e + 1:]
+                        at = t + 1 if t < s else t + 1 - length
+                        name = "or-opt-reversed" if reverse else "or-opt"
+                        return name, delta, rest[:at] + segment + rest[at:]
+    return None
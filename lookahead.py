@@ -0,0 +1,523 @@
+"""
+Greedy Algorithm Assignment - k-Step Lookahead Greedy
+
+One-step greedy happily drives into a spur for one good stop and is
+stranded there (Northfield -> Lonsdale -> New Prague in the Minnesota
+data). Lookahead scores each road neighbor as the engine would (through
+the Objective's allowed() and score(), against the route state after the
+hops before it) plus the best continuation of up to depth - 1 further
+hops over unvisited nodes. The last stop of a branch is valued by how the
+route would leave it: a few one-step greedy hops (recovery drives
+included, with recovery) past the horizon, and the drive home wherever
+the branch or those hops are stranded, so spurs look as bad as they are
+even when they end just past the horizon.
+
+The continuation search is a depth-first branch-and-bound: children are
+tried best hop first, and a child is skipped once its hop plus the best
+score on every remaining hop, exit hops included, cannot beat the best
+branch found. Unless the objective reads the route history
+(Objective.reads_route), the value of a subtree that makes no recovery
+drive depends only on which nodes within its remaining hops and exit
+are visited, so (node, hops left, visited nodes in that neighborhood) is
+a complete key; such subtrees of at least two hops are memoized under it
+in a bounded LRU transposition table that lives for the whole route.
+
+Every dispatch (choice of the next stop) deepens iteratively from one hop
+and keeps the deepest search that finished, within the latency budget if
+one is given. Depth 1 is greedy_route: the same visited set (only the
+starting depot is excluded), the same scores and tie-breaks, and dead
+ends handled by the engine's recovery. A finite horizon can still lose
+further down the route, so the searched move is checked before it is
+taken: it must finish better when the rest of the route is driven
+greedily than the greedy finish from the current stop, which is kept up
+to date as the route goes (it only needs recomputing after a searched
+move is taken). Otherwise the one-step move is taken, and so routes of
+every depth are never worse than depth 1. Each check costs a greedy
+finish of the route, which with recovery on a large graph takes longer
+than a tight budget; a dispatch whose check does not finish in time
+keeps the one-step move, and those routes end up close to greedy.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from main import Node, Edge, RoadGraph, as_road_graph
+from greedy_engine import DriverEarnings, NodeArrays, Objective, RouteState, _recover
+from shortest_paths import ShortestPathCache
+from travel_costs import TravelCosts
+
+# Subtrees with fewer hops left than this are cheaper to search than to look up
+_MEMO_MIN_HOPS = 2
+# Upper bound on hops left, used to pack (node, hops) into one int key
+_MAX_HOPS = 64
+# One-step greedy hops followed past the horizon to see how a branch leaves it
+_EXIT_HOPS = 2
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class TranspositionTable:
+    """
+    Bounded LRU map from search states to (subtree value, truncated) pairs.
+
+    Attributes:
+        max_entries (int): Entries kept before the least recently used is dropped
+        hits (int): Lookups answered
+        misses (int): Lookups not found
+        evictions (int): Entries dropped
+    """
+
+    def __init__(self, max_entries: int = 1 << 16):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[int, Tuple[float, bool]]" = OrderedDict()
+
+    def get(self, key: int) -> Optional[Tuple[float, bool]]:
+        """Stored value for a state, or None."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: int, value: Tuple[float, bool]):
+        """Store a state's value, evicting the least recently used entry if full."""
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """Counters and current size."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self._entries)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LookaheadResult:
+    """
+    A lookahead route with search statistics.
+
+    Attributes:
+        route (List[Node]): Route from the depot back to the depot
+        total (float): Rewards minus travel cost, as greedy_route counts it
+        depths (np.ndarray): Lookahead depth completed at each road-neighbor dispatch
+        expanded (int): Search nodes expanded
+        pruned (int): Branches skipped by the bound
+        table (dict): Transposition table counters
+        max_dispatch (float): Slowest dispatch, in seconds
+        kept_greedy (int): Dispatches that took the one-step greedy move because
+            the searched move did not finish better, or was not checked in time
+        elapsed (float): Wall-clock seconds
+    """
+
+    def __init__(self, route: List[Node], total: float, depths: np.ndarray, expanded: int,
+                 pruned: int, table: dict, max_dispatch: float, kept_greedy: int,
+                 elapsed: float):
+        self.route = route
+        self.total = total
+        self.depths = depths
+        self.expanded = expanded
+        self.pruned = pruned
+        self.table = table
+        self.max_dispatch = max_dispatch
+        self.kept_greedy = kept_greedy
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        depth = self.depths.mean() if len(self.depths) else 0.0
+        return (f"LookaheadResult(total={self.total:.2f}, mean depth={depth:.2f}, "
+                f"expanded={self.expanded}, table hits={self.table['hits']}, "
+                f"elapsed={self.elapsed:.3f}s)")
+
+
+class _Search:
+    """Depth-limited continuation search that moves one RouteState forward and back."""
+
+    def __init__(self, graph: RoadGraph, objective: Objective, rewards: np.ndarray,
+                 state: RouteState, home_cost: List[float], table: TranspositionTable,
+                 paths: Optional[ShortestPathCache] = None):
+        travel = TravelCosts.for_graph(graph)
+        self.travel = travel
+        self.paths = paths
+        self.offsets = graph.offsets
+        self.targets = travel.targets
+        self.lengths = travel.lengths
+        self.hop_costs = travel.costs
+        self.objective = objective
+        self.rewards = rewards
+        # At least 0, so that it bounds stranded branches as well
+        best = float(rewards.max()) if len(rewards) else 0.0
+        self.best_score = max(best, 0.0) + objective.bonus_bound
+        self.memoize = not objective.reads_route
+        self.state = state
+        self.home_cost = home_cost
+        self.table = table
+        self.path: List[tuple] = []
+        self.deadline = math.inf
+        self.expanded = 0
+        self.pruned = 0
+        self.recoveries = 0
+        self.truncated = False
+        self.exit_hops = _EXIT_HOPS
+        self._balls: Dict[int, List[int]] = {}
+
+    def moves(self) -> List[Tuple[float, int, int, float, float]]:
+        """
+        (score, -position, node, gain, length) of every allowed unvisited
+        neighbor of the current position, scored by the objective.
+        """
+        state = self.state
+        start, end = self.offsets[state.current], self.offsets[state.current + 1]
+        candidates = self.targets[start:end]
+        mask = ~state.visited[candidates]
+        if not mask.any():
+            return []
+        lengths = self.lengths[start:end]
+        costs = self.hop_costs[start:end]
+        mask = self.objective.allowed(state, lengths, mask)
+        scores = self.objective.score(state, candidates, self.rewards, costs)
+        k = np.flatnonzero(mask)
+        gains = self.rewards[candidates[k]] - costs[k]
+        return list(zip(scores[k].tolist(), (-k).tolist(), candidates[k].tolist(),
+                        gains.tolist(), lengths[k].tolist()))
+
+    def enter(self, w: int, length: float):
+        """Hop to w, remembering how to undo it."""
+        state = self.state
+        self.path.append((w, state.current, state.last_hop_distance, len(state.stops)))
+        state.move(w, length)
+
+    def leave(self):
+        """Undo the last hop or recovery drive."""
+        state = self.state
+        w, state.current, state.last_hop_distance, stops = self.path.pop()
+        state.visited[w] = False
+        del state.stops[stops:]
+        state.region_served[state.arrays.region[w]] -= 1
+
+    def recover(self) -> Optional[float]:
+        """
+        Drive from the current dead end as the engine's recovery would,
+        remembering how to undo it.
+
+        Returns:
+            Optional[float]: Gain of the stop, or None if no customer is reachable
+        """
+        state = self.state
+        self.recoveries += 1
+        undo = (state.current, state.last_hop_distance, len(state.stops))
+        gain = _recover(state, self.objective, self.rewards, self.travel, self.paths.tree(state.current))
+        if gain is not None:
+            self.path.append((state.current,) + undo)
+        return gain
+
+    def home(self) -> float:
+        """Cost of the drive home from the current position, as the route ends it."""
+        current = self.state.current
+        if self.paths is not None and current != self.state.depot:
+            distance = self.paths.distance(current, self.state.depot)
+            if distance < math.inf:
+                return distance * self.travel.base_cost_per_mile
+        return self.home_cost[current]
+
+    def dead_end(self, after: Callable[[], float]) -> float:
+        """
+        Value of a position with no unvisited neighbors. Without recovery
+        that is the straight drive home. With recovery it is the drive by
+        road to the stop the engine would recover to, plus after() valued
+        from there, or the drive home if no customer is reachable.
+        """
+        if self.paths is None:
+            return -self.home_cost[self.state.current]
+        gain = self.recover()
+        if gain is None:
+            return -self.home()
+        try:
+            return gain + after()
+        finally:
+            self.leave()
+
+    def exit_value(self) -> float:
+        """
+        Value of leaving a leaf the way the route would: up to exit_hops
+        one-step greedy hops or recovery drives, then the drive home if they
+        end stranded. A leaf the route would go on from marks the search
+        truncated, since past the horizon the hops are greedy, not searched.
+        """
+        mark = len(self.path)
+        value = 0.0
+        hops = self.exit_hops
+        try:
+            while True:
+                if time.perf_counter() > self.deadline:
+                    raise _OutOfTime
+                moves = self.moves()
+                if moves:
+                    self.truncated = True
+                    if hops == 0:
+                        return value
+                    score, _, w, _, length = max(moves)
+                    self.enter(w, length)
+                    value += score
+                else:
+                    gain = self.recover() if self.paths is not None else None
+                    if gain is None:
+                        return value - self.home()
+                    self.truncated = True
+                    value += gain
+                    if hops == 0:
+                        return value
+                hops -= 1
+        finally:
+            while len(self.path) > mark:
+                self.leave()
+
+    def completion(self) -> float:
+        """
+        Total of finishing the route greedily from the current position,
+        exactly as greedy_route would: one-step hops, recovery drives if
+        enabled, and the drive home.
+        """
+        mark = len(self.path)
+        value = 0.0
+        try:
+            while True:
+                if time.perf_counter() > self.deadline:
+                    raise _OutOfTime
+                moves = self.moves()
+                if moves:
+                    _, _, w, gain, length = max(moves)
+                    self.enter(w, length)
+                else:
+                    gain = self.recover() if self.paths is not None else None
+                    if gain is None:
+                        return value - self.home()
+                value += gain
+        finally:
+            while len(self.path) > mark:
+                self.leave()
+
+    def completion_after(self, move: tuple) -> float:
+        """Gain of a move plus the greedy completion from where it leads."""
+        self.enter(move[2], move[4])
+        try:
+            return move[3] + self.completion()
+        finally:
+            self.leave()
+
+    def ball(self, v: int, hops: int) -> List[int]:
+        """Nodes within the given number of road hops of v (v excluded)."""
+        key = v * _MAX_HOPS + hops
+        ball = self._balls.get(key)
+        if ball is None:
+            if len(self._balls) >= self.table.max_entries:
+                self._balls.clear()
+            offsets, targets = self.offsets, self.targets
+            seen = {v}
+            layer = [v]
+            for _ in range(hops):
+                layer = [w for u in layer for w in targets[offsets[u]:offsets[u + 1]].tolist()
+                         if w not in seen and not seen.add(w)]
+            seen.discard(v)
+            ball = sorted(seen)
+            self._balls[key] = ball
+        return ball
+
+    def continuation(self, hops: int) -> float:
+        """Best value of the next hops moves from the current position and how they exit
+        (from the dead end if there are none)."""
+        if time.perf_counter() > self.deadline:
+            raise _OutOfTime
+        if hops == 0:
+            return self.exit_value()
+        self.expanded += 1
+        recoveries, truncated = self.recoveries, self.truncated
+        self.truncated = False
+        key = None
+        if self.memoize and hops >= _MEMO_MIN_HOPS:
+            key = self.key(self.state.current, hops)
+            entry = self.table.get(key)
+            if entry is not None:
+                value, self.truncated = entry
+                self.truncated |= truncated
+                return value
+        moves = self.moves()
+        if not moves:
+            value = self.dead_end(lambda: self.continuation(hops - 1))
+        else:
+            moves.sort(reverse=True)
+            value = -math.inf
+            rest = (hops - 1 + self.exit_hops) * self.best_score
+            for k, (score, _, w, _, length) in enumerate(moves):
+                if score + rest <= value:
+                    self.pruned += len(moves) - k
+                    break
+                value = max(value, score + self.descend(w, length, hops - 1))
+        if key is not None and self.recoveries == recoveries:
+            self.table.put(key, (value, self.truncated))
+        self.truncated |= truncated
+        return value
+
+    def key(self, v: int, hops: int) -> int:
+        """Transposition key of v with hops left: one int packing v, hops and the visited ball."""
+        visited = self.state.visited
+        bits = np.packbits(visited[self.ball(v, hops + self.exit_hops + 1)], bitorder="little")
+        mask = int.from_bytes(bits.tobytes(), "little")
+        return (mask * len(visited) + v) * _MAX_HOPS + hops
+
+    def descend(self, w: int, length: float, hops: int) -> float:
+        self.enter(w, length)
+        try:
+            return self.continuation(hops)
+        finally:
+            self.leave()
+
+    def choose(self, moves: list, depth: int) -> Tuple[tuple, int, bool]:
+        """
+        Best of the current moves with up to depth hops of lookahead.
+
+        Returns:
+            Tuple[tuple, int, bool]: (chosen move, depth completed, whether
+            that search saw every remaining hop, which makes its choice exact)
+        """
+        moves = sorted(moves, reverse=True)
+        best = moves[0]
+        completed, exact = 1, False
+        for hops in range(1, depth):
+            rest = (hops + self.exit_hops) * self.best_score
+            choice, value = None, -math.inf
+            self.truncated = False
+            try:
+                for k, move in enumerate(moves):
+                    if move[0] + rest < value:
+                        self.pruned += len(moves) - k
+                        break
+                    total = move[0] + self.descend(move[2], move[4], hops)
+                    # Ties go to the earlier neighbor, as in one-step greedy
+                    if total > value or (total == value and move[1] > choice[1]):
+                        choice, value = move, total
+            except _OutOfTime:
+                break
+            best, completed, exact = choice, hops + 1, not self.truncated
+            if exact:
+                # Every branch ended within the horizon; deeper searches agree
+                completed = depth
+                break
+        return best, completed, exact
+
+
+def lookahead_route(edges: Union[List[Edge], RoadGraph], depot: Node, depth: int = 3,
+                    objective: Optional[Objective] = None, nodes: Optional[List[Node]] = None,
+                    recover: bool = False, budget: Optional[float] = None,
+                    table_size: int = 1 << 16,
+                    customers: Optional[np.ndarray] = None) -> LookaheadResult:
+    """
+    Build a route greedily, scoring each neighbor with k-step lookahead.
+
+    Args:
+        edges (List[Edge] | RoadGraph): Road connections, or their index
+        depot (Node): The starting depot location
+        depth (int): Hops looked at per decision (1 = plain greedy)
+        objective (Objective): Scoring rule (default: DriverEarnings)
+        nodes (List[Node]): Optional nodes to index along with the edges
+        recover (bool): At a dead end, drive by road to the best reachable
+            unvisited customer instead of stopping
+        budget (float): Seconds per dispatch after which the search keeps the
+            deepest lookahead it finished; None (default) for no limit, which
+            makes the route depend only on the inputs
+        table_size (int): Transposition table entries
+        customers (np.ndarray): Boolean mask by dense index of the nodes this
+            route may stop at; None allows all
+
+    Returns:
+        LookaheadResult: Route, total and search statistics
+    """
+    if not 1 <= depth <= _MAX_HOPS:
+        raise ValueError(f"depth must be between 1 and {_MAX_HOPS}")
+    begin = time.perf_counter()
+    graph = as_road_graph(edges, nodes)
+    objective = objective if objective is not None else DriverEarnings()
+    travel = TravelCosts.for_graph(graph)
+    arrays = NodeArrays.for_graph(graph)
+    paths = ShortestPathCache.for_graph(graph) if recover else None
+    rate = travel.base_cost_per_mile
+    rewards = objective.rewards(arrays)
+
+    state = RouteState(graph, arrays, graph.index(depot))
+    if customers is not None:
+        state.visited |= ~customers
+    d = state.depot
+    home_cost = (np.hypot(travel.x - travel.x[d], travel.y - travel.y[d]) * rate).tolist()
+    table = TranspositionTable(table_size)
+    search = _Search(graph, objective, rewards, state, home_cost, table, paths)
+
+    total = 0.0
+    depths: List[int] = []
+    max_dispatch = 0.0
+    kept_greedy = 0
+    # Total of finishing the route greedily from the current position; a
+    # searched move is only taken when finishing greedily after it beats this
+    remainder = search.completion() if depth > 1 else 0.0
+    while True:
+        moves = search.moves()
+        if moves:
+            started = time.perf_counter()
+            search.deadline = started + budget if budget is not None else math.inf
+            greedy = max(moves)
+            move, completed, exact = search.choose(moves, depth)
+            if move[2] != greedy[2]:
+                # An exhaustive search on scores that are gains is optimal as it stands
+                trusted = exact and objective.bonus_bound == 0
+                if trusted:
+                    search.deadline = math.inf
+                try:
+                    after = search.completion_after(move)
+                except _OutOfTime:
+                    after = -math.inf
+                if trusted or after > remainder:
+                    remainder = after
+                else:
+                    move = greedy
+                    kept_greedy += 1
+            remainder -= move[3]
+            max_dispatch = max(max_dispatch, time.perf_counter() - started)
+            depths.append(completed)
+            _, _, j, gain, length = move
+            total += gain
+            state.move(j, length)
+            continue
+        if paths is None:
+            break
+        gain = _recover(state, objective, rewards, travel, paths.tree(state.current))
+        if gain is None:
+            break
+        total += gain
+        remainder -= gain
+
+    if state.current != d:
+        road_home = paths.path(state.current, d) if paths is not None else []
+        if road_home:
+            total -= paths.distance(state.current, d) * rate
+            for i in road_home[1:]:
+                state.pass_through(i)
+        else:
+            total -= travel.cost(state.current, d)
+            state.stops.append(d)
+
+    route = [graph.nodes[i] for i in state.stops]
+    return LookaheadResult(route, total, np.array(depths, dtype=np.intp), search.expanded,
+                           search.pruned, table.stats(), max_dispatch, kept_greedy,
+                           time.perf_counter() - begin)
@@ -1,18 +1,194 @@
 """
 Greedy Algorithm Assignment - Core Classes and Utilities
 
-This file contains the Node and Edge classes, plus helper functions.
+This file contains the Node, NodeStore, Edge and RoadGraph classes, plus helper functions.
 Students import from this file but implement their algorithms in student_implementation.py
 """
 
 import math
-from typing import List
+import weakref
+from array import array
+from typing import Dict, List, Optional, Sequence, Union
+
+# Profiler counting calls of the helpers in this file (distance_to,
+# get_neighbors, calculate_travel_cost); set by instrumentation.enable()
+_probe = None
+
+# Rows per store shared by nodes built without one
+_CHUNK_ROWS = 4096
+# Weak reference to the store standalone nodes currently append to
+_default_chunk: Optional[weakref.ref] = None
+
+
+class NodeStore:
+    """
+    Columnar (struct-of-arrays) storage for node attributes.
+    
+    Each attribute lives in its own typed array, one row per node, and the
+    region string is interned once and stored as a small integer code. This
+    keeps millions of delivery points in a few dozen bytes each; Node
+    objects are lightweight views over a row. A store opened from a
+    binary dataset file (road_dataset.py) has memoryviews over the mapped
+    file as its columns and cannot grow.
+    
+    Attributes:
+        ids (array): Node ids
+        x (array): X-coordinates
+        y (array): Y-coordinates
+        delivery_fee (array): Delivery fees
+        estimated_tip (array): Expected tips
+        priority (array): Priority levels
+        is_depot (array): 1 for depots, 0 otherwise
+        region_code (array): Index into regions for each row
+        regions (List[str]): Interned region names, indexed by code
+        changes (Dict[str, int]): Per column, how many times a row was changed
+            through a Node (data derived from the store checks these)
+    """
+    
+    def __init__(self):
+        self.ids = array("q")
+        self.x = array("d")
+        self.y = array("d")
+        self.delivery_fee = array("d")
+        self.estimated_tip = array("d")
+        self.priority = array("b")
+        self.is_depot = array("b")
+        self.region_code = array("H")
+        self.regions: List[str] = []
+        self._region_codes: Dict[str, int] = {}
+        self.changes: Dict[str, int] = {}
+    
+    @classmethod
+    def from_columns(cls, ids: Sequence[int], x: Sequence[float], y: Sequence[float],
+                     delivery_fee: Sequence[float], estimated_tip: Sequence[float],
+                     region_code: Sequence[int], regions: List[str],
+                     priority: Sequence[int], is_depot: Sequence[int]) -> "NodeStore":
+        """
+        Build a store from whole columns at once (e.g. generated or loaded data).
+        
+        Args:
+            region_code (Sequence[int]): Index into regions for each row
+            regions (List[str]): Region names
+            (other columns as in the class attributes, one entry per row)
+            
+        Returns:
+            NodeStore: Store with one row per entry
+        """
+        store = cls()
+        store.ids = array("q", ids)
+        store.x = array("d", x)
+        store.y = array("d", y)
+        store.delivery_fee = array("d", delivery_fee)
+        store.estimated_tip = array("d", estimated_tip)
+        store.priority = array("b", priority)
+        store.is_depot = array("b", is_depot)
+        store.region_code = array("H", region_code)
+        for region in regions:
+            store.intern_region(region)
+        columns = (store.x, store.y, store.delivery_fee, store.estimated_tip,
+                   store.priority, store.is_depot, store.region_code)
+        if any(len(column) != len(store.ids) for column in columns):
+            raise ValueError("all columns must have the same length")
+        return store
+    
+    def touch(self, column: str):
+        """
+        Record that a column changed in place.
+        
+        Node setters call this; code writing to a column array directly
+        must call it too, or data derived from the old values is reused.
+        """
+        self.changes[column] = self.changes.get(column, 0) + 1
+    
+    def version(self, *columns: str) -> int:
+        """Number of changes recorded for the given columns (all if none given)."""
+        if not columns:
+            return sum(self.changes.values())
+        return sum(self.changes.get(column, 0) for column in columns)
+    
+    def intern_region(self, region: str) -> int:
+        """Return the categorical code for a region name, adding it if new."""
+        code = self._region_codes.get(region)
+        if code is None:
+            code = len(self.regions)
+            self._region_codes[region] = code
+            self.regions.append(region)
+        return code
+    
+    def append(self, node_id: int, x: float, y: float,
+               delivery_fee: float = 0.0, estimated_tip: float = 0.0,
+               region: str = "suburban", priority: int = 3,
+               is_depot: bool = False) -> int:
+        """
+        Add a row and return its row number.
+        
+        Returns:
+            int: Row of the new node (use node(row) to get a Node view)
+        """
+        self.ids.append(node_id)
+        self.x.append(x)
+        self.y.append(y)
+        self.delivery_fee.append(delivery_fee)
+        self.estimated_tip.append(estimated_tip)
+        self.priority.append(priority)
+        self.is_depot.append(1 if is_depot else 0)
+        self.region_code.append(self.intern_region(region))
+        return len(self.ids) - 1
+    
+    def node(self, row: int) -> "Node":
+        """Return a Node view over the given row."""
+        if not 0 <= row < len(self.ids):
+            raise IndexError(f"row {row} out of range")
+        return Node._view(self, row)
+    
+    def __getitem__(self, row: int) -> "Node":
+        return self.node(row)
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def __iter__(self):
+        for row in range(len(self.ids)):
+            yield Node._view(self, row)
+    
+    def __repr__(self):
+        return f"NodeStore({len(self.ids)} nodes, regions={self.regions})"
+
+
+def _default_store() -> NodeStore:
+    """The store a Node built without one appends to, starting a new chunk when full."""
+    global _default_chunk
+    store = _default_chunk() if _default_chunk is not None else None
+    if store is None or len(store) >= _CHUNK_ROWS:
+        store = NodeStore()
+        _default_chunk = weakref.ref(store)
+    return store
+
+
+def _column(name: str, doc: str) -> property:
+    """Property reading and writing one NodeStore column at the view's row."""
+    def fget(self):
+        return getattr(self._store, name)[self._row]
+    
+    def fset(self, value):
+        getattr(self._store, name)[self._row] = value
+        self._store.touch(name)
+    
+    return property(fget, fset, doc=doc)
 
 
 class Node:
     """
     Represents a destination (customer location or depot).
     
+    A Node is a view over one row of a NodeStore. Constructing a Node
+    appends a row to the given store, or when none is given to a shared
+    store of up to _CHUNK_ROWS rows, so existing code that builds Node
+    objects directly keeps working. Only the nodes hold on to a chunk, so
+    it is freed with the last of them. Attribute reads and writes go
+    straight to the store's columns. A pickled Node carries only its own
+    row's values and is unpickled as a standalone node.
+    
     Attributes:
         id (int): Unique identifier for the node
         x (float): X-coordinate of the location
@@ -24,23 +200,80 @@ class Node:
         is_depot (bool): Whether this is the starting depot
     """
     
+    __slots__ = ("_store", "_row")
+    
     def __init__(self, node_id: int, x: float, y: float, 
                  delivery_fee: float = 0.0, estimated_tip: float = 0.0,
                  region: str = "suburban", priority: int = 3, 
-                 is_depot: bool = False):
-        self.id = node_id
-        self.x = x
-        self.y = y
-        self.delivery_fee = delivery_fee
-        self.estimated_tip = estimated_tip
-        self.region = region
-        self.priority = priority
-        self.is_depot = is_depot
+                 is_depot: bool = False, store: Optional[NodeStore] = None):
+        if store is None:
+            store = _default_store()
+        self._store = store
+        self._row = store.append(node_id, x, y, delivery_fee, estimated_tip,
+                                 region, priority, is_depot)
+    
+    @classmethod
+    def _view(cls, store: NodeStore, row: int) -> "Node":
+        node = cls.__new__(cls)
+        node._store = store
+        node._row = row
+        return node
+    
+    id = _column("ids", "Unique identifier for the node")
+    x = _column("x", "X-coordinate of the location")
+    y = _column("y", "Y-coordinate of the location")
+    delivery_fee = _column("delivery_fee", "Fee earned for delivering to this location")
+    estimated_tip = _column("estimated_tip", "Expected tip from this customer")
+    priority = _column("priority", "Priority level (1=highest, 5=lowest)")
+    
+    @property
+    def region(self) -> str:
+        """Region type ('downtown', 'suburban', 'rural')"""
+        return self._store.regions[self._store.region_code[self._row]]
+    
+    @region.setter
+    def region(self, value: str):
+        self._store.region_code[self._row] = self._store.intern_region(value)
+        self._store.touch("region_code")
+    
+    @property
+    def is_depot(self) -> bool:
+        """Whether this is the starting depot"""
+        return bool(self._store.is_depot[self._row])
+    
+    @is_depot.setter
+    def is_depot(self, value: bool):
+        self._store.is_depot[self._row] = 1 if value else 0
+        self._store.touch("is_depot")
+    
+    @property
+    def store(self) -> NodeStore:
+        """The NodeStore holding this node's attributes."""
+        return self._store
+    
+    @property
+    def row(self) -> int:
+        """This node's row in its NodeStore."""
+        return self._row
     
     def distance_to(self, other: 'Node') -> float:
         """Calculate Euclidean distance to another node."""
+        if _probe is not None:
+            _probe.count("distance_to")
         return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2)
     
+    def __reduce__(self):
+        return (Node, (self.id, self.x, self.y, self.delivery_fee, self.estimated_tip,
+                       self.region, self.priority, self.is_depot))
+    
+    def __eq__(self, other):
+        if not isinstance(other, Node):
+            return NotImplemented
+        return self._store is other._store and self._row == other._row
+    
+    def __hash__(self):
+        return hash((id(self._store), self._row))
+    
     def __repr__(self):
         depot_str = " (DEPOT)" if self.is_depot else ""
         return (f"Node {self.id}{depot_str}: ({self.x}, {self.y}), "
@@ -76,6 +309,206 @@ class Edge:
         return f"Edge({self.u.id} <-> {self.v.id})"
 
 
+class RoadGraph:
+    """
+    Indexed road network built once from a list of Edge objects.
+    
+    Adjacency is stored CSR-style: the neighbors of the node at dense index i
+    are targets[offsets[i]:offsets[i + 1]], so a neighbor lookup costs
+    O(degree) instead of a scan over every edge. Duplicate roads (the same
+    pair of nodes listed twice) and self-loops are dropped. Neighbors keep
+    the order in which get_neighbors would have found them in the edge list.
+    
+    Attributes:
+        nodes (List[Node]): Nodes by dense index (a NodeStore for from_csr graphs)
+        offsets (array): Start of each node's neighbor block in targets (len V + 1)
+        targets (array): Dense indices of neighbors, one entry per road direction
+            (either may be a memoryview for graphs loaded from a mapped file)
+        derived (dict): Precomputed data attached by other modules, keyed by name;
+            entries built from node attributes record node_version() and are
+            rebuilt once it changes
+    """
+    
+    def __init__(self, edges: List[Edge], nodes: Optional[List[Node]] = None):
+        self.nodes: List[Node] = []
+        self._index_of: Dict[int, int] = {}
+        for node in nodes or []:
+            self._add_node(node)
+        
+        adjacency: List[List[int]] = [[] for _ in self.nodes]
+        seen = set()
+        for edge in edges:
+            for node in (edge.u, edge.v):
+                if node.id not in self._index_of:
+                    self._add_node(node)
+                    adjacency.append([])
+            a = self._index_of[edge.u.id]
+            b = self._index_of[edge.v.id]
+            key = (a, b) if a < b else (b, a)
+            if a == b or key in seen:
+                continue
+            seen.add(key)
+            adjacency[a].append(b)
+            adjacency[b].append(a)
+        
+        self.offsets = array("l", [0])
+        self.targets = array("l")
+        for block in adjacency:
+            self.targets.extend(block)
+            self.offsets.append(len(self.targets))
+        self.derived: dict = {}
+        self._stores: Optional[List[NodeStore]] = None
+    
+    @classmethod
+    def from_csr(cls, nodes: Sequence[Node], offsets: Sequence[int],
+                 targets: Sequence[int], dense_ids: Optional[bool] = None) -> "RoadGraph":
+        """
+        Wrap ready-made CSR arrays without going through Edge objects.
+        
+        The arrays are trusted as given: each road must appear once in each
+        direction and there must be no duplicates or self-loops. Typed
+        arrays and memoryviews (e.g. over a memory-mapped file) are used
+        as-is, without copying.
+        
+        Args:
+            nodes (Sequence[Node]): Nodes by dense index (a list or a NodeStore)
+            offsets (Sequence[int]): Neighbor block starts, len(nodes) + 1 entries
+            targets (Sequence[int]): Dense neighbor indices
+            dense_ids (bool): Whether a NodeStore's ids are exactly its row
+                numbers; None checks every id
+            
+        Returns:
+            RoadGraph: Indexed road network
+        """
+        if len(offsets) != len(nodes) + 1:
+            raise ValueError("offsets must have len(nodes) + 1 entries")
+        graph = cls.__new__(cls)
+        graph.nodes = nodes
+        if isinstance(nodes, NodeStore):
+            ids = nodes.ids
+            if dense_ids is None:
+                dense_ids = all(node_id == row for row, node_id in enumerate(ids))
+            if dense_ids:
+                graph._index_of = _IdentityIndex(len(ids))
+            else:
+                graph._index_of = {node_id: row for row, node_id in enumerate(ids)}
+        else:
+            graph._index_of = {node.id: i for i, node in enumerate(nodes)}
+        graph.offsets = offsets if isinstance(offsets, (array, memoryview)) else array("l", offsets)
+        graph.targets = targets if isinstance(targets, (array, memoryview)) else array("l", targets)
+        graph.derived = {}
+        graph._stores = None
+        return graph
+    
+    def _add_node(self, node: Node):
+        if node.id not in self._index_of:
+            self._index_of[node.id] = len(self.nodes)
+            self.nodes.append(node)
+    
+    def __len__(self) -> int:
+        return len(self.nodes)
+    
+    def __contains__(self, node: Node) -> bool:
+        return node.id in self._index_of
+    
+    @property
+    def num_edges(self) -> int:
+        """Number of distinct roads (each undirected road counted once)."""
+        return len(self.targets) // 2
+    
+    def node_version(self, *columns: str) -> int:
+        """
+        Changes recorded in the given NodeStore columns of this graph's nodes.
+        
+        The value only grows, so data built from those columns is current
+        as long as the value it was built at still matches.
+        """
+        stores = self._stores
+        if stores is None:
+            if isinstance(self.nodes, NodeStore):
+                stores = [self.nodes]
+            else:
+                stores = list({id(node.store): node.store for node in self.nodes}.values())
+            self._stores = stores
+        return sum(store.version(*columns) for store in stores)
+    
+    def index(self, node: Node) -> int:
+        """Dense index of a node; raises KeyError if the node is not in the graph."""
+        return self._index_of[node.id]
+    
+    def __getitem__(self, node_id: int) -> Node:
+        """The node with the given id; raises KeyError if it is not in the graph."""
+        return self.nodes[self._index_of[node_id]]
+    
+    def neighbor_indices(self, i: int) -> array:
+        """Dense indices of the neighbors of the node at dense index i."""
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+    
+    def neighbors(self, node: Node) -> List[Node]:
+        """
+        Get all nodes directly connected to the given node via roads.
+        
+        Args:
+            node (Node): The node to find neighbors for
+            
+        Returns:
+            List[Node]: Neighboring nodes (empty if the node has no roads)
+        """
+        i = self._index_of.get(node.id)
+        if i is None:
+            return []
+        nodes = self.nodes
+        return [nodes[j] for j in self.targets[self.offsets[i]:self.offsets[i + 1]]]
+    
+    def degree(self, node: Node) -> int:
+        """Number of distinct roads touching the node."""
+        i = self._index_of.get(node.id)
+        if i is None:
+            return 0
+        return self.offsets[i + 1] - self.offsets[i]
+    
+    def __repr__(self):
+        return f"RoadGraph({len(self.nodes)} nodes, {self.num_edges} roads)"
+
+
+class _IdentityIndex:
+    """Id-to-index mapping for graphs whose node ids are exactly 0..n-1."""
+    
+    def __init__(self, n: int):
+        self._n = n
+    
+    def __contains__(self, node_id) -> bool:
+        return isinstance(node_id, int) and 0 <= node_id < self._n
+    
+    def __getitem__(self, node_id: int) -> int:
+        if node_id not in self:
+            raise KeyError(node_id)
+        return node_id
+    
+    def get(self, node_id: int, default=None):
+        return node_id if node_id in self else default
+
+
+def as_road_graph(edges: Union[List[Edge], RoadGraph],
+                  nodes: Optional[List[Node]] = None) -> RoadGraph:
+    """
+    Return edges unchanged if it is already a RoadGraph, else index it.
+    
+    Build the RoadGraph once and pass it around to avoid re-indexing the
+    edge list on every call.
+    
+    Args:
+        edges (List[Edge] | RoadGraph): Road edges or an existing index
+        nodes (List[Node]): Optional nodes to include even if they have no roads
+        
+    Returns:
+        RoadGraph: Indexed road network
+    """
+    if isinstance(edges, RoadGraph):
+        return edges
+    return RoadGraph(edges, nodes)
+
+
 def calculate_travel_cost(distance: float, base_cost_per_mile: float = 0.50) -> float:
     """
     Calculate the cost of traveling a given distance.
@@ -89,26 +522,37 @@ def calculate_travel_cost(distance: float, base_cost_per_mile: float = 0.50) ->
     Returns:
         float: Total travel cost
     """
+    if _probe is not None:
+        _probe.count("calculate_travel_cost")
     return distance * base_cost_per_mile
 
 
-def get_neighbors(node: Node, edges: List[Edge]) -> List[Node]:
+def get_neighbors(node: Node, edges: Union[List[Edge], RoadGraph]) -> List[Node]:
     """
     Get all nodes directly connected to the given node via road edges.
     
+    Passing a RoadGraph makes this an O(degree) lookup; a plain edge list
+    is scanned in full on every call.
+    
     Args:
         node (Node): The node to find neighbors for
-        edges (List[Edge]): All road Edge objects
+        edges (List[Edge] | RoadGraph): All road Edge objects, or their index
         
     Returns:
         List[Node]: List of neighboring nodes connected by roads
     """
-    neighbors = []
-    for edge in edges:
-        if edge.u.id == node.id:
-            neighbors.append(edge.v)
-        elif edge.v.id == node.id:
-            neighbors.append(edge.u)
+    if isinstance(edges, RoadGraph):
+        neighbors = edges.neighbors(node)
+    else:
+        neighbors = []
+        for edge in edges:
+            if edge.u.id == node.id:
+                neighbors.append(edge.v)
+            elif edge.v.id == node.id:
+                neighbors.append(edge.u)
+    if _probe is not None:
+        _probe.count("get_neighbors")
+        _probe.neighbors(len(neighbors))
     return neighbors
 
 
@@ -4,7 +4,7 @@ Minnesota Cities Dataset - Direct Nodes and Edges
 Students work directly with MN_NODES and MN_EDGES lists.
 No creation functions needed - just import and use.
 """
-from main import Node, Edge
+from main import Node, Edge, RoadGraph
 from typing import List 
 
 # === Minnesota city nodes (with attributes) ===================================
@@ -124,6 +124,13 @@ MN_EDGES = [
     Edge(MN_NODES[2], MN_NODES[19]),   # Edina - Chanhassen
 ]
 
+# The I-94 corridor roads (the east-west spine), e.g. for rush-hour cost profiles
+MN_I94_CORRIDOR = MN_EDGES[:5]
+
+
+# Indexed once so neighbor lookups cost O(degree); duplicate roads are dropped
+MN_GRAPH = RoadGraph(MN_EDGES, MN_NODES)
+
 
 def get_neighbors(node: Node) -> List[Node]:
     """
@@ -135,10 +142,4 @@ def get_neighbors(node: Node) -> List[Node]:
     Returns:
         List[Node]: List of neighboring nodes connected by roads
     """
-    neighbors = []
-    for edge in MN_EDGES:
-        if edge.u.id == node.id:
-            neighbors.append(edge.v)
-        elif edge.v.id == node.id:
-            neighbors.append(edge.u)
-    return neighbors
\ No newline at end of file
+    return MN_GRAPH.neighbors(node)
\ No newline at end of file
@@ -0,0 +1,222 @@
+"""
+Greedy Algorithm Assignment - Multi-Depot Planning
+
+The strategies route from one depot at a time. With several hubs we want
+the best route from every candidate depot, or the customers shared out so
+that each is served from its closest depot.
+
+plan_depots() indexes the roads and builds the shared read-only arrays
+(travel costs, node attributes) once, then plans one greedy route per
+depot as tasks on a GraphPool, so depots are planned in parallel and no
+task rebuilds anything. Every customer is assigned to the depot it is
+closest to by road, found with one multi-source Dijkstra run from all
+depots at once rather than one run per depot. By default each depot's
+route only stops at its own customers; those routes together cover the
+graph about once, so adding depots costs little beyond the assignment.
+
+With partition=False every depot instead competes for all customers and
+the plan reports which depot routes best, for choosing a single hub.
+Competing routes each cover the whole graph, so that mode's work grows
+linearly with the number of depots and only the workers divide it.
+"""
+
+import heapq
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from main import Node, Edge, RoadGraph, as_road_graph
+from greedy_engine import DriverEarnings, NodeArrays, Objective, greedy_route
+from travel_costs import TravelCosts
+from worker_pool import GraphPool
+
+
+class DepotRoute:
+    """
+    The route planned from one depot.
+
+    Attributes:
+        depot (Node): The depot the route starts and ends at
+        route (List[Node]): Route from the depot back to the depot
+        total (float): Route total under the planning objective
+        assigned (int): Customers assigned to this depot
+        served (int): Customers the route stops at
+    """
+
+    def __init__(self, depot: Node, route: List[Node], total: float, assigned: int, served: int):
+        self.depot = depot
+        self.route = route
+        self.total = total
+        self.assigned = assigned
+        self.served = served
+
+    def __repr__(self):
+        return (f"DepotRoute(depot={self.depot.id}, served={self.served}, "
+                f"assigned={self.assigned}, total={self.total:.2f})")
+
+
+class MultiDepotPlan:
+    """
+    Routes from every depot and the customer-to-depot assignment.
+
+    Attributes:
+        depots (List[DepotRoute]): One result per depot, in depot order
+        assignment (np.ndarray): Position in depots of each dense node
+            index's closest depot by road (-1 for depots and for customers
+            no depot can reach)
+        distance (np.ndarray): Road distance from each node to that depot
+            (inf where unreachable)
+        partitioned (bool): Whether each route was limited to its assigned customers
+        unreachable (List[Node]): Customers no depot can reach by road
+    """
+
+    def __init__(self, depots: List[DepotRoute], assignment: np.ndarray, distance: np.ndarray,
+                 partitioned: bool, unreachable: List[Node]):
+        self.depots = depots
+        self.assignment = assignment
+        self.distance = distance
+        self.partitioned = partitioned
+        self.unreachable = unreachable
+
+    @property
+    def best(self) -> DepotRoute:
+        """The depot route with the highest total."""
+        return max(self.depots, key=lambda result: result.total)
+
+    @property
+    def total(self) -> float:
+        """Sum of the depot totals (meaningful when partitioned)."""
+        return sum(result.total for result in self.depots)
+
+    def depot_of(self, graph: RoadGraph, customer: Node) -> Optional[Node]:
+        """The depot a customer is assigned to, or None if it has none."""
+        k = int(self.assignment[graph.index(customer)])
+        return self.depots[k].depot if k >= 0 else None
+
+    def __repr__(self):
+        mode = "partitioned" if self.partitioned else "competing"
+        return (f"MultiDepotPlan({len(self.depots)} depots, {mode}, best={self.best.depot.id}, "
+                f"total={self.total:.2f})")
+
+
+# ============================================================================
+# ASSIGNMENT
+# ============================================================================
+
+def depot_indices(graph: RoadGraph) -> np.ndarray:
+    """Dense indices of every node marked is_depot."""
+    return np.flatnonzero(NodeArrays.for_graph(graph).is_depot)
+
+
+def nearest_depots(graph: RoadGraph, depots: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Closest depot by road for every node, from one multi-source Dijkstra run.
+
+    Args:
+        graph (RoadGraph): Road network
+        depots (np.ndarray): Dense indices of the depots
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (position in depots of the closest
+        depot, -1 if unreachable; road distance to it, inf if unreachable)
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    lengths = TravelCosts.for_graph(graph).lengths.tolist()
+    dist = [float("inf")] * len(graph)
+    owner = [-1] * len(graph)
+    heap = []
+    for k, d in enumerate(depots.tolist()):
+        if owner[d] < 0:
+            dist[d], owner[d] = 0.0, k
+            heap.append((0.0, d))
+    heapq.heapify(heap)
+    while heap:
+        du, u = heapq.heappop(heap)
+        if du > dist[u]:
+            continue
+        label = owner[u]
+        for slot in range(offsets[u], offsets[u + 1]):
+            v = targets[slot]
+            dv = du + lengths[slot]
+            if dv < dist[v]:
+                dist[v], owner[v] = dv, label
+                heapq.heappush(heap, (dv, v))
+    return np.array(owner, dtype=np.intp), np.array(dist)
+
+
+# ============================================================================
+# PLANNING
+# ============================================================================
+
+def _plan_depot(graph: RoadGraph, task) -> tuple:
+    depot, objective, depots, stops, recover = task
+    if stops is None:
+        customers = ~NodeArrays.for_graph(graph).is_depot
+        customers[depots] = False
+    else:
+        customers = np.zeros(len(graph), dtype=bool)
+        customers[stops] = True
+    route, total = greedy_route(graph, graph.nodes[depot], objective, recover=recover,
+                                customers=customers)
+    return [graph.index(node) for node in route], total
+
+
+def plan_depots(edges: Union[List[Edge], RoadGraph], depots: Optional[List[Node]] = None,
+                objective: Optional[Objective] = None, nodes: Optional[List[Node]] = None,
+                workers: Optional[int] = None, recover: bool = True,
+                partition: bool = True) -> MultiDepotPlan:
+    """
+    Plan a greedy route from every depot in parallel over one shared graph.
+
+    Candidate depots are never stops of any route, even if they are not
+    marked is_depot.
+
+    Args:
+        edges (List[Edge] | RoadGraph): Road connections, or their index
+        depots (List[Node]): Candidate depots (default: every node marked is_depot)
+        objective (Objective): Greedy scoring rule (default: DriverEarnings)
+        nodes (List[Node]): Optional nodes to index along with the edges
+        workers (int): Worker processes (default: one per available CPU)
+        recover (bool): Use dead-end recovery
+        partition (bool): Limit each depot's route to the customers
+            assigned to it (default); False lets every depot compete for all
+            customers, which costs one whole-graph route per depot
+
+    Returns:
+        MultiDepotPlan: Per-depot routes and the customer assignment
+    """
+    graph = as_road_graph(edges, nodes)
+    objective = objective if objective is not None else DriverEarnings()
+    arrays = NodeArrays.for_graph(graph)
+    if depots is None:
+        ids = depot_indices(graph)
+    else:
+        ids = np.fromiter((graph.index(depot) for depot in depots), dtype=np.intp, count=len(depots))
+    if len(ids) == 0:
+        raise ValueError("need at least one depot")
+    # Shared arrays are built here once, before the graph is handed to the workers
+    TravelCosts.for_graph(graph)
+
+    owner, distance = nearest_depots(graph, ids)
+    is_candidate = arrays.is_depot.copy()
+    is_candidate[ids] = True
+    owner[is_candidate] = -1
+    order = np.argsort(owner, kind="stable")
+    bounds = np.searchsorted(owner[order], np.arange(len(ids) + 1))
+    shares = [order[bounds[k]:bounds[k + 1]] for k in range(len(ids))]
+    tasks = [(d, objective, ids, shares[k] if partition else None, recover)
+             for k, d in enumerate(ids.tolist())]
+
+    with GraphPool(graph, workers) as pool:
+        results = pool.map(_plan_depot, tasks)
+
+    plans = []
+    for k, (stops, total) in enumerate(results):
+        visited = np.zeros(len(graph), dtype=bool)
+        visited[stops] = True
+        served = int(visited[shares[k]].sum()) if partition else int((visited & ~is_candidate).sum())
+        plans.append(DepotRoute(graph.nodes[ids[k]], [graph.nodes[i] for i in stops], total,
+                                len(shares[k]), served))
+    unreachable = [graph.nodes[i] for i in np.flatnonzero((owner < 0) & ~is_candidate)]
+    return MultiDepotPlan(plans, owner, distance, partition, unreachable)
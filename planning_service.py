@@ -0,0 +1,248 @@
+"""
+Greedy Algorithm Assignment - asyncio Route-Planning Service
+
+Serves route requests from an asyncio application (e.g. web handlers)
+without blocking its event loop. The road graph is loaded once and its
+shared arrays (travel costs, node attributes, shortest-path cache) are
+built when the service starts, not per request.
+
+Requests are micro-batched. A batch goes out as soon as a worker is free,
+carrying every request queued by then (up to max_batch, optionally after
+a short batch_window), so requests that arrive while one batch is being
+planned go out together as the next. Identical requests in a batch (same
+depot, strategy and parameters) are planned once. Batches run on a
+background thread, or on a GraphPool of worker processes with one batch
+in flight per worker, so the event loop only queues requests and hands
+out results.
+
+stats() reports request latency percentiles, batch sizes and queue depth.
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from main import Node, RoadGraph
+from greedy_engine import NodeArrays
+from route_cache import STRATEGIES, _canonical
+from shortest_paths import ShortestPathCache
+from travel_costs import TravelCosts
+from worker_pool import GraphPool
+
+
+def _warm_up(graph: RoadGraph, _task) -> int:
+    TravelCosts.for_graph(graph)
+    NodeArrays.for_graph(graph)
+    ShortestPathCache.for_graph(graph)
+    return len(graph)
+
+
+def _plan_batch(graph: RoadGraph, requests: List[tuple]) -> List[Any]:
+    """Plan distinct (depot index, strategy, params) requests; failures are returned, not raised."""
+    results: List[Any] = []
+    for depot, strategy, params in requests:
+        try:
+            route, total = STRATEGIES[strategy](None, graph.nodes[depot], graph, **params)
+            results.append(([graph.index(node) for node in route], total))
+        except Exception as error:
+            results.append(error)
+    return results
+
+
+class PlanningService:
+    """
+    Asynchronous, batching front end to the greedy strategies.
+
+    Usage:
+        async with PlanningService(graph) as service:
+            route, total = await service.plan(depot, "driver", recover=True)
+
+    Attributes:
+        graph (RoadGraph): The road network every request is planned on
+        workers (int): Batches planned at once (more than 1 uses worker processes)
+        max_batch (int): Most requests sent out as one task
+        batch_window (float): Seconds a batch waits for more requests once a worker is free
+        requests (int): Requests accepted
+        completed (int): Requests answered (with a route or an error)
+        batches (int): Tasks sent out
+        deduplicated (int): Requests answered by an identical request in the same batch
+        max_queue_depth (int): Most requests ever waiting for a batch
+    """
+
+    def __init__(self, graph: RoadGraph, workers: int = 1, max_batch: int = 32,
+                 batch_window: float = 0.0, history: int = 10_000):
+        """
+        Args:
+            graph (RoadGraph): The road network
+            workers (int): Batches planned at once
+            max_batch (int): Most requests per task
+            batch_window (float): Seconds to gather a batch once a request arrives
+            history (int): Latest request latencies kept for percentiles
+        """
+        self.graph = graph
+        self.workers = max(1, workers)
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.requests = 0
+        self.completed = 0
+        self.batches = 0
+        self.deduplicated = 0
+        self.max_queue_depth = 0
+        self._latencies: deque = deque(maxlen=history)
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._dispatching: set = set()
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._pool: Optional[GraphPool] = None
+
+    async def start(self):
+        """Build the shared arrays and begin accepting requests."""
+        loop = asyncio.get_running_loop()
+        if self.workers > 1:
+            self._pool = await loop.run_in_executor(None, GraphPool, self.graph, self.workers)
+        else:
+            self._threads = ThreadPoolExecutor(1, thread_name_prefix="route-planner")
+        await self._submit(_warm_up, None)
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._batcher = asyncio.create_task(self._gather_batches())
+
+    async def close(self):
+        """Finish the batches in flight, fail any still queued, and stop the workers."""
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        if self._dispatching:
+            await asyncio.gather(*self._dispatching, return_exceptions=True)
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, _, future, _ = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("planning service closed"))
+            self._queue = None
+        if self._threads is not None:
+            self._threads.shutdown()
+            self._threads = None
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    async def __aenter__(self) -> "PlanningService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def plan(self, depot: Union[Node, int], strategy: str = "driver",
+                   **params) -> Tuple[List[Node], float]:
+        """
+        Plan one route.
+
+        Args:
+            depot (Node | int): The starting depot, or its node id
+            strategy (str): "company", "driver" or "ethical"
+            **params: Strategy keyword arguments (e.g. recover, long_hop_threshold)
+
+        Returns:
+            Tuple[List[Node], float]: (route, total), as the strategy returns them
+
+        Raises:
+            TypeError: If a parameter value is not one route_cache._canonical
+                accepts (None, bools, numbers, strings, and lists, tuples and
+                string-keyed dicts of those)
+        """
+        if self._queue is None:
+            raise RuntimeError("planning service is not running (use 'async with' or start())")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown strategy {strategy!r}; expected one of {sorted(STRATEGIES)}")
+        node = depot if isinstance(depot, Node) else self.graph[depot]
+        canonical = json.dumps(sorted([name, _canonical(value)] for name, value in params.items()))
+        request = (self.graph.index(node), strategy, params)
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(((request[0], strategy, canonical), request, future, time.perf_counter()))
+        self.requests += 1
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return await future
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests waiting for a batch."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def latency_percentiles(self, percentiles=(50, 90, 99)) -> dict:
+        """Request latency in milliseconds (queueing plus planning) at each percentile."""
+        if not self._latencies:
+            return {p: 0.0 for p in percentiles}
+        values = np.percentile(np.fromiter(self._latencies, dtype=np.float64), percentiles) * 1000
+        return dict(zip(percentiles, values.tolist()))
+
+    def stats(self) -> dict:
+        """Counters, batch sizes, queue depth and latency percentiles."""
+        latency = self.latency_percentiles()
+        return {"requests": self.requests, "completed": self.completed, "batches": self.batches,
+                "mean_batch": self.completed / self.batches if self.batches else 0.0,
+                "deduplicated": self.deduplicated, "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "batches_in_flight": len(self._dispatching),
+                **{f"p{p}_ms": value for p, value in latency.items()}}
+
+    def _submit(self, fn: Callable[[RoadGraph, Any], Any], task: Any) -> asyncio.Future:
+        if self._pool is not None:
+            return asyncio.wrap_future(self._pool.submit(fn, task))
+        return asyncio.get_running_loop().run_in_executor(self._threads, fn, self.graph, task)
+
+    async def _gather_batches(self):
+        queue = self._queue
+        while True:
+            # Wait for a free worker first, so requests pile up into bigger batches under load
+            await self._slots.acquire()
+            try:
+                batch = [await queue.get()]
+                if self.batch_window > 0 and queue.qsize() < self.max_batch - 1:
+                    await asyncio.sleep(self.batch_window)
+                while len(batch) < self.max_batch and not queue.empty():
+                    batch.append(queue.get_nowait())
+            except BaseException:
+                self._slots.release()
+                raise
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, batch: List[tuple]):
+        try:
+            distinct = {}
+            for key, request, _, _ in batch:
+                distinct.setdefault(key, request)
+            self.deduplicated += len(batch) - len(distinct)
+            results = dict(zip(distinct, await self._submit(_plan_batch, list(distinct.values()))))
+            nodes = self.graph.nodes
+            finished = time.perf_counter()
+            for key, _, future, started in batch:
+                if future.done():
+                    continue
+                result = results[key]
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(([nodes[i] for i in result[0]], result[1]))
+                self._latencies.append(finished - started)
+        except Exception as error:
+            for _, _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(error)
+        finally:
+            self.completed += len(batch)
+            self.batches += 1
+            self._slots.release()
@@ -0,0 +1,313 @@
+"""
+Greedy Algorithm Assignment - Priority and Time-Window Scheduling
+
+A routing mode that serves urgent customers first. Every customer gets a
+time window (by default derived from its priority: priority 1 is due
+soonest), and the driver's clock advances with the road distance driven.
+
+Candidates live in heaps instead of being rescanned. Every customer has
+a combined urgency and earnings key: reward, plus a bonus per priority
+level, plus a bonus for an earlier deadline. One frontier heap holds the
+roads out of the stops made so far. Arriving at a stop pushes its roads
+once, valued against the clock at that moment: the key less the road
+cost, and a window that has not opened yet charges the wait as if it
+were driven. Each entry records the stop that pushed it, so entries of
+stops the driver has left are dropped lazily when they come to the top;
+the heap is never cleared or rebuilt. At a dead end, a second heap of
+every customer by key alone bounds what any stop can be worth, so the
+search outward along roads (as in the engine's recovery) stops as soon
+as the distance already driven rules out every farther customer. A step
+costs O(degree log n) heap work besides any dead-end search.
+
+With both weights at zero and every window open from departure, the
+route is the one greedy_route gives with recover=True, other depots
+included: like the engine, the scheduler only rules out the depot it
+starts from.
+
+schedule_metrics() reports lateness and priority violations for any
+route, so the scheduler can be compared with the plain greedy strategies.
+"""
+
+import heapq
+from typing import Callable, List, Optional, Union
+
+import numpy as np
+
+from main import Node, Edge, RoadGraph, as_road_graph
+from greedy_engine import DriverEarnings, NodeArrays, Objective, stop_on_path
+from shortest_paths import ShortestPathCache
+from travel_costs import TravelCosts
+
+# Priority levels run from 1 (most urgent) to this
+LOWEST_PRIORITY = 5
+
+
+class TimeWindows:
+    """
+    Service windows per dense node index, in minutes after departure.
+
+    Attributes:
+        earliest (np.ndarray): Time service may start (arriving earlier means waiting)
+        latest (np.ndarray): Time service should start by (later is late)
+        service (float): Minutes spent at each stop
+    """
+
+    def __init__(self, earliest: np.ndarray, latest: np.ndarray, service: float = 0.0):
+        self.earliest = np.asarray(earliest, dtype=np.float64)
+        self.latest = np.asarray(latest, dtype=np.float64)
+        self.service = float(service)
+
+    @classmethod
+    def from_priority(cls, graph: RoadGraph, minutes_per_level: float = 30.0,
+                      service: float = 2.0) -> "TimeWindows":
+        """
+        Windows open at departure and close priority * minutes_per_level later.
+
+        Depots get an unbounded window.
+        """
+        arrays = NodeArrays.for_graph(graph)
+        latest = arrays.priority.astype(np.float64) * minutes_per_level
+        latest[arrays.is_depot] = np.inf
+        return cls(np.zeros(len(graph)), latest, service)
+
+
+class ScheduleReport:
+    """
+    A route with its earnings and service-quality metrics.
+
+    Attributes:
+        route (List[Node]): Route from the depot back to the depot
+        total (float): Route total under the objective
+        served (int): Customers stopped at
+        late_stops (int): Stops that started after their window closed
+        total_lateness (float): Minutes late, summed over stops
+        max_lateness (float): Largest lateness of any stop, in minutes
+        priority_violations (int): Stops made while a more urgent customer
+            was still left to serve later in the route
+        priority_inversions (int): Pairs of stops served in the wrong order
+            (the less urgent one first)
+        finish_time (float): Minutes from departure to the return to the depot
+    """
+
+    def __init__(self, route: List[Node], total: float):
+        self.route = route
+        self.total = total
+        self.served = 0
+        self.late_stops = 0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+        self.priority_violations = 0
+        self.priority_inversions = 0
+        self.finish_time = 0.0
+
+    def as_dict(self) -> dict:
+        """Metrics (everything but the route) as a dict."""
+        return {name: value for name, value in vars(self).items() if name != "route"}
+
+    def __repr__(self):
+        return (f"ScheduleReport(total={self.total:.2f}, served={self.served}, "
+                f"late={self.late_stops}, lateness={self.total_lateness:.1f}min, "
+                f"violations={self.priority_violations})")
+
+
+def schedule_metrics(route: List[Node], total: float, edges: Union[List[Edge], RoadGraph],
+                     windows: Optional[TimeWindows] = None, speed: float = 30.0,
+                     nodes: Optional[List[Node]] = None) -> ScheduleReport:
+    """
+    Replay a route against time windows.
+
+    The first visit to each node other than the starting depot is its
+    stop, other depots included; later visits (driving through during
+    recovery) take no service time. Hops are timed by
+    TravelCosts.hop_minutes.
+
+    Args:
+        route (List[Node]): Route to evaluate, starting at the depot
+        total (float): The route's total, reported alongside the metrics
+        edges (List[Edge] | RoadGraph): Road connections, or their index
+        windows (TimeWindows): Service windows (default: from priority)
+        speed (float): Driving speed in distance units per hour
+        nodes (List[Node]): Optional nodes to index along with the edges
+
+    Returns:
+        ScheduleReport: Lateness and priority metrics of the route
+    """
+    graph = as_road_graph(edges, nodes)
+    windows = windows if windows is not None else TimeWindows.from_priority(graph)
+    arrays = NodeArrays.for_graph(graph)
+    travel = TravelCosts.for_graph(graph)
+    report = ScheduleReport(route, total)
+    if not route:
+        return report
+
+    stops = np.array([graph.index(node) for node in route], dtype=np.intp)
+    minutes = travel.hop_minutes(stops, speed).tolist()
+    # Only the starting depot is not a stop, as in priority_route and greedy_route
+    seen = [False] * len(graph)
+    seen[stops[0]] = True
+    earliest, latest = windows.earliest.tolist(), windows.latest.tolist()
+    served: List[int] = []
+    clock = 0.0
+    for k, j in enumerate(stops[1:].tolist()):
+        clock += minutes[k]
+        if seen[j]:
+            continue
+        seen[j] = True
+        clock = max(clock, earliest[j])
+        late = clock - latest[j]
+        if late > 0:
+            report.late_stops += 1
+            report.total_lateness += late
+            report.max_lateness = max(report.max_lateness, late)
+        clock += windows.service
+        served.append(j)
+    report.served = len(served)
+    report.finish_time = clock
+
+    # Count, from the back, how many later stops have each priority
+    later = np.zeros(LOWEST_PRIORITY + 2, dtype=np.int64)
+    for j in reversed(served):
+        p = min(max(int(arrays.priority[j]), 1), LOWEST_PRIORITY)
+        ahead = int(later[1:p].sum())
+        if ahead:
+            report.priority_violations += 1
+            report.priority_inversions += ahead
+        later[p] += 1
+    return report
+
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+def priority_route(edges: Union[List[Edge], RoadGraph], depot: Node,
+                   objective: Optional[Objective] = None, nodes: Optional[List[Node]] = None,
+                   windows: Optional[TimeWindows] = None, speed: float = 30.0,
+                   priority_weight: float = 2.0, deadline_weight: float = 4.0,
+                   customers: Optional[np.ndarray] = None) -> ScheduleReport:
+    """
+    Build a route that favors urgent customers and respects time windows.
+
+    Args:
+        edges (List[Edge] | RoadGraph): Road connections, or their index
+        depot (Node): The starting depot location
+        objective (Objective): Decides what a stop is worth (default: DriverEarnings)
+        nodes (List[Node]): Optional nodes to index along with the edges
+        windows (TimeWindows): Service windows (default: from priority)
+        speed (float): Driving speed in distance units per hour
+        priority_weight (float): Key bonus per priority level above the lowest
+        deadline_weight (float): Key bonus of the earliest-closing window over
+            the latest-closing one (others in proportion)
+        customers (np.ndarray): Boolean mask by dense index of the nodes this
+            route may stop at; None allows all
+
+    Returns:
+        ScheduleReport: Route, total (rewards minus road travel cost) and
+        its lateness and priority metrics
+    """
+    graph = as_road_graph(edges, nodes)
+    objective = objective if objective is not None else DriverEarnings()
+    windows = windows if windows is not None else TimeWindows.from_priority(graph)
+    travel = TravelCosts.for_graph(graph)
+    arrays = NodeArrays.for_graph(graph)
+    paths = ShortestPathCache.for_graph(graph)
+    rate = travel.base_cost_per_mile
+    pace = 60.0 / speed
+
+    rewards = objective.rewards(arrays)
+    # The position-independent part of every key
+    static = rewards + priority_weight * (LOWEST_PRIORITY - arrays.priority.astype(np.float64))
+    due = windows.latest[np.isfinite(windows.latest)]
+    if len(due) and due.max() > due.min():
+        closing = np.minimum(windows.latest, due.max())
+        static += deadline_weight * (due.max() - closing) / (due.max() - due.min())
+    # As in greedy_route, only the starting depot is ruled out up front
+    d = graph.index(depot)
+    blocked = np.zeros(len(graph), dtype=bool)
+    if customers is not None:
+        blocked |= ~customers
+    blocked[d] = True
+    visited = blocked.tolist()
+    keys = static.tolist()
+    earliest = windows.earliest.tolist()
+    offsets, targets, lengths = graph.offsets, travel.targets.tolist(), travel.lengths.tolist()
+    clock = 0.0
+
+    def value(j: int, distance: float) -> float:
+        """Key of customer j reached over distance now, waiting charged as driving."""
+        return keys[j] - rate * max(distance, (earliest[j] - clock) / pace)
+
+    # Every customer by key alone: the top is the most any stop can be worth
+    remaining = [(-keys[j], j) for j in np.flatnonzero(~blocked).tolist()]
+    heapq.heapify(remaining)
+    # Roads out of the stops made: (-value, j, road length, stop it leaves).
+    # Each stop pushes its roads once, valued at the clock it was reached;
+    # entries of earlier stops are dropped when they come to the top
+    frontier: List[tuple] = []
+    stops = [d]
+    total = 0.0
+
+    def discover(i: int):
+        for slot in range(offsets[i], offsets[i + 1]):
+            j, hop = targets[slot], lengths[slot]
+            if not visited[j]:
+                heapq.heappush(frontier, (-value(j, hop), j, hop, i))
+
+    current = d
+    discover(d)
+    while True:
+        while frontier and (frontier[0][3] != current or visited[frontier[0][1]]):
+            heapq.heappop(frontier)
+        if frontier:
+            _, j, distance, _ = heapq.heappop(frontier)
+            path = [current, j]
+        else:
+            while remaining and visited[remaining[0][1]]:
+                heapq.heappop(remaining)
+            if not remaining:
+                break
+            tree = paths.tree(current)
+            j, distance = _best_reachable(tree, visited, value, -remaining[0][0], rate)
+            if j < 0:
+                break
+            path = stop_on_path(tree.path(j), lambda i: not visited[i])
+            j = path[-1]
+            distance = tree.dist[j]
+        stops.extend(path[1:])
+        clock = max(clock + distance * pace, earliest[j]) + windows.service
+        total += float(rewards[j]) - distance * rate
+        visited[j] = True
+        current = j
+        discover(j)
+
+    if current != d:
+        road_home = paths.path(current, d)
+        if road_home:
+            total -= paths.distance(current, d) * rate
+            stops.extend(road_home[1:])
+        else:
+            total -= travel.cost(current, d)
+            stops.append(d)
+
+    route = [graph.nodes[i] for i in stops]
+    return schedule_metrics(route, total, graph, windows, speed)
+
+
+def _best_reachable(tree, visited: List[bool], value: Callable[[int, float], float],
+                    bound: float, rate: float) -> tuple:
+    """
+    Best unvisited customer by value, searched outward from a dead end
+    until even the best key left cannot win over the distance driven.
+
+    Returns:
+        tuple: (dense index, road distance), or (-1, inf) if none is reachable
+    """
+    best, best_value, best_distance = -1, float("-inf"), float("inf")
+    for v, distance in tree.settled():
+        if bound - distance * rate < best_value:
+            break
+        if not visited[v]:
+            key = value(v, distance)
+            if key > best_value:
+                best, best_value, best_distance = v, key, distance
+    return best, best_distance
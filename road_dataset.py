@@ -0,0 +1,223 @@
+"""
+Road Datasets - Binary, Memory-Mapped File Format
+
+A dataset file holds one RoadGraph: its node table, its CSR edge index
+and its region dictionary, laid out so a reader can map the file and use
+the bytes in place. Opening a file reads only the header; node attributes
+and roads are paged in by the OS as they are touched, and Node objects
+are created only when asked for. A graph with ten million roads opens in
+milliseconds.
+
+File layout (little-endian, every section starts on a 64-byte boundary):
+
+    header      magic, version, flags, node count, road-slot count,
+                region dictionary size
+    node table  fixed-width columns, one entry per node in dense-index
+                order: id (int64), x, y, delivery_fee, estimated_tip
+                (float64), priority, is_depot (int8), region code (uint16)
+    edge index  CSR offsets (int64, nodes + 1) and targets (int64, one per
+                road direction), as in RoadGraph
+    regions     region names, UTF-8, separated by NUL bytes
+
+Run with:  python road_dataset.py convert-mn mn.roads
+           python road_dataset.py info mn.roads
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+from typing import List, Tuple
+
+import numpy as np
+
+from main import NodeStore, RoadGraph
+from greedy_engine import NodeArrays
+from travel_costs import node_column
+
+MAGIC = b"ROADGRF\x00"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIQQQ")  # magic, version, flags, nodes, slots, region bytes
+_ALIGN = 64
+
+# Header flag: node ids are exactly 0..n-1, so ids double as dense indices
+FLAG_DENSE_IDS = 1
+
+# Node table columns in file order: (NodeStore column, memoryview format)
+NODE_COLUMNS = [
+    ("ids", "q"),
+    ("x", "d"),
+    ("y", "d"),
+    ("delivery_fee", "d"),
+    ("estimated_tip", "d"),
+    ("priority", "b"),
+    ("is_depot", "b"),
+    ("region_code", "H"),
+]
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def _layout(nodes: int, slots: int, region_bytes: int) -> Tuple[List[Tuple[str, str, int, int]], int]:
+    """
+    Byte ranges of every section.
+
+    Returns:
+        Tuple[List[Tuple[str, str, int, int]], int]: ((name, format, start,
+        count) per section, total file size)
+    """
+    sections = []
+    offset = _HEADER.size
+    for name, fmt in NODE_COLUMNS + [("offsets", "q"), ("targets", "q"), ("regions", "B")]:
+        count = {"offsets": nodes + 1, "targets": slots, "regions": region_bytes}.get(name, nodes)
+        offset = _aligned(offset)
+        sections.append((name, fmt, offset, count))
+        offset += count * struct.calcsize(fmt)
+    return sections, offset
+
+
+# ============================================================================
+# WRITER
+# ============================================================================
+
+def write_dataset(path: str, graph: RoadGraph):
+    """
+    Write a road graph and its nodes' attributes to a dataset file.
+
+    Args:
+        path (str): Output file
+        graph (RoadGraph): Road network to store; nodes are written in its
+            dense-index order
+    """
+    nodes = graph.nodes
+    n = len(nodes)
+    arrays = NodeArrays.for_graph(graph)
+    ids = node_column(nodes, "ids", np.int64)
+    columns = {
+        "ids": ids,
+        "x": node_column(nodes, "x", np.float64),
+        "y": node_column(nodes, "y", np.float64),
+        "delivery_fee": arrays.fees,
+        "estimated_tip": arrays.tips,
+        "priority": arrays.priority,
+        "is_depot": arrays.is_depot,
+        "region_code": arrays.region,
+        "offsets": np.asarray(graph.offsets),
+        "targets": np.asarray(graph.targets),
+        "regions": np.frombuffer("\0".join(arrays.regions).encode("utf-8"), dtype=np.uint8),
+    }
+    flags = FLAG_DENSE_IDS if np.array_equal(ids, np.arange(n)) else 0
+    sections, size = _layout(n, len(graph.targets), len(columns["regions"]))
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, flags, n, len(graph.targets), len(columns["regions"])))
+        for name, fmt, start, count in sections:
+            f.write(b"\0" * (start - f.tell()))
+            data = np.ascontiguousarray(columns[name], dtype=np.dtype("<" + fmt))
+            if len(data) != count:
+                raise ValueError(f"column {name} has {len(data)} entries, expected {count}")
+            f.write(data.tobytes())
+        f.write(b"\0" * (size - f.tell()))
+
+
+def convert_mn_dataset(path: str):
+    """Write the hand-built Minnesota dataset (MN_NODES / MN_EDGES) to a dataset file."""
+    from mn_dataset import MN_GRAPH
+    write_dataset(path, MN_GRAPH)
+
+
+# ============================================================================
+# READER
+# ============================================================================
+
+class MappedDataset:
+    """
+    A dataset file mapped into memory.
+
+    Attributes:
+        path (str): The file
+        nodes (NodeStore): Node table; its columns are memoryviews over the
+            file, and nodes[i] creates a Node view for dense index i on demand
+        graph (RoadGraph): Road network over nodes, sharing the mapped edge index
+        writable (bool): Whether the columns accept writes (kept in memory,
+            never written back to the file)
+    """
+
+    def __init__(self, path: str, writable: bool = False):
+        self.path = path
+        self.writable = writable
+        with open(path, "rb") as f:
+            access = mmap.ACCESS_COPY if writable else mmap.ACCESS_READ
+            self._map = mmap.mmap(f.fileno(), 0, access=access)
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"{path}: not a road dataset (file too short)")
+        magic, version, flags, n, slots, region_bytes = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a road dataset (bad magic {magic!r})")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported dataset version {version}")
+        sections, size = _layout(n, slots, region_bytes)
+        if len(self._map) < size:
+            raise ValueError(f"{path}: truncated ({len(self._map)} of {size} bytes)")
+
+        buffer = memoryview(self._map)
+        views = {}
+        for name, fmt, start, count in sections:
+            views[name] = buffer[start:start + count * struct.calcsize(fmt)].cast(fmt)
+
+        store = NodeStore()
+        for name, _ in NODE_COLUMNS:
+            setattr(store, name, views[name])
+        for region in bytes(views["regions"]).decode("utf-8").split("\0") if region_bytes else []:
+            store.intern_region(region)
+        self.nodes = store
+        self.graph = RoadGraph.from_csr(store, views["offsets"], views["targets"],
+                                        dense_ids=bool(flags & FLAG_DENSE_IDS))
+        if not writable:
+            # Lets worker processes map the same file instead of receiving a copy
+            self.graph.derived["dataset_path"] = path
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __repr__(self):
+        return f"MappedDataset({self.path!r}, {len(self.nodes)} nodes, {self.graph.num_edges} roads)"
+
+
+def open_dataset(path: str, writable: bool = False) -> MappedDataset:
+    """
+    Map a dataset file for reading.
+
+    Args:
+        path (str): File written by write_dataset
+        writable (bool): Allow changing node attributes in memory (copy-on-write)
+
+    Returns:
+        MappedDataset: The mapped nodes and graph
+
+    Raises:
+        ValueError: If the file is not a dataset of a supported version, or is truncated
+    """
+    return MappedDataset(path, writable)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Binary road dataset files")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("convert-mn", help="write the Minnesota dataset").add_argument("path")
+    commands.add_parser("info", help="describe a dataset file").add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert-mn":
+        convert_mn_dataset(args.path)
+    dataset = open_dataset(args.path)
+    print(dataset)
+    print(f"regions: {', '.join(dataset.nodes.regions)}")
+    if len(dataset):
+        print(f"first node: {dataset.nodes[0]}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,374 @@
+"""
+Greedy Algorithm Assignment - Mutable Road Network
+
+A RoadNetwork takes road closures, reopenings and fee or tip changes
+while routes are being driven. Roads are kept in per-node dictionaries,
+so adding or removing a road, or changing a fee or tip, costs O(degree)
+plus a constant-time check per cached shortest-path tree. Derived data
+is invalidated only where it can have changed:
+
+- a cached shortest-path tree is dropped when a removed road was part of
+  it, or when a new road would shorten a path it already settled; a new
+  road next to its frontier is simply added to the frontier;
+- a RoadGraph snapshot (for full replans with the greedy engine) is
+  rebuilt after a road change, and patched in place after a fee or tip
+  change.
+
+Routes being driven can be tracked. Removing a road reports which tracked
+routes used it on their remaining hops, and impact() tells such a route
+which remaining stops can no longer be reached and which need replanning.
+"""
+
+import heapq
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from main import Node, Edge, RoadGraph
+from greedy_engine import NodeArrays
+
+
+class _Tree:
+    """Lazily expanded Dijkstra tree over a RoadNetwork's adjacency, keyed by node id."""
+
+    def __init__(self, source: int, roads: Dict[int, Dict[int, float]]):
+        self.source = source
+        self._roads = roads
+        self.dist: Dict[int, float] = {}
+        self.parent: Dict[int, int] = {}
+        self.tentative: Dict[int, Tuple[float, int]] = {source: (0.0, -1)}
+        self._heap: List[Tuple[float, int]] = [(0.0, source)]
+
+    def _settle_next(self) -> Optional[int]:
+        while self._heap:
+            d, v = heapq.heappop(self._heap)
+            entry = self.tentative.get(v)
+            if entry is None or d > entry[0]:
+                continue
+            del self.tentative[v]
+            self.dist[v] = d
+            if entry[1] >= 0:
+                self.parent[v] = entry[1]
+            for w, length in self._roads[v].items():
+                if w in self.dist:
+                    continue
+                self.offer(w, d + length, v)
+            return v
+        return None
+
+    def offer(self, v: int, d: float, via: int):
+        """Record a tentative distance for an unsettled node if it improves on the current one."""
+        best = self.tentative.get(v)
+        if best is None or d < best[0]:
+            self.tentative[v] = (d, via)
+            heapq.heappush(self._heap, (d, v))
+
+    def distance(self, target: int) -> float:
+        while target not in self.dist:
+            if self._settle_next() is None:
+                return float("inf")
+        return self.dist[target]
+
+    def path(self, target: int) -> List[int]:
+        if self.distance(target) == float("inf"):
+            return []
+        path = [target]
+        while path[-1] != self.source:
+            path.append(self.parent[path[-1]])
+        path.reverse()
+        return path
+
+    def uses(self, u: int, v: int) -> bool:
+        """Whether the road u-v is part of the tree or of a tentative entry."""
+        for a, b in ((u, v), (v, u)):
+            if self.parent.get(b) == a:
+                return True
+            entry = self.tentative.get(b)
+            if entry is not None and entry[1] == a:
+                return True
+        return False
+
+
+class RouteImpact:
+    """
+    How road changes affect a tracked route's remaining part.
+
+    Attributes:
+        broken_hops (List[Tuple[Node, Node]]): Remaining hops whose road is gone
+        unreachable (List[Node]): Remaining stops with no road path from the
+            driver's current position
+        replan (List[Node]): Remaining stops from the first broken hop on,
+            which the planned route can no longer reach as drawn
+    """
+
+    def __init__(self, broken_hops: List[Tuple[Node, Node]], unreachable: List[Node],
+                 replan: List[Node]):
+        self.broken_hops = broken_hops
+        self.unreachable = unreachable
+        self.replan = replan
+
+    @property
+    def ok(self) -> bool:
+        """True when the rest of the route can be driven as planned."""
+        return not self.broken_hops and not self.unreachable
+
+    def __repr__(self):
+        return (f"RouteImpact(broken_hops={len(self.broken_hops)}, "
+                f"unreachable={len(self.unreachable)}, replan={len(self.replan)})")
+
+
+class RoadNetwork:
+    """
+    Road network that changes while routes are driven.
+
+    Attributes:
+        nodes (Dict[int, Node]): Nodes by id, in the order they were added
+        version (int): Incremented on every change
+        max_trees (int): Shortest-path trees kept before the least recently used is dropped
+        trees_dropped (int): Trees invalidated by road changes so far
+    """
+
+    def __init__(self, edges: Iterable[Edge] = (), nodes: Optional[Iterable[Node]] = None,
+                 max_trees: int = 256):
+        self.nodes: Dict[int, Node] = {}
+        self._roads: Dict[int, Dict[int, float]] = {}
+        self.version = 0
+        self.max_trees = max_trees
+        self.trees_dropped = 0
+        self._trees: "OrderedDict[int, _Tree]" = OrderedDict()
+        self._snapshot: Optional[RoadGraph] = None
+        self._tracked: Dict[Hashable, Tuple[List[Node], int]] = {}
+        # Remaining hops of tracked routes: road -> {route key: times still to drive it}
+        self._hop_users: Dict[Tuple[int, int], Dict[Hashable, int]] = {}
+        for node in nodes or ():
+            self.add_node(node)
+        for edge in edges:
+            self.add_edge(edge)
+
+    # ------------------------------------------------------------------
+    # Changes
+    # ------------------------------------------------------------------
+
+    def add_node(self, node: Node):
+        """Add a node without roads (no-op if a node with its id exists)."""
+        if node.id not in self.nodes:
+            self.nodes[node.id] = node
+            self._roads[node.id] = {}
+            self._changed(structure=True)
+
+    def add_edge(self, edge: Edge):
+        """Open a road (adding its endpoints if needed)."""
+        u, v = edge.u, edge.v
+        self.add_node(u)
+        self.add_node(v)
+        if u.id == v.id or v.id in self._roads[u.id]:
+            return
+        length = edge.get_distance()
+        self._roads[u.id][v.id] = length
+        self._roads[v.id][u.id] = length
+        for source, tree in list(self._trees.items()):
+            du, dv = tree.dist.get(u.id), tree.dist.get(v.id)
+            if du is not None and dv is not None:
+                if du + length < dv or dv + length < du:
+                    self._drop_tree(source)
+            elif du is not None:
+                tree.offer(v.id, du + length, u.id)
+            elif dv is not None:
+                tree.offer(u.id, dv + length, v.id)
+        self._changed(structure=True)
+
+    def remove_edge(self, u: Node, v: Node) -> List[Hashable]:
+        """
+        Close the road between two nodes.
+
+        Returns:
+            List[Hashable]: Keys of tracked routes that still had to drive it
+        """
+        if v.id not in self._roads.get(u.id, {}):
+            return []
+        del self._roads[u.id][v.id]
+        del self._roads[v.id][u.id]
+        for source, tree in list(self._trees.items()):
+            if tree.uses(u.id, v.id):
+                self._drop_tree(source)
+        self._changed(structure=True)
+        return sorted(self._hop_users.get(_hop_key(u.id, v.id), ()), key=repr)
+
+    def set_fee(self, node: Node, delivery_fee: float):
+        """Change a node's delivery fee."""
+        arrays = self._snapshot_arrays()
+        self.nodes[node.id].delivery_fee = delivery_fee
+        self._patch_snapshot(arrays, node.id, "fees", delivery_fee)
+
+    def set_tip(self, node: Node, estimated_tip: float):
+        """Change a node's estimated tip."""
+        arrays = self._snapshot_arrays()
+        self.nodes[node.id].estimated_tip = estimated_tip
+        self._patch_snapshot(arrays, node.id, "tips", estimated_tip)
+
+    def _changed(self, structure: bool):
+        self.version += 1
+        if structure:
+            self._snapshot = None
+
+    def _drop_tree(self, source: int):
+        del self._trees[source]
+        self.trees_dropped += 1
+
+    def _snapshot_arrays(self) -> Optional[NodeArrays]:
+        """The snapshot's node arrays, if they are current before a change."""
+        return NodeArrays.cached(self._snapshot) if self._snapshot is not None else None
+
+    def _patch_snapshot(self, arrays: Optional[NodeArrays], node_id: int, column: str, value: float):
+        self._changed(structure=False)
+        if arrays is not None:
+            getattr(arrays, column)[self._snapshot.index(self.nodes[node_id])] = value
+            # Patched to match the change just made, so still current
+            arrays.node_version = self._snapshot.node_version(*NodeArrays.COLUMNS)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def neighbors(self, node: Node) -> List[Node]:
+        """Nodes with an open road to the given node."""
+        return [self.nodes[i] for i in self._roads.get(node.id, ())]
+
+    def has_road(self, u: Node, v: Node) -> bool:
+        return v.id in self._roads.get(u.id, ())
+
+    def _tree(self, source: int) -> _Tree:
+        tree = self._trees.get(source)
+        if tree is None:
+            tree = _Tree(source, self._roads)
+            self._trees[source] = tree
+            if len(self._trees) > self.max_trees:
+                self._trees.popitem(last=False)
+        else:
+            self._trees.move_to_end(source)
+        return tree
+
+    def distance(self, u: Node, v: Node) -> float:
+        """Shortest road distance (inf if no road path exists)."""
+        return self._tree(u.id).distance(v.id)
+
+    def path(self, u: Node, v: Node) -> List[Node]:
+        """Shortest road path including both ends ([] if none exists)."""
+        return [self.nodes[i] for i in self._tree(u.id).path(v.id)]
+
+    @property
+    def graph(self) -> RoadGraph:
+        """
+        The current network as a RoadGraph, for replanning with the greedy strategies.
+
+        The snapshot is kept until the next road change; fee and tip
+        changes are written into its node arrays directly.
+        """
+        if self._snapshot is None:
+            order = list(self.nodes)
+            index = {node_id: i for i, node_id in enumerate(order)}
+            offsets, targets = [0], []
+            for node_id in order:
+                targets.extend(index[j] for j in self._roads[node_id])
+                offsets.append(len(targets))
+            self._snapshot = RoadGraph.from_csr([self.nodes[i] for i in order], offsets, targets)
+            NodeArrays.for_graph(self._snapshot)
+        return self._snapshot
+
+    @property
+    def cached_trees(self) -> int:
+        """Number of shortest-path trees currently cached."""
+        return len(self._trees)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def num_edges(self) -> int:
+        return sum(len(roads) for roads in self._roads.values()) // 2
+
+    def __repr__(self):
+        return f"RoadNetwork({len(self.nodes)} nodes, {self.num_edges} roads, version {self.version})"
+
+    # ------------------------------------------------------------------
+    # In-flight routes
+    # ------------------------------------------------------------------
+
+    def track(self, key: Hashable, route: List[Node], driven: int = 1):
+        """
+        Watch a route being driven.
+
+        Args:
+            key (Hashable): Name for the route (e.g. a vehicle id)
+            route (List[Node]): The planned route, starting at the depot
+            driven (int): Leading stops already reached (at least the depot)
+        """
+        self.untrack(key)
+        self._tracked[key] = (list(route), max(1, driven))
+        for a, b in self._remaining_hops(key):
+            users = self._hop_users.setdefault(_hop_key(a.id, b.id), {})
+            users[key] = users.get(key, 0) + 1
+
+    def advance(self, key: Hashable, stops: int = 1):
+        """Record that the driver reached the next stops of a tracked route."""
+        route, driven = self._tracked[key]
+        new_driven = min(len(route), driven + stops)
+        for a, b in zip(route[driven - 1:new_driven - 1], route[driven:new_driven]):
+            self._forget_hop(key, a, b)
+        self._tracked[key] = (route, new_driven)
+
+    def untrack(self, key: Hashable):
+        """Stop watching a route."""
+        if key in self._tracked:
+            for a, b in self._remaining_hops(key):
+                self._forget_hop(key, a, b)
+            del self._tracked[key]
+
+    def _remaining_hops(self, key: Hashable) -> List[Tuple[Node, Node]]:
+        route, driven = self._tracked[key]
+        return list(zip(route[driven - 1:], route[driven:]))
+
+    def _forget_hop(self, key: Hashable, a: Node, b: Node):
+        hop = _hop_key(a.id, b.id)
+        users = self._hop_users[hop]
+        users[key] -= 1
+        if not users[key]:
+            del users[key]
+            if not users:
+                del self._hop_users[hop]
+
+    def impact(self, key: Hashable, straight_return: bool = True) -> RouteImpact:
+        """
+        Check the remaining part of a tracked route against the current roads.
+
+        Args:
+            key (Hashable): The tracked route
+            straight_return (bool): Accept a final hop back to the depot
+                without a road (routes built without recovery end that way)
+
+        Returns:
+            RouteImpact: Broken hops, unreachable stops and stops to replan
+        """
+        route, driven = self._tracked[key]
+        depot = route[0]
+        current = route[driven - 1]
+        remaining = route[driven:]
+        broken, first_broken = [], len(remaining)
+        for p, (a, b) in enumerate(zip(route[driven - 1:], remaining)):
+            closing = p == len(remaining) - 1 and b.id == depot.id
+            if not self.has_road(a, b) and not (closing and straight_return):
+                broken.append((a, b))
+                first_broken = min(first_broken, p)
+        tree = self._tree(current.id)
+        unreachable, seen = [], set()
+        for node in remaining:
+            if node.id not in seen and node.id != depot.id:
+                seen.add(node.id)
+                if tree.distance(node.id) == float("inf"):
+                    unreachable.append(node)
+        replan = list({node.id: node for node in remaining[first_broken:]
+                       if node.id != depot.id}.values())
+        return RouteImpact(broken, unreachable, replan)
+
+
+def _hop_key(a: int, b: int) -> Tuple[int, int]:
+    return (a, b) if a < b else (b, a)
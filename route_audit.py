@@ -0,0 +1,317 @@
+"""
+Greedy Algorithm Assignment - Bulk Route Audit
+
+_route_cost sums straight-line hop costs and never asks whether a road
+joins two consecutive stops; every strategy's final drive back to the
+depot is a straight line whether or not there is a road. This module
+checks and scores many finished routes at once, e.g. a day's dispatches.
+
+EdgeSet is a hashed index of a graph's roads: every undirected road is
+one 64-bit pair key in an open-addressing table, so checking a batch of
+hops is a few vectorized probes instead of a neighbor scan per hop.
+audit_routes() flattens all routes into one stop array and computes each
+route's columns (travel cost, profit, driver earnings, longest hop,
+invalid hops, ...) with NumPy reductions over it.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from main import Node, Edge, RoadGraph, as_road_graph
+from greedy_engine import NodeArrays
+from travel_costs import TravelCosts, node_column
+
+_EMPTY = -1
+# Multiplier of the multiplicative hash (2^64 / golden ratio, odd)
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+class EdgeSet:
+    """
+    Hashed set of a graph's roads, queried in batches.
+
+    Each road {a, b} is stored once under the key min(a, b) * n + max(a, b)
+    in a linear-probing table at most half full.
+
+    Attributes:
+        size (int): Number of nodes the keys are built for
+        table (np.ndarray): Slots holding pair keys, or -1 when empty
+    """
+
+    def __init__(self, graph: RoadGraph):
+        self.size = len(graph)
+        offsets = np.array(graph.offsets, dtype=np.intp)
+        targets = np.array(graph.targets, dtype=np.intp)
+        sources = np.repeat(np.arange(self.size, dtype=np.intp), np.diff(offsets))
+        once = sources < targets
+        keys = sources[once].astype(np.int64) * self.size + targets[once]
+        slots = 1 << max(4, int(2 * len(keys)).bit_length())
+        self._shift = np.uint64(64 - (slots.bit_length() - 1))
+        self._mask = slots - 1
+        self.table = np.full(slots, _EMPTY, dtype=np.int64)
+        self._count = len(keys)
+
+        # Insert in rounds: each round, one pending key claims every free slot it probes
+        pending, slot = keys, self._hash(keys)
+        while len(pending):
+            free = np.flatnonzero(self.table[slot] == _EMPTY)
+            _, first = np.unique(slot[free], return_index=True)
+            won = free[first]
+            self.table[slot[won]] = pending[won]
+            lost = np.ones(len(pending), dtype=bool)
+            lost[won] = False
+            pending, slot = pending[lost], (slot[lost] + 1) & self._mask
+
+    @classmethod
+    def for_graph(cls, graph: RoadGraph) -> "EdgeSet":
+        """
+        Return the edge set for a graph, building it on first use.
+
+        The set is kept in graph.derived, so every audit of the same
+        RoadGraph shares one build.
+        """
+        edges = graph.derived.get("edge_set")
+        if edges is None:
+            edges = cls(graph)
+            graph.derived["edge_set"] = edges
+        return edges
+
+    def _hash(self, keys: np.ndarray) -> np.ndarray:
+        return ((keys.astype(np.uint64) * _HASH_MULTIPLIER) >> self._shift).astype(np.intp)
+
+    def contains(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Whether a road joins each pair of nodes.
+
+        Args:
+            a (np.ndarray): Dense indices of one end
+            b (np.ndarray): Dense indices of the other end, same length
+
+        Returns:
+            np.ndarray: Boolean per pair (False for a == b)
+        """
+        a = np.asarray(a, dtype=np.int64)
+        b = np.asarray(b, dtype=np.int64)
+        keys = np.minimum(a, b) * self.size + np.maximum(a, b)
+        found = np.zeros(len(keys), dtype=bool)
+        active = np.flatnonzero(a != b)
+        slot = self._hash(keys)
+        while len(active):
+            stored = self.table[slot[active]]
+            hit = stored == keys[active]
+            found[active[hit]] = True
+            active = active[~hit & (stored != _EMPTY)]
+            slot[active] = (slot[active] + 1) & self._mask
+        return found
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self):
+        return f"EdgeSet({self._count} roads, {len(self.table)} slots)"
+
+
+class RouteAudit:
+    """
+    Validity and accounting of many routes.
+
+    Customer columns count each route's first visit to a customer; later
+    visits (driving through on a recovery path), depots and nodes outside
+    the route's customers mask earn nothing, the same accounting as the
+    strategies' totals. A hop that stays on the
+    same node is not a road but is not invalid either.
+
+    Attributes:
+        names (list): Route names (dict keys, or positions for a sequence)
+        table (Dict[str, np.ndarray]): One array per column, one entry per route:
+            stops, customers, fees, tips, travel_cost, profit (fees - travel),
+            earnings (fees + tips - travel), longest_hop, invalid_hops,
+            off_road_distance (length of the invalid hops), first_invalid
+            (position of the first invalid hop, -1 if none) and closed (the
+            route ends where it started)
+    """
+
+    def __init__(self, names: list, table: Dict[str, np.ndarray]):
+        self.names = names
+        self.table = table
+
+    @property
+    def valid(self) -> np.ndarray:
+        """True for routes whose every hop is a road."""
+        return self.table["invalid_hops"] == 0
+
+    def row(self, name) -> dict:
+        """One route's columns as a dict."""
+        i = self.names.index(name)
+        return {column: values[i].item() for column, values in self.table.items()}
+
+    def invalid(self) -> list:
+        """Names of the routes with at least one hop that is not a road."""
+        return [self.names[i] for i in np.flatnonzero(~self.valid)]
+
+    def totals(self) -> dict:
+        """Sum of each numeric column over all routes."""
+        return {column: values.sum().item() for column, values in self.table.items()
+                if column not in ("first_invalid", "closed")}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self):
+        return f"RouteAudit({len(self)} routes, {int((~self.valid).sum())} with invalid hops)"
+
+
+def _dense_indices(graph: RoadGraph, nodes: List[Node]) -> np.ndarray:
+    """Dense graph index of every node, looked up by id in one sorted search."""
+    if not nodes:
+        return np.zeros(0, dtype=np.intp)
+    version = graph.node_version("ids")
+    by_id = graph.derived.get("id_order")
+    if by_id is None or by_id[0] != version:
+        ids = node_column(graph.nodes, "ids", np.int64)
+        order = np.argsort(ids, kind="stable")
+        by_id = (version, ids[order], order)
+        graph.derived["id_order"] = by_id
+    _, sorted_ids, order = by_id
+    wanted = node_column(nodes, "ids", np.int64)
+    position = np.minimum(np.searchsorted(sorted_ids, wanted), len(sorted_ids) - 1)
+    missing = np.flatnonzero(sorted_ids[position] != wanted)
+    if len(missing):
+        raise KeyError(int(wanted[missing[0]]))
+    return order[position]
+
+
+def served_stops(size: int, everything: np.ndarray, owner: np.ndarray, names: list,
+                 customers: Union[np.ndarray, Dict[object, np.ndarray], Sequence[np.ndarray], None] = None
+                 ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The stops of a batch of routes flattened into one array.
+
+    A route stops at the first visit to every node but the one it starts
+    from, as greedy_route counts them; later visits are driving through.
+    Routes planned with a customers mask (fleet vehicles, multi-depot
+    plans) also drive through nodes they do not serve, which the same
+    masks leave out.
+
+    Args:
+        size (int): Nodes in the graph
+        everything (np.ndarray): Dense indices of every route's nodes, route after route
+        owner (np.ndarray): Route number of each entry of everything
+        names (list): Route names, by route number
+        customers (np.ndarray | dict | Sequence): Boolean mask by dense index
+            of the nodes a route may stop at, for every route, or one per
+            route by name or in route order (a None entry or a name left out
+            allows every node); None allows every node
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (route number, dense index) of every
+        stop, ordered by route and then by node
+    """
+    count = len(names)
+    pairs = np.unique(owner.astype(np.int64) * size + everything)
+    route_of, node_of = pairs // size, pairs % size
+    lengths = np.bincount(owner, minlength=count)
+    starts = np.cumsum(lengths) - lengths
+    start = np.full(count, -1, dtype=np.int64)
+    start[lengths > 0] = everything[starts[lengths > 0]]
+    keep = node_of != start[route_of]
+    if isinstance(customers, np.ndarray):
+        keep &= customers[node_of]
+    elif customers is not None:
+        masks = ((names.index(name), mask) for name, mask in customers.items()) \
+            if isinstance(customers, dict) else enumerate(customers)
+        for r, mask in masks:
+            if mask is not None:
+                mine = route_of == r
+                keep[mine] &= mask[node_of[mine]]
+    return route_of[keep], node_of[keep]
+
+
+def audit_routes(edges: Union[List[Edge], RoadGraph],
+                 routes: Union[Dict[object, Sequence], Sequence[Sequence]],
+                 nodes: Optional[List[Node]] = None,
+                 base_cost_per_mile: float = 0.50,
+                 customers: Union[np.ndarray, Dict[object, np.ndarray], Sequence[np.ndarray], None] = None
+                 ) -> RouteAudit:
+    """
+    Validate and score a batch of routes against the road network.
+
+    Customers are counted as served_stops() finds them.
+
+    Args:
+        edges (List[Edge] | RoadGraph): Road connections, or their index
+        routes (dict | Sequence): Routes by name, or a sequence of routes;
+            each route is a list of Nodes or an array of dense node indices
+        nodes (List[Node]): Optional nodes to index along with the edges
+        base_cost_per_mile (float): Cost per unit distance
+        customers (np.ndarray | dict | Sequence): Boolean mask by dense index
+            of the nodes a route may stop at, for every route, or one per
+            route given like the routes (by name, or in route order; a None
+            entry or a name left out counts every customer); None counts
+            every customer
+
+    Returns:
+        RouteAudit: Per-route columns
+    """
+    graph = as_road_graph(edges, nodes)
+    travel = TravelCosts.for_graph(graph, base_cost_per_mile)
+    arrays = NodeArrays.for_graph(graph)
+    names = list(routes) if isinstance(routes, dict) else list(range(len(routes)))
+    sequences = routes.values() if isinstance(routes, dict) else routes
+
+    lengths = np.fromiter((len(route) for route in sequences), dtype=np.intp, count=len(names))
+    count = len(names)
+    starts = np.cumsum(lengths) - lengths
+    # Node routes are translated to dense indices in one batch
+    given = [isinstance(route, np.ndarray) for route in sequences]
+    everything = np.empty(int(lengths.sum()), dtype=np.intp)
+    everything[np.repeat(np.logical_not(given), lengths)] = _dense_indices(
+        graph, [node for route, indexed in zip(sequences, given) if not indexed for node in route])
+    for route, indexed, start in zip(sequences, given, starts.tolist()):
+        if indexed:
+            everything[start:start + len(route)] = route
+    owner = np.repeat(np.arange(count), lengths)
+
+    # Hop i runs from stop i to stop i + 1; hops across two routes are dropped
+    same = owner[1:] == owner[:-1]
+    hop_owner = owner[1:][same]
+    a, b = everything[:-1][same], everything[1:][same]
+    hop_length = np.hypot(travel.x[a] - travel.x[b], travel.y[a] - travel.y[b])
+    bad = (a != b) & ~EdgeSet.for_graph(graph).contains(a, b)
+
+    longest = np.zeros(count)
+    np.maximum.at(longest, hop_owner, hop_length)
+    first_invalid = np.full(count, -1, dtype=np.intp)
+    bad_hops = np.flatnonzero(bad)
+    routes_with_bad, first = np.unique(hop_owner[bad_hops], return_index=True)
+    # Position within the route: the flat hop index minus the hops of earlier routes
+    hop_counts = np.maximum(lengths - 1, 0)
+    earlier_hops = np.cumsum(hop_counts) - hop_counts
+    first_invalid[routes_with_bad] = bad_hops[first] - earlier_hops[routes_with_bad]
+
+    route_of, node_of = served_stops(len(graph), everything, owner, names, customers)
+
+    travel_cost = np.bincount(hop_owner, weights=hop_length, minlength=count) * base_cost_per_mile
+    fees = np.bincount(route_of, weights=arrays.fees[node_of], minlength=count)
+    tips = np.bincount(route_of, weights=arrays.tips[node_of], minlength=count)
+    closed = np.zeros(count, dtype=bool)
+    nonempty = lengths > 0
+    closed[nonempty] = everything[starts[nonempty]] == everything[starts[nonempty] + lengths[nonempty] - 1]
+
+    table = {
+        "stops": lengths,
+        "customers": np.bincount(route_of, minlength=count),
+        "fees": fees,
+        "tips": tips,
+        "travel_cost": travel_cost,
+        "profit": fees - travel_cost,
+        "earnings": fees + tips - travel_cost,
+        "longest_hop": longest,
+        "invalid_hops": np.bincount(hop_owner[bad_hops], minlength=count),
+        "off_road_distance": np.bincount(hop_owner, weights=np.where(bad, hop_length, 0.0),
+                                         minlength=count),
+        "first_invalid": first_invalid,
+        "closed": closed,
+    }
+    return RouteAudit(names, table)
@@ -0,0 +1,357 @@
+"""
+Greedy Algorithm Assignment - Route Result Cache
+
+Memoizes the greedy strategies. A request is identified by a fingerprint
+of the network (every node attribute and the set of roads), the strategy
+name, the depot and the strategy parameters, and the cache stores the
+resulting (route ids, total). The same question asked again, even with a
+freshly built node or edge list, is answered without routing.
+
+An edge list is indexed into a RoadGraph once per list object and kept
+with the last few lists seen. Asking again with the same list only
+digests the node ids of its roads, to catch roads replaced in place,
+and reuses the graph's fingerprint instead of hashing every node
+attribute again; pass a RoadGraph to skip even that.
+
+The in-memory tier is an LRU bounded by entry count and, optionally, by
+approximate size in bytes. An optional SQLite file adds a second tier
+that survives restarts; entries evicted from memory stay on disk.
+"""
+
+import hashlib
+import json
+import sqlite3
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from main import Node, Edge, RoadGraph, as_road_graph
+from greedy_approach import greedy_company_route, greedy_driver_route, greedy_ethical_route
+from travel_costs import common_store, node_column
+
+STRATEGIES = {
+    "company": greedy_company_route,
+    "driver": greedy_driver_route,
+    "ethical": greedy_ethical_route,
+}
+
+# Approximate bookkeeping bytes per cached entry, on top of 8 per route stop
+_ENTRY_OVERHEAD = 200
+# Edge lists kept indexed by identity, most recently used last
+_INDEXED_LISTS = 8
+
+
+def graph_fingerprint(edges: Union[List[Edge], RoadGraph], nodes: Optional[List[Node]] = None) -> str:
+    """
+    Stable hash of a network's nodes and roads.
+
+    Two inputs get the same fingerprint when they have the same nodes (by
+    id, with the same coordinates, fees, tips, priority, depot flag and
+    region) and the same set of roads, regardless of list order, duplicate
+    roads or which Python objects hold the data.
+
+    A RoadGraph's fingerprint is kept in graph.derived and hashed again
+    once any of its nodes has changed.
+
+    Args:
+        edges (List[Edge] | RoadGraph): Road connections, or their index
+        nodes (List[Node]): Nodes listed alongside the edges, if any
+
+    Returns:
+        str: Hex digest
+    """
+    if isinstance(edges, RoadGraph):
+        version = edges.node_version()
+        cached = edges.derived.get("fingerprint")
+        if cached is None or cached[0] != version:
+            cached = (version, _hash_network(edges, nodes))
+            edges.derived["fingerprint"] = cached
+        return cached[1]
+    return _hash_network(edges, nodes)
+
+
+def _hash_network(edges: Union[List[Edge], RoadGraph], nodes: Optional[List[Node]]) -> str:
+    if isinstance(edges, RoadGraph):
+        members = edges.nodes
+        row_ids = node_column(members, "ids", np.int64)
+        offsets = np.asarray(edges.offsets, dtype=np.intp)
+        sources = np.repeat(row_ids, np.diff(offsets))
+        targets = row_ids[np.asarray(edges.targets, dtype=np.intp)]
+    else:
+        unique: Dict[int, Node] = {}
+        for node in nodes or []:
+            unique.setdefault(node.id, node)
+        for edge in edges:
+            unique.setdefault(edge.u.id, edge.u)
+            unique.setdefault(edge.v.id, edge.v)
+        members = list(unique.values())
+        sources = np.fromiter((edge.u.id for edge in edges), dtype=np.int64, count=len(edges))
+        targets = np.fromiter((edge.v.id for edge in edges), dtype=np.int64, count=len(edges))
+
+    digest = hashlib.blake2b(digest_size=16)
+    ids = node_column(members, "ids", np.int64)
+    order = np.argsort(ids, kind="stable")
+    digest.update(ids[order].tobytes())
+    for name, dtype in (("x", np.float64), ("y", np.float64), ("delivery_fee", np.float64),
+                        ("estimated_tip", np.float64), ("priority", np.int8), ("is_depot", np.int8)):
+        digest.update(node_column(members, name, dtype)[order].tobytes())
+    names, codes = _region_codes(members)
+    digest.update("\0".join(names).encode("utf-8"))
+    digest.update(codes[order].tobytes())
+
+    low, high = np.minimum(sources, targets), np.maximum(sources, targets)
+    keep = low != high
+    low, high = low[keep], high[keep]
+    if len(low) and low.min() >= 0 and high.max() < 2 ** 31:
+        # Both ids fit in one int64, and sorting one key is much faster than lexsort
+        keys = np.sort((low << 31) | high)
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+        low, high = keys >> 31, keys & (2 ** 31 - 1)
+    else:
+        order = np.lexsort((high, low))
+        low, high = low[order], high[order]
+        first = np.ones(len(low), dtype=bool)
+        first[1:] = (low[1:] != low[:-1]) | (high[1:] != high[:-1])
+        low, high = low[first], high[first]
+    digest.update(low.astype(np.int64).tobytes())
+    digest.update(high.astype(np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def _listed_ids(edges: List[Edge], nodes: Optional[List[Node]]) -> bytes:
+    """Digest of the (u.id, v.id) pair of every edge and the id of every node, in list order."""
+    ids = np.fromiter((node.id for edge in edges for node in (edge.u, edge.v)),
+                      dtype=np.int64, count=2 * len(edges))
+    digest = hashlib.blake2b(ids.tobytes(), digest_size=16)
+    if nodes is not None:
+        digest.update(b"\0")
+        digest.update(node_column(nodes, "ids", np.int64).tobytes())
+    return digest.digest()
+
+
+def _region_codes(members) -> Tuple[List[str], np.ndarray]:
+    """Sorted region names and each node's position in that list."""
+    store = common_store(members)
+    if store is not None:
+        names = sorted(store.regions)
+        rank = np.array([names.index(name) for name in store.regions] or [0], dtype=np.int64)
+        return names, rank[node_column(members, "region_code", np.uint16).astype(np.intp)]
+    regions = [node.region for node in members]
+    names = sorted(set(regions))
+    rank = {name: i for i, name in enumerate(names)}
+    return names, np.array([rank[name] for name in regions], dtype=np.int64)
+
+
+def _canonical(value):
+    """
+    Parameters in a form that compares and hashes stably.
+
+    None, bools, ints, strings and floats (rounded to 12 significant
+    digits) are accepted, and so are lists, tuples and dicts with string
+    keys made of them; tuples become lists and dicts sorted pairs.
+
+    Raises:
+        TypeError: For any other value (e.g. a TimeCosts model)
+    """
+    if isinstance(value, float):
+        return float(f"{value:.12g}")
+    if isinstance(value, (bool, int, str)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict) and all(isinstance(name, str) for name in value):
+        return sorted([name, _canonical(item)] for name, item in value.items())
+    raise TypeError(f"cannot cache on parameter value {value!r}")
+
+
+class RouteCache:
+    """
+    Bounded cache of greedy routes with an optional on-disk tier.
+
+    Attributes:
+        max_entries (int): Entries kept in memory
+        max_bytes (int): Approximate memory budget, or None for no limit
+        hits (int): Requests answered from memory
+        disk_hits (int): Requests answered from the disk tier
+        misses (int): Requests that had to be routed
+        evictions (int): Entries dropped from memory
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None,
+                 disk_path: Optional[str] = None):
+        """
+        Args:
+            max_entries (int): Entries kept in memory
+            max_bytes (int): Approximate memory budget for cached routes
+            disk_path (str): SQLite file for the persistent tier, or None
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[array, float]]" = OrderedDict()
+        self._bytes = 0
+        self._indexed: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._db = None
+        if disk_path is not None:
+            self._db = sqlite3.connect(disk_path)
+            self._db.execute("CREATE TABLE IF NOT EXISTS routes "
+                             "(key TEXT PRIMARY KEY, route BLOB NOT NULL, total REAL NOT NULL)")
+            self._db.commit()
+
+    @staticmethod
+    def key(fingerprint: str, strategy: str, depot: Node, params: dict) -> str:
+        """
+        Cache key for one request.
+
+        Raises:
+            TypeError: If a parameter value is not one _canonical accepts
+        """
+        canonical = sorted((name, _canonical(value)) for name, value in params.items())
+        return json.dumps([fingerprint, strategy, depot.id, canonical])
+
+    def get(self, key: str) -> Optional[Tuple[array, float]]:
+        """Cached (route ids, total) for a key, or None."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+        if self._db is not None:
+            row = self._db.execute("SELECT route, total FROM routes WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                ids = array("q")
+                ids.frombytes(row[0])
+                entry = (ids, row[1])
+                self._remember(key, entry)
+                return entry
+        self.misses += 1
+        return None
+
+    def put(self, key: str, route_ids: List[int], total: float):
+        """Store a result in memory and, if enabled, on disk."""
+        entry = (array("q", route_ids), float(total))
+        self._remember(key, entry)
+        if self._db is not None:
+            self._db.execute("INSERT OR REPLACE INTO routes VALUES (?, ?, ?)",
+                             (key, entry[0].tobytes(), entry[1]))
+            self._db.commit()
+
+    def _remember(self, key: str, entry: Tuple[array, float]):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= _entry_bytes(old)
+        self._entries[key] = entry
+        self._bytes += _entry_bytes(entry)
+        while self._entries and (len(self._entries) > self.max_entries or
+                                 (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            _, dropped = self._entries.popitem(last=False)
+            self._bytes -= _entry_bytes(dropped)
+            self.evictions += 1
+
+    def route(self, strategy: str, nodes: List[Node], depot: Node,
+              edges: Union[List[Edge], RoadGraph], fingerprint: Optional[str] = None,
+              **params) -> Tuple[List[Node], float]:
+        """
+        Cached equivalent of calling one of the greedy strategies.
+
+        Args:
+            strategy (str): "company", "driver" or "ethical"
+            nodes (List[Node]): As for the strategy
+            depot (Node): As for the strategy
+            edges (List[Edge] | RoadGraph): As for the strategy
+            fingerprint (str): graph_fingerprint(edges, nodes), if the caller
+                already knows it (skips hashing an edge list, which must not
+                have changed since; a RoadGraph's is checked against its own)
+            **params: Strategy keyword arguments (e.g. long_hop_threshold,
+                recover): None, bools, numbers, strings, and lists, tuples
+                and string-keyed dicts of those
+
+        Returns:
+            Tuple[List[Node], float]: (route, total), as the strategy returns them
+
+        Raises:
+            TypeError: If a parameter cannot be part of a cache key
+        """
+        if isinstance(edges, RoadGraph):
+            graph = edges
+        elif fingerprint is None:
+            graph = self._indexed_graph(edges, nodes)
+        else:
+            graph = None
+        if graph is not None:
+            # Hashed from the same node version the route below is computed at
+            current = graph_fingerprint(graph)
+            if fingerprint is not None and fingerprint != current:
+                raise ValueError("fingerprint does not match the graph's current nodes")
+            fingerprint = current
+        key = self.key(fingerprint, strategy, depot, params)
+        entry = self.get(key)
+        if entry is None:
+            route, total = STRATEGIES[strategy](nodes, depot, graph if graph is not None else edges,
+                                                **params)
+            self.put(key, [node.id for node in route], total)
+            return route, total
+        by_id = graph if graph is not None else _nodes_by_id(nodes, edges)
+        return [by_id[node_id] for node_id in entry[0]], entry[1]
+
+    def _indexed_graph(self, edges: List[Edge], nodes: Optional[List[Node]]) -> RoadGraph:
+        """
+        RoadGraph of an edge list, built once per list object.
+
+        The lists are kept alongside the graph, so their ids stay theirs,
+        together with a digest of the node ids they list; a list whose
+        roads or nodes have changed since is indexed again. Node attribute
+        changes are caught by the graph's fingerprint.
+        """
+        key = (id(edges), id(nodes))
+        listed = _listed_ids(edges, nodes)
+        entry = self._indexed.get(key)
+        if entry is None or entry[2] != listed:
+            entry = (edges, nodes, listed, as_road_graph(edges, nodes))
+            self._indexed[key] = entry
+            while len(self._indexed) > _INDEXED_LISTS:
+                self._indexed.popitem(last=False)
+        self._indexed.move_to_end(key)
+        return entry[3]
+
+    def stats(self) -> dict:
+        """Counters and current size."""
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "evictions": self.evictions, "entries": len(self._entries), "bytes": self._bytes}
+
+    def clear(self):
+        """Drop every in-memory entry and indexed edge list (the disk tier is kept)."""
+        self._entries.clear()
+        self._indexed.clear()
+        self._bytes = 0
+
+    def close(self):
+        """Close the disk tier."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _entry_bytes(entry: Tuple[array, float]) -> int:
+    return _ENTRY_OVERHEAD + entry[0].itemsize * len(entry[0])
+
+
+def _nodes_by_id(nodes: List[Node], edges: Union[List[Edge], RoadGraph]):
+    if isinstance(edges, RoadGraph):
+        return edges
+    by_id: Dict[int, Node] = {}
+    for node in nodes or []:
+        by_id.setdefault(node.id, node)
+    for edge in edges:
+        by_id.setdefault(edge.u.id, edge.u)
+        by_id.setdefault(edge.v.id, edge.v)
+    return by_id
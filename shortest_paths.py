@@ -0,0 +1,167 @@
+"""
+Greedy Algorithm Assignment - Cached Shortest Paths
+
+Lazily expanded single-source Dijkstra trees over a RoadGraph. A tree
+settles nodes only as far out as a caller asks for, remembers how far it
+got, and resumes from there on the next request. Trees are cached per
+source on the graph (in graph.derived), so every step and every strategy
+routed on the same RoadGraph shares them.
+"""
+
+import heapq
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from main import RoadGraph
+from travel_costs import TravelCosts
+
+
+class ShortestPathTree:
+    """
+    Single-source Dijkstra tree that is expanded on demand.
+
+    Attributes:
+        source (int): Dense index of the source node
+        order (List[int]): Settled nodes in non-decreasing distance order
+        dist (Dict[int, float]): Road distance of each settled node
+        parent (Dict[int, int]): Predecessor of each settled node (source excluded)
+    """
+
+    def __init__(self, source: int, offsets, targets: List[int], lengths: List[float]):
+        self.source = source
+        self._offsets = offsets
+        self._targets = targets
+        self._lengths = lengths
+        self.order: List[int] = []
+        self.dist: Dict[int, float] = {}
+        self.parent: Dict[int, int] = {}
+        self._tentative: Dict[int, Tuple[float, int]] = {source: (0.0, -1)}
+        self._heap: List[Tuple[float, int]] = [(0.0, source)]
+
+    @property
+    def complete(self) -> bool:
+        """True once every reachable node has been settled."""
+        return not self._heap
+
+    def _settle_next(self) -> Optional[int]:
+        heap = self._heap
+        while heap:
+            d, v = heapq.heappop(heap)
+            if v in self.dist:
+                continue
+            best_d, via = self._tentative[v]
+            if d > best_d:
+                continue
+            del self._tentative[v]
+            self.dist[v] = d
+            if via >= 0:
+                self.parent[v] = via
+            self.order.append(v)
+            targets, lengths = self._targets, self._lengths
+            for slot in range(self._offsets[v], self._offsets[v + 1]):
+                w = targets[slot]
+                if w in self.dist:
+                    continue
+                nd = d + lengths[slot]
+                old = self._tentative.get(w)
+                if old is None or nd < old[0]:
+                    self._tentative[w] = (nd, v)
+                    heapq.heappush(heap, (nd, w))
+            return v
+        return None
+
+    def settled(self) -> Iterator[Tuple[int, float]]:
+        """
+        Yield (node, distance) in distance order, expanding the tree as needed.
+
+        Nodes settled by earlier calls are replayed first, so a caller that
+        stops early leaves the rest of the work for whoever needs it next.
+        """
+        i = 0
+        while True:
+            if i < len(self.order):
+                v = self.order[i]
+                yield v, self.dist[v]
+                i += 1
+            elif self._settle_next() is None:
+                return
+
+    def distance(self, target: int) -> float:
+        """Road distance to target, or inf if it cannot be reached."""
+        while target not in self.dist:
+            if self._settle_next() is None:
+                return float("inf")
+        return self.dist[target]
+
+    def path(self, target: int) -> List[int]:
+        """
+        Dense indices along the shortest road path from the source to target.
+
+        Returns:
+            List[int]: Path including both ends, or [] if target is unreachable
+        """
+        if self.distance(target) == float("inf"):
+            return []
+        path = [target]
+        while path[-1] != self.source:
+            path.append(self.parent[path[-1]])
+        path.reverse()
+        return path
+
+
+class ShortestPathCache:
+    """
+    LRU cache of lazily expanded shortest-path trees, one per source node.
+
+    Attributes:
+        graph (RoadGraph): The road network
+        max_trees (int): Number of trees kept before the least recently used is dropped
+        hits (int): Requests served by a cached tree
+        misses (int): Requests that started a new tree
+        node_version (int): graph.node_version of the coordinates the lengths came from
+    """
+
+    def __init__(self, graph: RoadGraph, max_trees: int = 256):
+        self.graph = graph
+        self.max_trees = max_trees
+        self.hits = 0
+        self.misses = 0
+        self._targets = graph.targets.tolist()
+        travel = TravelCosts.for_graph(graph)
+        self.node_version = travel.node_version
+        self._lengths = travel.lengths.tolist()
+        self._trees: "OrderedDict[int, ShortestPathTree]" = OrderedDict()
+
+    @classmethod
+    def for_graph(cls, graph: RoadGraph) -> "ShortestPathCache":
+        """Return the graph's shared cache, creating it again if a node has moved since."""
+        cache = graph.derived.get("shortest_paths")
+        if cache is None or cache.node_version != graph.node_version(*TravelCosts.COLUMNS):
+            cache = cls(graph)
+            graph.derived["shortest_paths"] = cache
+        return cache
+
+    def tree(self, source: int) -> ShortestPathTree:
+        """Return the (possibly partial) tree rooted at dense index source."""
+        tree = self._trees.get(source)
+        if tree is not None:
+            self.hits += 1
+            self._trees.move_to_end(source)
+            return tree
+        self.misses += 1
+        tree = ShortestPathTree(source, self.graph.offsets, self._targets, self._lengths)
+        self._trees[source] = tree
+        if len(self._trees) > self.max_trees:
+            self._trees.popitem(last=False)
+        return tree
+
+    def distance(self, source: int, target: int) -> float:
+        """Road distance between two dense indices (inf if disconnected)."""
+        return self.tree(source).distance(target)
+
+    def path(self, source: int, target: int) -> List[int]:
+        """Shortest road path between two dense indices ([] if disconnected)."""
+        return self.tree(source).path(target)
+
+    def __len__(self) -> int:
+        return len(self._trees)
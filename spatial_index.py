@@ -0,0 +1,270 @@
+"""
+Greedy Algorithm Assignment - Spatial Index for Implicit Road Networks
+
+In dense areas it is simpler to treat every pair of customers within a
+radius as joined by a straight road than to list those roads as Edge
+objects. SpatialIndex buckets node coordinates into a uniform grid so
+that "which unvisited customers lie within r" and "which k customers are
+worth the most after the drive" touch only nearby cells. Visited nodes
+are removed as the route goes; the grid is compacted once half of its
+entries are gone, so queries never wade through many dead slots.
+
+spatial_greedy_route() is the greedy loop with the index as its
+candidate generator: the frontier at each step is every unvisited
+customer within the radius, scored and filtered by the same Objective
+classes as greedy_route (so FatigueEarnings applies the ethical
+short_hop_limit to those straight-line hops). The strategies in
+greedy_approach.py use it when given a radius.
+"""
+
+import math
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from main import Node, RoadGraph
+from greedy_engine import NodeArrays, Objective, RouteState
+from travel_costs import TravelCosts
+
+# Cells per indexed point above which the cell size is increased
+_MAX_CELLS_PER_POINT = 4
+# Candidates rescored with the objective at a dead end, when it adds bonuses
+_RECOVERY_POOL = 16
+
+
+class SpatialIndex:
+    """
+    Uniform grid over point coordinates with deletion.
+
+    Points are kept sorted by cell, column by column, so the cells of one
+    grid column that a query overlaps form a single slice.
+
+    Attributes:
+        x (np.ndarray): X-coordinates by point index
+        y (np.ndarray): Y-coordinates by point index
+        cell (float): Side of a grid cell
+        alive (np.ndarray): True for points still in the index
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, cell: float,
+                 members: Optional[np.ndarray] = None):
+        """
+        Args:
+            x (np.ndarray): X-coordinates by point index
+            y (np.ndarray): Y-coordinates by point index
+            cell (float): Preferred cell side, usually the query radius (it
+                is enlarged if the grid would have far more cells than points)
+            members (np.ndarray): Indices of the points to index (default: all)
+        """
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        if members is None:
+            members = np.arange(len(self.x), dtype=np.intp)
+        members = np.asarray(members, dtype=np.intp)
+        self.alive = np.zeros(len(self.x), dtype=bool)
+        self.alive[members] = True
+
+        if len(members):
+            self.x0, self.y0 = float(self.x[members].min()), float(self.y[members].min())
+            width = float(self.x[members].max()) - self.x0
+            height = float(self.y[members].max()) - self.y0
+        else:
+            self.x0 = self.y0 = width = height = 0.0
+        limit = _MAX_CELLS_PER_POINT * len(members) + 1024
+        cell = max(float(cell), math.sqrt(width * height / limit), 1e-9)
+        while (width // cell + 1) * (height // cell + 1) > limit:
+            cell *= 1.5
+        self.cell = cell
+        self.columns = int(width // cell) + 1
+        self.rows = int(height // cell) + 1
+        self.x1 = self.x0 + self.columns * cell
+        self.y1 = self.y0 + self.rows * cell
+        self._build(members)
+
+    @classmethod
+    def for_customers(cls, graph: RoadGraph, cell: float,
+                      customers: Optional[np.ndarray] = None) -> "SpatialIndex":
+        """
+        Index the nodes of a graph a route may stop at.
+
+        As in greedy_route, depots are not ruled out for being depots: pass
+        a mask without the starting depot (spatial_greedy_route passes its
+        unvisited nodes).
+
+        Args:
+            graph (RoadGraph): Nodes to index, by dense index (roads are ignored)
+            cell (float): Preferred cell side
+            customers (np.ndarray): Boolean mask by dense index of the nodes
+                to index; None indexes every node
+
+        Returns:
+            SpatialIndex: Index whose point indices are the graph's dense indices
+        """
+        travel = TravelCosts.for_graph(graph)
+        if customers is None:
+            return cls(travel.x, travel.y, cell)
+        return cls(travel.x, travel.y, cell, np.flatnonzero(customers))
+
+    def _build(self, members: np.ndarray):
+        cells = self._cell_of(members)
+        order = np.argsort(cells, kind="stable")
+        self.order = members[order]
+        self.starts = np.searchsorted(cells[order], np.arange(self.columns * self.rows + 1))
+        self._dead = 0
+
+    def _cell_of(self, members: np.ndarray) -> np.ndarray:
+        cx = np.minimum(((self.x[members] - self.x0) // self.cell).astype(np.intp), self.columns - 1)
+        cy = np.minimum(((self.y[members] - self.y0) // self.cell).astype(np.intp), self.rows - 1)
+        return cx * self.rows + cy
+
+    def remove(self, i: int):
+        """Take point i out of the index (e.g. once it has been visited)."""
+        if not self.alive[i]:
+            return
+        self.alive[i] = False
+        self._dead += 1
+        if self._dead > 64 and 2 * self._dead > len(self.order):
+            self._build(self.order[self.alive[self.order]])
+
+    def __len__(self) -> int:
+        return len(self.order) - self._dead
+
+    def __contains__(self, i: int) -> bool:
+        return bool(self.alive[i])
+
+    def within(self, x: float, y: float, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Points still in the index within radius of (x, y).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (point indices, distances), in
+            grid order
+        """
+        c0 = int(max((x - radius - self.x0) // self.cell, 0))
+        c1 = int(min((x + radius - self.x0) // self.cell, self.columns - 1))
+        r0 = int(max((y - radius - self.y0) // self.cell, 0))
+        r1 = int(min((y + radius - self.y0) // self.cell, self.rows - 1))
+        if c0 > c1 or r0 > r1:
+            return np.zeros(0, dtype=np.intp), np.zeros(0)
+        starts = self.starts
+        blocks = [self.order[starts[c * self.rows + r0]:starts[c * self.rows + r1 + 1]]
+                  for c in range(c0, c1 + 1)]
+        points = blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+        if self._dead:
+            points = points[self.alive[points]]
+        distances = np.hypot(self.x[points] - x, self.y[points] - y)
+        near = distances <= radius
+        return points[near], distances[near]
+
+    def top_k(self, x: float, y: float, k: int, values: np.ndarray, rate: float,
+              radius: float = math.inf, best_value: Optional[float] = None
+              ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The k points with the highest value minus distance * rate from (x, y).
+
+        The search radius doubles from one cell until the k-th best score
+        beats what any point farther out could reach (best_value minus the
+        cost of the distance searched so far).
+
+        Args:
+            x (float): Query x-coordinate
+            y (float): Query y-coordinate
+            k (int): Number of points wanted
+            values (np.ndarray): Value per point index (e.g. objective rewards)
+            rate (float): Cost per unit distance
+            radius (float): Ignore points farther than this
+            best_value (float): Upper bound on values over the indexed points;
+                pass it when querying repeatedly (default: computed)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (point indices, scores), best first;
+            fewer than k if fewer points are in range
+        """
+        if best_value is None:
+            alive = self.order[self.alive[self.order]]
+            best_value = float(values[alive].max()) if len(alive) else -math.inf
+        # Beyond this distance every indexed point has been seen
+        farthest = math.hypot(max(abs(x - self.x0), abs(x - self.x1)),
+                              max(abs(y - self.y0), abs(y - self.y1)))
+        reach = self.cell
+        while True:
+            points, distances = self.within(x, y, min(reach, radius))
+            scores = values[points] - distances * rate
+            if len(points) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                points, scores = points[top], scores[top]
+            order = np.argsort(-scores, kind="stable")
+            points, scores = points[order], scores[order]
+            if reach >= radius or reach >= farthest or \
+                    (len(points) == k and scores[-1] >= best_value - reach * rate):
+                return points, scores
+            reach *= 2
+
+
+# ============================================================================
+# GREEDY ROUTING OVER THE INDEX
+# ============================================================================
+
+def spatial_greedy_route(nodes: Union[List[Node], RoadGraph], depot: Node, objective: Objective,
+                         radius: float, recover: bool = False,
+                         customers: Optional[np.ndarray] = None) -> Tuple[List[Node], float]:
+    """
+    Build a route greedily, treating customers within radius as neighbors.
+
+    Every hop is a straight drive. At each step the unvisited customers
+    within radius of the current position are scored with the objective,
+    exactly as greedy_route scores road neighbors, and the best is taken.
+    As in greedy_route, only the starting depot is ruled out; other depots
+    are stops like any customer.
+    Without recover the route ends when none is in range; with recover it
+    continues to the best customer anywhere (reward minus straight-line
+    cost, plus the objective's bonus among the best few). The route ends
+    with a straight drive back to the depot.
+
+    Args:
+        nodes (List[Node] | RoadGraph): Delivery locations including the
+            depot; a RoadGraph's roads are ignored
+        depot (Node): The starting depot location
+        objective (Objective): Scoring rule (e.g. FatigueEarnings())
+        radius (float): Longest hop considered a road
+        recover (bool): Keep going past the radius until every customer is visited
+        customers (np.ndarray): Boolean mask by dense index of the nodes this
+            route may stop at; None allows all
+
+    Returns:
+        Tuple[List[Node], float]: (route as list of nodes, total reward - travel cost)
+    """
+    graph = nodes if isinstance(nodes, RoadGraph) else RoadGraph([], nodes)
+    travel = TravelCosts.for_graph(graph)
+    arrays = NodeArrays.for_graph(graph)
+    state = RouteState(graph, arrays, graph.index(depot))
+    if customers is not None:
+        state.visited |= ~customers
+    index = SpatialIndex.for_customers(graph, radius, ~state.visited)
+    rewards = objective.rewards(arrays)
+    best_reward = float(rewards.max()) if len(rewards) else 0.0
+    rate = travel.base_cost_per_mile
+    total = 0.0
+
+    while len(index):
+        x, y = travel.x[state.current], travel.y[state.current]
+        candidates, lengths = index.within(x, y, radius)
+        if not len(candidates):
+            if not recover:
+                break
+            pool = 1 if objective.bonus_bound == 0 else _RECOVERY_POOL
+            candidates, _ = index.top_k(x, y, pool, rewards, rate, best_value=best_reward)
+            lengths = np.hypot(travel.x[candidates] - x, travel.y[candidates] - y)
+        costs = lengths * rate
+        mask = objective.allowed(state, lengths, np.ones(len(candidates), dtype=bool))
+        scores = np.where(mask, objective.score(state, candidates, rewards, costs), -np.inf)
+        k = int(np.argmax(scores))
+        j = int(candidates[k])
+        total += float(rewards[j] - costs[k])
+        state.move(j, float(lengths[k]))
+        index.remove(j)
+
+    if state.current != state.depot:
+        total -= travel.cost(state.current, state.depot)
+        state.stops.append(state.depot)
+    return [graph.nodes[i] for i in state.stops], total
@@ -0,0 +1,156 @@
+"""
+Greedy Algorithm Assignment - Parameter Sweep for the Ethical Thresholds
+
+Tunes greedy_ethical_route's long_hop_threshold and short_hop_limit for a
+market by running many combinations and comparing each with the Part B
+driver-greedy baseline. Combinations come from a grid or from seeded
+random search, are spread over a GraphPool in batches, and share the
+graph's cost and node arrays (built once per process).
+
+Results come back as a columnar table (one NumPy array per metric) with
+the Pareto front of earnings against the longest hop driven.
+"""
+
+import itertools
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from main import Node, Edge, RoadGraph, as_road_graph
+from greedy_engine import DriverEarnings, FatigueEarnings, greedy_route
+from travel_costs import TravelCosts
+from worker_pool import GraphPool
+
+# Table columns, in order
+COLUMNS = ["long_hop_threshold", "short_hop_limit", "earnings", "delta", "stops",
+           "longest_hop", "mean_hop", "long_hops"]
+
+
+class SweepResult:
+    """
+    Outcome of a threshold sweep.
+
+    Attributes:
+        table (Dict[str, np.ndarray]): One array per column in COLUMNS, one row
+            per combination: the thresholds, earnings, delta (earnings minus
+            the driver-greedy baseline), stops (customers served), longest
+            and mean hop length, and long_hops (hops longer than the threshold)
+        baseline (float): Driver-greedy (Part B) earnings
+        pareto (np.ndarray): Rows on the Pareto front of high earnings and
+            short longest hop, ordered by longest hop
+    """
+
+    def __init__(self, table: Dict[str, np.ndarray], baseline: float):
+        self.table = table
+        self.baseline = baseline
+        self.pareto = pareto_front(table["earnings"], table["longest_hop"])
+
+    def row(self, i: int) -> dict:
+        """One combination's results as a dict."""
+        return {name: self.table[name][i].item() for name in COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.table["earnings"])
+
+    def __repr__(self):
+        return f"SweepResult({len(self)} combinations, {len(self.pareto)} on the Pareto front)"
+
+
+def pareto_front(earnings: np.ndarray, longest_hop: np.ndarray) -> np.ndarray:
+    """
+    Rows not dominated by any other row (higher-or-equal earnings with a
+    shorter-or-equal longest hop, better in at least one).
+
+    Returns:
+        np.ndarray: Row indices, ordered by longest hop; of several rows with
+        the same earnings and longest hop only the first is kept
+    """
+    order = np.lexsort((-earnings, longest_hop))
+    front = []
+    best = -np.inf
+    for i in order:
+        if earnings[i] > best:
+            front.append(i)
+            best = earnings[i]
+    return np.array(front, dtype=np.intp)
+
+
+def hop_lengths(graph: RoadGraph, stops: Sequence[int]) -> np.ndarray:
+    """Length of every hop of a route given as dense indices."""
+    travel = TravelCosts.for_graph(graph)
+    stops = np.asarray(stops, dtype=np.intp)
+    return np.hypot(np.diff(travel.x[stops]), np.diff(travel.y[stops]))
+
+
+def _run_batch(graph: RoadGraph, task) -> List[tuple]:
+    depot, recover, pairs = task
+    rows = []
+    for long_hop, short_hop in pairs:
+        route, total = greedy_route(graph, graph.nodes[depot], FatigueEarnings(long_hop, short_hop),
+                                    recover=recover)
+        stops = [graph.index(node) for node in route]
+        hops = hop_lengths(graph, stops)
+        served = len(set(stops)) - 1
+        rows.append((total, served,
+                     float(hops.max()) if len(hops) else 0.0,
+                     float(hops.mean()) if len(hops) else 0.0,
+                     int((hops > long_hop).sum())))
+    return rows
+
+
+def threshold_grid(long_hop_thresholds: Sequence[float],
+                   short_hop_limits: Sequence[float]) -> List[Tuple[float, float]]:
+    """Every (long_hop_threshold, short_hop_limit) combination."""
+    return list(itertools.product(long_hop_thresholds, short_hop_limits))
+
+
+def random_thresholds(samples: int, long_hop_range: Tuple[float, float],
+                      short_hop_range: Tuple[float, float], seed: int = 0) -> List[Tuple[float, float]]:
+    """Seeded uniform samples of (long_hop_threshold, short_hop_limit)."""
+    rng = np.random.default_rng(seed)
+    long_hops = rng.uniform(*long_hop_range, size=samples)
+    short_hops = rng.uniform(*short_hop_range, size=samples)
+    return list(zip(long_hops.tolist(), short_hops.tolist()))
+
+
+def sweep_thresholds(edges: Union[List[Edge], RoadGraph], depot: Node,
+                     combinations: Sequence[Tuple[float, float]],
+                     nodes: Optional[List[Node]] = None, recover: bool = False,
+                     workers: Optional[int] = None, batch: int = 32) -> SweepResult:
+    """
+    Run the ethical strategy for every threshold combination.
+
+    Args:
+        edges (List[Edge] | RoadGraph): Road connections, or their index
+        depot (Node): The starting depot location
+        combinations (Sequence[Tuple[float, float]]): (long_hop_threshold,
+            short_hop_limit) pairs, e.g. from threshold_grid or random_thresholds
+        nodes (List[Node]): Optional nodes to index along with the edges
+        recover (bool): Use dead-end recovery (for the baseline too)
+        workers (int): Worker processes (default: one per available CPU)
+        batch (int): Combinations per task
+
+    Returns:
+        SweepResult: Columnar results with the Pareto front
+    """
+    graph = as_road_graph(edges, nodes)
+    d = graph.index(depot)
+    _, baseline = greedy_route(graph, depot, DriverEarnings(), recover=recover)
+    pairs = [(float(a), float(b)) for a, b in combinations]
+    tasks = [(d, recover, pairs[i:i + batch]) for i in range(0, len(pairs), batch)]
+    with GraphPool(graph, workers) as pool:
+        rows = [row for chunk in pool.map(_run_batch, tasks) for row in chunk]
+
+    earnings, stops, longest, mean, long_hops = (np.array(column) for column in zip(*rows)) \
+        if rows else (np.zeros(0),) * 5
+    table = {
+        "long_hop_threshold": np.array([a for a, _ in pairs], dtype=np.float64),
+        "short_hop_limit": np.array([b for _, b in pairs], dtype=np.float64),
+        "earnings": earnings.astype(np.float64),
+        "delta": earnings.astype(np.float64) - baseline,
+        "stops": stops.astype(np.intp),
+        "longest_hop": longest.astype(np.float64),
+        "mean_hop": mean.astype(np.float64),
+        "long_hops": long_hops.astype(np.intp),
+    }
+    return SweepResult(table, baseline)
@@ -0,0 +1,295 @@
+"""
+Synthetic Road Networks - Seeded Instance Generator
+
+Builds clustered, road-like delivery instances of any size, from a few
+hundred nodes to millions, for benchmarking the greedy algorithms.
+
+Customers are grouped around towns of varying size with a sprinkling of
+scattered rural addresses. Each node is labeled downtown, suburban or
+rural by how far it sits from its town center. Fees, tips and priorities
+are drawn per region. Roads join every node to its nearest neighbors, and
+a highway tree joins the town centers, so the network is sparse, mostly
+planar and locally connected, like the hand-built Minnesota data.
+
+The same (n, seed) always gives the same instance.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from main import Node, NodeStore, Edge, RoadGraph
+from travel_costs import typed_array
+
+REGIONS = ["downtown", "suburban", "rural"]
+
+# Per-region (fee mean, fee std, tip mean) in dollars
+_FEES = {"downtown": (11.0, 1.0, 3.5), "suburban": (12.0, 1.2, 3.0), "rural": (15.0, 1.5, 2.2)}
+_PRIORITY_WEIGHTS = [0.1, 0.2, 0.4, 0.2, 0.1]
+
+
+class SyntheticInstance:
+    """
+    A generated delivery instance.
+
+    Attributes:
+        nodes (NodeStore): All nodes; node ids equal their row numbers
+        depot (Node): The depot (row 0, at the center of the largest town)
+        graph (RoadGraph): Indexed road network over nodes
+        road_pairs (np.ndarray): (E, 2) array of road endpoints by row, each road once
+        seed (int): Seed the instance was generated from
+    """
+
+    def __init__(self, nodes: NodeStore, road_pairs: np.ndarray, seed: int):
+        self.nodes = nodes
+        self.depot = nodes[0]
+        self.road_pairs = road_pairs
+        self.seed = seed
+        offsets, targets = _csr(len(nodes), road_pairs)
+        self.graph = RoadGraph.from_csr(nodes, typed_array(offsets, "l"), typed_array(targets, "l"))
+
+    def edges(self) -> List[Edge]:
+        """Materialize the roads as Edge objects (for APIs that take an edge list)."""
+        nodes = self.nodes
+        return [Edge(nodes[a], nodes[b]) for a, b in self.road_pairs.tolist()]
+
+    def node_list(self) -> List[Node]:
+        """Materialize every node as a Node view."""
+        return list(self.nodes)
+
+    def __repr__(self):
+        return f"SyntheticInstance({len(self.nodes)} nodes, {len(self.road_pairs)} roads, seed={self.seed})"
+
+
+def generate_instance(n: int, seed: int = 0, town_size: int = 500,
+                      neighbors: int = 3, rural_share: float = 0.15) -> SyntheticInstance:
+    """
+    Generate a clustered, road-like delivery instance.
+
+    Args:
+        n (int): Number of nodes, depot included (at least 2)
+        seed (int): Random seed; equal seeds give identical instances
+        town_size (int): Average number of customers per town
+        neighbors (int): Roads each node gets to its nearest neighbors
+        rural_share (float): Share of customers scattered outside towns
+
+    Returns:
+        SyntheticInstance: Nodes, depot and road network
+    """
+    if n < 2:
+        raise ValueError("n must be at least 2")
+    rng = np.random.default_rng(seed)
+    side = 2.0 * np.sqrt(n)
+
+    towns = max(1, n // town_size)
+    centers = rng.uniform(0.0, side, size=(towns, 2))
+    weights = rng.gamma(2.0, 1.0, size=towns)
+    weights /= weights.sum()
+    town_of = rng.choice(towns, size=n, p=weights)
+    town_of[0] = int(np.argmax(weights))
+    # The first customer of every town sits at its center, as a highway anchor
+    anchors = np.full(towns, -1, dtype=np.intp)
+    first = np.unique(town_of[1:], return_index=True)
+    anchors[first[0]] = first[1] + 1
+    anchors[town_of[0]] = 0
+
+    members = np.bincount(town_of, minlength=towns)
+    spread = 0.6 * np.sqrt(np.maximum(members, 1))[town_of]
+    xy = centers[town_of] + rng.normal(0.0, 1.0, size=(n, 2)) * spread[:, None]
+    scattered = rng.random(n) < rural_share
+    scattered[anchors[anchors >= 0]] = False
+    xy[scattered] = rng.uniform(0.0, side, size=(int(scattered.sum()), 2))
+    placed = anchors[anchors >= 0]
+    xy[placed] = centers[town_of[placed]]
+
+    ring = np.hypot(*(xy - centers[town_of]).T) / spread
+    region = np.where(ring < 1.0, 0, np.where(ring < 2.5, 1, 2))
+    region[scattered] = 2
+
+    fee_mean = np.array([_FEES[r][0] for r in REGIONS])[region]
+    fee_std = np.array([_FEES[r][1] for r in REGIONS])[region]
+    tip_mean = np.array([_FEES[r][2] for r in REGIONS])[region]
+    fees = np.round(np.maximum(rng.normal(fee_mean, fee_std), 5.0), 2)
+    tips = np.round(tip_mean * rng.lognormal(-0.08, 0.4, size=n), 2)
+    priority = rng.choice(np.arange(1, 6), size=n, p=_PRIORITY_WEIGHTS)
+    is_depot = np.zeros(n, dtype=np.int8)
+    is_depot[0] = 1
+    fees[0] = tips[0] = 0.0
+    priority[0] = 1
+    region[0] = 0
+
+    store = NodeStore.from_columns(
+        ids=typed_array(np.arange(n), "q"),
+        x=typed_array(np.round(xy[:, 0], 3), "d"),
+        y=typed_array(np.round(xy[:, 1], 3), "d"),
+        delivery_fee=typed_array(fees, "d"),
+        estimated_tip=typed_array(tips, "d"),
+        region_code=typed_array(region, "H"),
+        regions=REGIONS,
+        priority=typed_array(priority, "b"),
+        is_depot=typed_array(is_depot, "b"),
+    )
+    x = np.frombuffer(store.x, dtype=np.float64)
+    y = np.frombuffer(store.y, dtype=np.float64)
+    pairs = np.concatenate([_nearest_pairs(x, y, neighbors),
+                            _highway_pairs(x, y, anchors[anchors >= 0])])
+    del x, y
+    return SyntheticInstance(store, _unique_pairs(pairs, n), seed)
+
+
+# ============================================================================
+# ROAD CONSTRUCTION
+# ============================================================================
+
+def _nearest_pairs(x: np.ndarray, y: np.ndarray, k: int, chunk: int = 50_000) -> np.ndarray:
+    """
+    Pairs (i, j) joining every point to its k nearest neighbors.
+
+    Uses a uniform grid: each point searches its own and the eight
+    surrounding cells. Points that find fewer than k neighbors (sparse
+    rural areas) search again on a grid four times coarser.
+    """
+    n = len(x)
+    cell = 2.0
+    pending = np.arange(n, dtype=np.intp)
+    found: List[np.ndarray] = []
+    for _ in range(4):
+        if len(pending) == 0:
+            break
+        grid = _Grid(x, y, cell)
+        short: List[np.ndarray] = []
+        for start in range(0, len(pending), chunk):
+            queries = pending[start:start + chunk]
+            points, dist = grid.candidates(queries)
+            if points.shape[1] > k:
+                nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+                points = np.take_along_axis(points, nearest, axis=1)
+                dist = np.take_along_axis(dist, nearest, axis=1)
+            valid = np.isfinite(dist)
+            owner = np.broadcast_to(queries[:, None], points.shape)
+            found.append(np.stack([owner[valid], points[valid]], axis=1))
+            short.append(queries[valid.sum(axis=1) < min(k, n - 1)])
+        pending = np.concatenate(short)
+        cell *= 4.0
+    return np.concatenate(found) if found else np.zeros((0, 2), dtype=np.intp)
+
+
+class _Grid:
+    """Points bucketed by square cell, sorted so each cell is one slice."""
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, cell: float):
+        self.x, self.y = x, y
+        self.cx = np.floor(x / cell).astype(np.int64)
+        self.cy = np.floor(y / cell).astype(np.int64)
+        self.width = int(self.cy.max() - self.cy.min()) + 3
+        self.cy0 = int(self.cy.min()) - 1
+        keys = self._key(self.cx, self.cy)
+        self.order = np.argsort(keys, kind="stable")
+        self.keys, self.starts, self.counts = np.unique(keys[self.order], return_index=True,
+                                                        return_counts=True)
+        # Direct lookup table when the grid is not much larger than the point set
+        self.table: Optional[np.ndarray] = None
+        self.key_min = int(self.keys[0]) - self.width - 1
+        span = int(self.keys[-1]) + self.width + 2 - self.key_min
+        if span <= 8 * len(x) + 1024:
+            self.table = np.full(span, len(self.keys), dtype=np.intp)
+            self.table[self.keys - self.key_min] = np.arange(len(self.keys))
+            self.keys = np.append(self.keys, -1)
+            self.starts = np.append(self.starts, 0)
+            self.counts = np.append(self.counts, 0)
+
+    def _key(self, cx: np.ndarray, cy: np.ndarray) -> np.ndarray:
+        return cx * self.width + (cy - self.cy0)
+
+    def candidates(self, queries: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Points in the 3x3 block of cells around each query.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (points, distances), one row per
+            query, padded with -1 / inf; the query itself is given inf too
+        """
+        blocks = []
+        per_query = np.zeros(len(queries), dtype=np.intp)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                keys = self._key(self.cx[queries] + dx, self.cy[queries] + dy)
+                if self.table is not None:
+                    slot = self.table[keys - self.key_min]
+                else:
+                    slot = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+                hit = np.flatnonzero(self.keys[slot] == keys)
+                count = self.counts[slot[hit]]
+                blocks.append((hit, self.starts[slot[hit]], count))
+                per_query[hit] += count
+
+        width = max(int(per_query.max()), 1) if len(queries) else 1
+        points = np.full((len(queries), width), -1, dtype=np.intp)
+        filled = np.zeros(len(queries), dtype=np.intp)
+        for hit, start, count in blocks:
+            total = int(count.sum())
+            if total == 0:
+                continue
+            owner = np.repeat(hit, count)
+            within = np.arange(total) - np.repeat(np.cumsum(count) - count, count)
+            points[owner, filled[owner] + within] = self.order[np.repeat(start, count) + within]
+            filled[hit] += count
+
+        present = (points >= 0) & (points != queries[:, None])
+        safe = np.where(points >= 0, points, 0)
+        dist = np.hypot(self.x[queries, None] - self.x[safe], self.y[queries, None] - self.y[safe])
+        return points, np.where(present, dist, np.inf)
+
+
+def _highway_pairs(x: np.ndarray, y: np.ndarray, anchors: np.ndarray) -> np.ndarray:
+    """Minimum spanning tree (Prim) over the town-center anchor nodes."""
+    m = len(anchors)
+    if m < 2:
+        return np.zeros((0, 2), dtype=np.intp)
+    ax, ay = x[anchors], y[anchors]
+    in_tree = np.zeros(m, dtype=bool)
+    in_tree[0] = True
+    best = np.hypot(ax - ax[0], ay - ay[0])
+    via = np.zeros(m, dtype=np.intp)
+    pairs = np.empty((m - 1, 2), dtype=np.intp)
+    for step in range(m - 1):
+        masked = np.where(in_tree, np.inf, best)
+        j = int(np.argmin(masked))
+        pairs[step] = anchors[via[j]], anchors[j]
+        in_tree[j] = True
+        d = np.hypot(ax - ax[j], ay - ay[j])
+        closer = d < best
+        best = np.where(closer, d, best)
+        via = np.where(closer, j, via)
+    return pairs
+
+
+def _unique_pairs(pairs: np.ndarray, n: int) -> np.ndarray:
+    a = np.minimum(pairs[:, 0], pairs[:, 1]).astype(np.int64)
+    b = np.maximum(pairs[:, 0], pairs[:, 1]).astype(np.int64)
+    keys = np.unique((a * n + b)[a != b])
+    return np.stack([keys // n, keys % n], axis=1)
+
+
+def _csr(n: int, pairs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR offsets/targets with each road stored in both directions."""
+    sources = np.concatenate([pairs[:, 0], pairs[:, 1]])
+    targets = np.concatenate([pairs[:, 1], pairs[:, 0]])
+    order = np.lexsort((targets, sources))
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+    return offsets, targets[order]
+
+
+def instance_summary(instance: SyntheticInstance) -> dict:
+    """Counts useful for sanity-checking a generated instance."""
+    store = instance.nodes
+    region = np.frombuffer(store.region_code, dtype=np.uint16)
+    degree = np.diff(np.frombuffer(instance.graph.offsets, dtype=np.dtype("l")))
+    return {
+        "nodes": len(store),
+        "roads": int(len(instance.road_pairs)),
+        "mean_degree": float(degree.mean()),
+        "isolated": int((degree == 0).sum()),
+        "regions": {name: int((region == code).sum()) for code, name in enumerate(store.regions)},
+    }
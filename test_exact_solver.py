@@ -0,0 +1,75 @@
+"""
+Greedy Algorithm Assignment - Exact Solver Tests
+"""
+
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from exact_solver import exact_route, road_neighborhood
+from greedy_engine import CompanyProfit, DriverEarnings, NodeArrays, greedy_route
+from main import Edge, Node, NodeStore, RoadGraph
+from mn_dataset import MN_DEPOT, MN_GRAPH
+from shortest_paths import ShortestPathCache
+from travel_costs import TravelCosts
+
+
+def _random_graph(seed: int, n: int = 7):
+    rng = np.random.default_rng(seed)
+    store = NodeStore()
+    nodes = [Node(0, 0.0, 0.0, is_depot=True, store=store)]
+    nodes += [Node(i, float(rng.uniform(-5, 5)), float(rng.uniform(-5, 5)),
+                   delivery_fee=float(rng.uniform(1, 8)), store=store) for i in range(1, n)]
+    edges = [Edge(nodes[a], nodes[b]) for a in range(n) for b in range(a + 1, n) if rng.random() < 0.45]
+    return nodes, RoadGraph(edges, nodes)
+
+
+def _brute_force(graph: RoadGraph, rewards: np.ndarray) -> float:
+    """Best total over every ordered subset of the reachable customers."""
+    paths = ShortestPathCache.for_graph(graph)
+    rate = TravelCosts.for_graph(graph).base_cost_per_mile
+    reachable = [v for v in range(1, len(graph)) if paths.distance(0, v) < np.inf]
+    best = 0.0
+    for size in range(1, len(reachable) + 1):
+        for order in permutations(reachable, size):
+            stops = (0,) + order + (0,)
+            driven = sum(paths.distance(a, b) for a, b in zip(stops, stops[1:]))
+            best = max(best, sum(rewards[v] for v in order) - driven * rate)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_matches_brute_force(seed):
+    nodes, graph = _random_graph(seed)
+    objective = CompanyProfit()
+    result = exact_route(graph, nodes[0], objective)
+    assert result.optimal
+    assert result.total == pytest.approx(_brute_force(graph, objective.rewards(NodeArrays.for_graph(graph))))
+
+
+def test_route_follows_roads_and_adds_up():
+    nodes, graph = _random_graph(3, n=9)
+    result = exact_route(graph, nodes[0], DriverEarnings())
+    route = [graph.index(node) for node in result.route]
+    assert route[0] == route[-1] == 0
+    assert all(b in graph.neighbor_indices(a).tolist() for a, b in zip(route, route[1:]))
+    rewards = DriverEarnings().rewards(NodeArrays.for_graph(graph))
+    travel = TravelCosts.for_graph(graph)
+    driven = sum(travel.distance(a, b) for a, b in zip(route, route[1:]))
+    assert result.total == pytest.approx(sum(rewards[v] for v in set(route)) - driven * travel.base_cost_per_mile)
+
+
+def test_never_below_recovered_greedy():
+    graph = road_neighborhood(MN_GRAPH, MN_DEPOT, 14)
+    _, greedy_total = greedy_route(graph, MN_DEPOT, DriverEarnings(), recover=True)
+    result = exact_route(graph, MN_DEPOT)
+    assert result.optimal and result.total >= greedy_total - 1e-9
+    assert result.gap(greedy_total) >= 0.0
+
+
+def test_memory_cap_returns_an_unproven_route():
+    graph = road_neighborhood(MN_GRAPH, MN_DEPOT, 14)
+    result = exact_route(graph, MN_DEPOT, max_bytes=64)
+    assert not result.optimal
+    assert result.route[0] == result.route[-1] == MN_DEPOT
@@ -0,0 +1,96 @@
+"""
+Greedy Algorithm Assignment - Fairness and Balance Routing Tests
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from fair_routing import RegionFrontier, fair_route, first_service_times, region_tip_levels
+from greedy_approach import _route_cost
+from greedy_engine import DriverEarnings, NodeArrays, stop_on_path
+from main import Edge, Node, NodeStore, RoadGraph
+from priority_schedule import TimeWindows, schedule_metrics
+from synthetic_dataset import generate_instance
+from travel_costs import TravelCosts
+
+
+def test_frontier_tracks_the_best_reward_per_region():
+    rng = np.random.default_rng(0)
+    region = rng.integers(0, 4, 300)
+    rewards = rng.uniform(0, 10, 300)
+    members = rng.random(300) < 0.8
+    frontier = RegionFrontier(region, np.zeros(4, dtype=np.intp), rewards, members)
+    for j in rng.permutation(np.flatnonzero(members))[:200].tolist():
+        frontier.remove(j)
+        for r in range(4):
+            left = frontier.open & (region == r)
+            assert frontier.best[r] == (rewards[left].max() if left.any() else -math.inf)
+    wanted = np.array([True, False, True, True])
+    tops = list(frontier.tops(wanted))
+    assert [int(region[j]) for j in tops] == \
+        sorted((r for r in range(4) if wanted[r] and frontier.remaining[r]), key=lambda r: -frontier.best[r])
+    assert all(rewards[j] == frontier.best[region[j]] for j in tops)
+
+
+def test_tip_levels_split_regions_by_mean_tip():
+    region = np.array([0, 0, 1, 1, 2, 2, 3])
+    tips = np.array([1.0, 1.0, 5.0, 5.0, 2.0, 2.0, 9.0])
+    levels = region_tip_levels(region, tips, np.ones(7, dtype=bool), 2, 5)
+    assert levels.tolist() == [0, 1, 0, 1, 0]
+
+
+@pytest.mark.parametrize("rule", ["balance", "fairness"])
+def test_total_matches_the_route_and_rule_is_kept(rule):
+    graph = generate_instance(800, seed=6).graph
+    report = fair_route(graph, graph.nodes[0], rule, max_detour=math.inf, recover=True)
+    rewards = DriverEarnings().rewards(NodeArrays.for_graph(graph))
+    stops = {graph.index(node) for node in report.route} - {0}
+    assert report.total == pytest.approx(sum(rewards[i] for i in stops) - _route_cost(report.route, graph))
+    assert report.stops == len(stops)
+    # Detours reach preferred regions that no road neighbor is in
+    neighbors_only = fair_route(graph, graph.nodes[0], rule, max_detour=0.0, recover=True)
+    assert report.detours > 0 and neighbors_only.detours == 0
+    assert report.preferred_share > neighbors_only.preferred_share
+    for a, b in zip(report.route, report.route[1:]):
+        assert graph.index(b) in graph.neighbor_indices(graph.index(a)).tolist()
+
+
+def test_first_service_times_on_a_known_route():
+    store = NodeStore()
+    nodes = [Node(0, 0.0, 0.0, is_depot=True, store=store),
+             Node(1, 3.0, 0.0, region="downtown", store=store),
+             Node(2, 3.0, 4.0, region="rural", store=store)]
+    graph = RoadGraph([Edge(nodes[0], nodes[1]), Edge(nodes[1], nodes[2])], nodes)
+    times = first_service_times([nodes[0], nodes[1], nodes[2], nodes[1], nodes[0]], graph, speed=60.0)
+    assert times["downtown"] == pytest.approx(3.0)
+    assert times["rural"] == pytest.approx(7.0)
+
+
+def test_first_service_matches_the_schedule_replay():
+    instance = generate_instance(300, seed=6)
+    graph = instance.graph
+    report = fair_route(graph, instance.depot, "fairness", recover=True)
+    stops = np.array([graph.index(node) for node in report.route])
+    # Both replays time hops the same way: with no service time or waiting,
+    # the schedule finishes when the last hop's clock does
+    clock = np.cumsum(TravelCosts.for_graph(graph).hop_minutes(stops, 30.0))
+    windows = TimeWindows(np.zeros(len(graph)), np.full(len(graph), np.inf))
+    assert schedule_metrics(report.route, report.total, graph, windows).finish_time == \
+        pytest.approx(clock[-1])
+    first = first_service_times(report.route, graph)
+    for name, minutes in first.items():
+        if math.isfinite(minutes):
+            assert minutes in clock.tolist()
+
+
+def test_drives_stop_at_the_first_open_node():
+    assert stop_on_path([0, 3, 4, 7], lambda i: i in (4, 7)) == [0, 3, 4]
+    assert stop_on_path([0, 3, 4, 7], lambda i: i == 0) == [0, 3, 4, 7]
+
+
+def test_unknown_rule():
+    graph = generate_instance(50, seed=0).graph
+    with pytest.raises(ValueError):
+        fair_route(graph, graph.nodes[0], "random")
@@ -0,0 +1,48 @@
+"""
+Greedy Algorithm Assignment - Fleet Planning Tests
+"""
+
+import numpy as np
+import pytest
+
+from fleet import partition_customers, plan_fleet
+from greedy_engine import DriverEarnings, NodeArrays, greedy_route
+from mn_dataset import MN_DEPOT, MN_GRAPH
+from synthetic_dataset import generate_instance
+
+
+@pytest.mark.parametrize("vehicles", [1, 3, 7])
+def test_every_customer_gets_exactly_one_vehicle(vehicles):
+    graph = generate_instance(1500, seed=4).graph
+    labels = partition_customers(graph, vehicles, seed=1)
+    is_depot = NodeArrays.for_graph(graph).is_depot
+    assert (labels[is_depot] == -1).all()
+    assert sorted(set(labels[~is_depot].tolist())) == list(range(vehicles))
+
+
+def test_regions_stay_apart_with_enough_vehicles():
+    graph = generate_instance(1500, seed=4).graph
+    arrays = NodeArrays.for_graph(graph)
+    labels = partition_customers(graph, 6, seed=1)
+    customers = ~arrays.is_depot
+    for vehicle in range(6):
+        assert len(set(arrays.region[customers & (labels == vehicle)].tolist())) == 1
+    assert partition_customers(graph, 6, seed=1).tolist() == labels.tolist()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_vehicle_routes_match_greedy_on_their_partition(workers):
+    plan = plan_fleet(MN_GRAPH, MN_DEPOT, 3, workers=workers)
+    for vehicle in plan.vehicles:
+        customers = plan.assignment == vehicle.vehicle
+        route, total = greedy_route(MN_GRAPH, MN_DEPOT, DriverEarnings(), recover=True, customers=customers)
+        assert [node.id for node in vehicle.route] == [node.id for node in route]
+        assert vehicle.total == pytest.approx(total)
+        assert vehicle.served == vehicle.assigned == int(customers.sum())
+    assert plan.total == pytest.approx(sum(vehicle.total for vehicle in plan.vehicles))
+    assert plan.served == int((plan.assignment >= 0).sum()) and not plan.unserved
+
+
+def test_needs_a_vehicle():
+    with pytest.raises(ValueError):
+        partition_customers(MN_GRAPH, 0)
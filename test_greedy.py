@@ -0,0 +1,83 @@
+"""
+Greedy Algorithm Assignment - Regression Tests
+
+Run with `python -m pytest -q`. The Minnesota routes below are the ones
+the original greedy_approach.py produced; the faster engine must keep
+them exactly, on the edge list and on the indexed graph alike.
+"""
+
+import pytest
+
+from greedy_approach import greedy_company_route, greedy_driver_route, greedy_ethical_route
+from grasp import grasp_route
+from mn_dataset import MN_NODES, MN_DEPOT, MN_EDGES, MN_GRAPH
+from travel_costs import TravelCosts
+
+# ============================================================================
+# PARITY WITH THE ORIGINAL MINNESOTA OUTPUT
+# ============================================================================
+
+BASELINE = {
+    "company": ([0, 5, 24, 0], 9.331765566745421),
+    "driver": ([0, 1, 10, 9, 8, 6, 7, 5, 24, 0], 87.96629798174543),
+    "ethical": ([0, 1, 10, 9, 8, 6, 7, 5, 24, 0], 87.96629798174543),
+}
+
+
+def _strategies():
+    return {
+        "company": lambda edges: greedy_company_route(MN_NODES, MN_DEPOT, edges),
+        "driver": lambda edges: greedy_driver_route(MN_NODES, MN_DEPOT, edges),
+        "ethical": lambda edges: greedy_ethical_route(MN_NODES, MN_DEPOT, edges, 2.0, 1.0),
+    }
+
+
+@pytest.mark.parametrize("edges", [MN_EDGES, MN_GRAPH], ids=["edges", "graph"])
+@pytest.mark.parametrize("name", sorted(BASELINE))
+def test_mn_parity(name, edges):
+    route, total = _strategies()[name](edges)
+    expected_route, expected_total = BASELINE[name]
+    assert [node.id for node in route] == expected_route
+    assert total == pytest.approx(expected_total, abs=1e-9)
+
+
+# ============================================================================
+# CACHE INVALIDATION
+# ============================================================================
+
+@pytest.mark.parametrize("edges", [MN_EDGES, MN_GRAPH], ids=["edges", "graph"])
+def test_fee_change_reaches_cached_graph(edges):
+    greedy_driver_route(MN_NODES, MN_DEPOT, edges)  # builds the cached arrays
+    node = MN_NODES[2]
+    fee = node.delivery_fee
+    node.delivery_fee = 1000.0
+    try:
+        route, total = greedy_driver_route(MN_NODES, MN_DEPOT, edges)
+        assert [stop.id for stop in route] == [0, 2, 3, 17, 18, 19, 5, 24, 0]
+        assert total == pytest.approx(1060.266, abs=1e-3)
+    finally:
+        node.delivery_fee = fee
+    assert greedy_driver_route(MN_NODES, MN_DEPOT, edges)[1] == pytest.approx(BASELINE["driver"][1])
+
+
+def test_moved_node_rebuilds_travel_costs():
+    before = TravelCosts.for_graph(MN_GRAPH).lengths.copy()
+    node = MN_NODES[5]
+    x = node.x
+    node.x = x + 1.0
+    try:
+        after = TravelCosts.for_graph(MN_GRAPH).lengths
+        assert not (after == before).all()
+    finally:
+        node.x = x
+    assert (TravelCosts.for_graph(MN_GRAPH).lengths == before).all()
+
+
+# ============================================================================
+# GRASP
+# ============================================================================
+
+def test_grasp_same_result_for_any_worker_count():
+    results = [grasp_route(MN_GRAPH, MN_DEPOT, starts=32, workers=workers) for workers in (1, 2)]
+    assert [node.id for node in results[0].route] == [node.id for node in results[1].route]
+    assert results[0].total == results[1].total
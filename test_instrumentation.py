@@ -0,0 +1,36 @@
+"""
+Greedy Algorithm Assignment - Instrumentation Tests
+"""
+
+import greedy_approach
+import greedy_engine
+import main
+from instrumentation import Profiler, current
+from main import Edge, Node, calculate_travel_cost, get_neighbors
+from mn_dataset import MN_DEPOT, MN_GRAPH, MN_NODES
+
+
+def test_helpers_are_counted_under_any_name():
+    a, b, c = Node(1, 0.0, 0.0), Node(2, 3.0, 4.0), Node(3, 6.0, 8.0)
+    edges = [Edge(a, b), Edge(a, c)]
+    with Profiler() as prof:
+        for other in get_neighbors(a, edges):
+            calculate_travel_cost(a.distance_to(other))
+        get_neighbors(b, edges)
+    assert prof.calls["get_neighbors"] == 2
+    assert prof.calls["distance_to"] == 2
+    assert prof.calls["calculate_travel_cost"] == 2
+    assert prof.neighbor_sizes == {2: 1, 1: 1}
+
+
+def test_disable_restores_everything():
+    originals = (greedy_approach.greedy_driver_route, greedy_engine._recover)
+    with Profiler() as prof:
+        greedy_approach.greedy_driver_route(MN_NODES, MN_DEPOT, MN_GRAPH, recover=True)
+    assert current() is None and main._probe is None
+    assert (greedy_approach.greedy_driver_route, greedy_engine._recover) == originals
+    assert prof.calls["greedy_driver_route"] == 1
+    assert prof.calls["scoring"] > 0
+    assert sum(prof.step_latency) == prof.calls["scoring"] + prof.calls["recovery"]
+    MN_DEPOT.distance_to(MN_NODES[1])
+    assert prof.calls["distance_to"] == 0
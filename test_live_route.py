@@ -0,0 +1,73 @@
+"""
+Greedy Algorithm Assignment - Live Route Tests
+"""
+
+import pytest
+
+from live_route import LiveRoute
+from main import Edge, Node, NodeStore, RoadGraph
+
+
+@pytest.fixture
+def square():
+    """Depot 0 and customers 1, 2 on a triangle of roads, driven 0 -> 1 -> 2 -> 0."""
+    store = NodeStore()
+    nodes = [Node(0, 0.0, 0.0, is_depot=True, store=store),
+             Node(1, 4.0, 0.0, delivery_fee=10.0, estimated_tip=2.0, store=store),
+             Node(2, 4.0, 4.0, delivery_fee=10.0, estimated_tip=2.0, store=store)]
+    edges = [Edge(nodes[0], nodes[1]), Edge(nodes[1], nodes[2]), Edge(nodes[2], nodes[0])]
+    route = [nodes[0], nodes[1], nodes[2], nodes[0]]
+    return nodes, RoadGraph(edges, nodes), route
+
+
+def _total(route):
+    """Driver earnings of a route, every hop driven on a straight road."""
+    stops = {node.id: node for node in route if not node.is_depot}
+    rewards = sum(node.delivery_fee + node.estimated_tip for node in stops.values())
+    return rewards - 0.5 * sum(a.distance_to(b) for a, b in zip(route, route[1:]))
+
+
+def test_order_goes_into_the_cheapest_gap(square):
+    nodes, graph, route = square
+    live = LiveRoute(route, graph)
+    new = Node(3, 5.0, 2.0, delivery_fee=8.0, estimated_tip=1.0)
+    gain = live.add_order(new, [Edge(new, nodes[1]), Edge(new, nodes[2])])
+    assert [node.id for node in live.route] == [0, 1, 3, 2, 0]
+    assert gain == pytest.approx(_total(live.route) - _total(route))
+    assert live.total == pytest.approx(_total(live.route))
+
+
+def test_driven_gaps_are_not_offered(square):
+    nodes, graph, route = square
+    live = LiveRoute(route, graph, committed=3)
+    new = Node(3, 5.0, 2.0, delivery_fee=8.0)
+    assert live.add_order(new, [Edge(new, nodes[1]), Edge(new, nodes[2])]) is None
+    assert [node.id for node in live.pending] == [3]
+
+
+def test_pending_order_is_retried_when_a_gap_opens(square):
+    nodes, graph, route = square
+    live = LiveRoute(route, graph)
+    late = Node(4, 6.0, 3.0, delivery_fee=9.0)
+    bridge = Node(3, 5.0, 2.0, delivery_fee=8.0)
+    # 4 needs the stop 3, which is not on the route yet
+    assert live.add_order(late, [Edge(late, bridge), Edge(late, nodes[2])]) is None
+    assert live.pending == [late]
+    assert live.add_order(bridge, [Edge(bridge, nodes[1]), Edge(bridge, nodes[2])]) is not None
+    assert live.pending == []
+    assert [node.id for node in live.route] == [0, 1, 3, 4, 2, 0]
+    assert live.total == pytest.approx(_total(live.route))
+
+
+def test_duplicate_orders_are_rejected(square):
+    nodes, graph, route = square
+    live = LiveRoute(route, graph)
+    with pytest.raises(ValueError, match="already on the route"):
+        live.add_order(nodes[1])
+    late = Node(4, 6.0, 3.0, delivery_fee=9.0)
+    assert live.add_order(late, [Edge(late, nodes[2])]) is None
+    total = live.total
+    with pytest.raises(ValueError, match="already pending"):
+        live.add_order(late, [Edge(late, nodes[2])])
+    assert live.pending == [late]
+    assert live.total == total
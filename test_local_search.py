@@ -0,0 +1,58 @@
+"""
+Greedy Algorithm Assignment - Local Search Tests
+"""
+
+import pytest
+
+from greedy_approach import _route_cost
+from greedy_engine import CompanyProfit, DriverEarnings, NodeArrays, greedy_route
+from local_search import improve_route
+from mn_dataset import MN_DEPOT, MN_GRAPH
+from synthetic_dataset import generate_instance
+
+
+def _rewards_of(route, graph, objective):
+    rewards = objective.rewards(NodeArrays.for_graph(graph))
+    stops = {graph.index(node) for node in route} - {graph.index(route[0])}
+    return float(sum(rewards[i] for i in stops))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_totals_match_the_route_cost(seed):
+    graph = generate_instance(600, seed=seed).graph
+    objective = DriverEarnings()
+    route, total = greedy_route(graph, graph.nodes[0], objective, recover=True)
+    improved, new_total, trace = improve_route(route, graph, objective)
+    assert new_total == pytest.approx(_rewards_of(improved, graph, objective) - _route_cost(improved, graph))
+    assert total == pytest.approx(_rewards_of(route, graph, objective) - _route_cost(route, graph))
+    assert new_total >= total - 1e-9
+    assert {node.id for node in improved} == {node.id for node in route}
+    assert improved[0] == improved[-1] == route[0]
+    for entry in trace:
+        assert entry["delta"] > 0
+    if trace:
+        assert trace[-1]["total"] == pytest.approx(new_total)
+
+
+def test_every_new_hop_is_a_road():
+    graph = generate_instance(600, seed=1).graph
+    route, _ = greedy_route(graph, graph.nodes[0], CompanyProfit(), recover=True)
+    improved, _, trace = improve_route(route, graph, CompanyProfit())
+    assert trace
+    for a, b in zip(improved, improved[1:]):
+        assert graph.index(b) in graph.neighbor_indices(graph.index(a)).tolist()
+
+
+def test_straight_return_is_kept_for_unrecovered_routes():
+    route, total = greedy_route(MN_GRAPH, MN_DEPOT, DriverEarnings())
+    improved, new_total, _ = improve_route(route, MN_GRAPH)
+    assert new_total == pytest.approx(_rewards_of(improved, MN_GRAPH, DriverEarnings())
+                                      - _route_cost(improved, MN_GRAPH))
+    assert new_total >= total - 1e-9
+
+
+def test_move_budget_is_respected():
+    graph = generate_instance(600, seed=1).graph
+    route, _ = greedy_route(graph, graph.nodes[0], DriverEarnings(), recover=True)
+    _, _, trace = improve_route(route, graph, max_moves=2)
+    assert len(trace) <= 2
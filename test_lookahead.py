@@ -0,0 +1,120 @@
+"""
+Greedy Algorithm Assignment - Lookahead Tests
+"""
+
+import numpy as np
+import pytest
+
+from greedy_engine import (CompanyProfit, DriverEarnings, FatigueEarnings, NodeArrays,
+                           PriorityEarnings, RegionBalanceEarnings, greedy_route)
+from lookahead import lookahead_route
+from main import Edge, Node, NodeStore, RoadGraph
+from mn_dataset import MN_DEPOT, MN_GRAPH
+from synthetic_dataset import generate_instance
+from travel_costs import TravelCosts
+
+OBJECTIVES = [CompanyProfit(), DriverEarnings(), FatigueEarnings(), PriorityEarnings(),
+              RegionBalanceEarnings()]
+OBJECTIVE_IDS = ["company", "driver", "fatigue", "priority", "region"]
+
+
+def _multi_depot():
+    """A synthetic network with two more depots besides the start."""
+    instance = generate_instance(300, seed=3)
+    for row in (5, 40):
+        instance.nodes[row].is_depot = True
+    return instance.graph, instance.depot
+
+
+@pytest.mark.parametrize("recover", [False, True])
+@pytest.mark.parametrize("objective", OBJECTIVES, ids=OBJECTIVE_IDS)
+@pytest.mark.parametrize("network", ["mn", "multi_depot"])
+def test_depth_one_is_greedy_route(network, objective, recover):
+    graph, depot = (MN_GRAPH, MN_DEPOT) if network == "mn" else _multi_depot()
+    route, total = greedy_route(graph, depot, objective, recover=recover)
+    result = lookahead_route(graph, depot, 1, objective, recover=recover)
+    assert [node.id for node in result.route] == [node.id for node in route]
+    assert result.total == pytest.approx(total)
+
+
+def _random_graph(seed: int, n: int = 7):
+    rng = np.random.default_rng(seed)
+    store = NodeStore()
+    nodes = [Node(0, 0.0, 0.0, is_depot=True, store=store)]
+    nodes += [Node(i, float(rng.uniform(-5, 5)), float(rng.uniform(-5, 5)),
+                   delivery_fee=float(rng.uniform(1, 6)), store=store) for i in range(1, n)]
+    edges = [Edge(nodes[a], nodes[b]) for a in range(n) for b in range(a + 1, n) if rng.random() < 0.45]
+    return nodes, RoadGraph(edges, nodes)
+
+
+def _best_plan(graph: RoadGraph, rewards: np.ndarray) -> float:
+    """Best total over every route that drives until it is stranded, then home."""
+    travel = TravelCosts.for_graph(graph)
+    d = 0
+
+    def extend(v, visited):
+        best = None
+        for slot in range(graph.offsets[v], graph.offsets[v + 1]):
+            w = int(travel.targets[slot])
+            if w not in visited:
+                value = rewards[w] - travel.costs[slot] + extend(w, visited | {w})
+                best = value if best is None else max(best, value)
+        return best if best is not None else -travel.cost(v, d)
+
+    return extend(d, {d})
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_full_depth_matches_brute_force(seed):
+    nodes, graph = _random_graph(seed)
+    objective = CompanyProfit()
+    best = _best_plan(graph, objective.rewards(NodeArrays.for_graph(graph)))
+    result = lookahead_route(graph, nodes[0], len(nodes), objective)
+    assert result.total == pytest.approx(best)
+
+
+def test_fatigue_rule_holds_at_every_depth():
+    instance = generate_instance(400, seed=1)
+    graph, depot = instance.graph, instance.depot
+    objective = FatigueEarnings(long_hop_threshold=0.5, short_hop_limit=0.3)
+    travel = TravelCosts.for_graph(graph)
+    for depth in (2, 3):
+        result = lookahead_route(graph, depot, depth, objective)
+        stops = [graph.index(node) for node in result.route[:-1]]
+        visited = {stops[0]}
+        for a, b, c in zip(stops, stops[1:], stops[2:]):
+            visited.add(b)
+            if travel.distance(a, b) > objective.long_hop_threshold:
+                short = [w for w in graph.neighbor_indices(b) if w not in visited
+                         and travel.distance(b, w) <= objective.short_hop_limit]
+                assert not short or travel.distance(b, c) <= objective.short_hop_limit
+        # The rule reads the last hop, so no subtree may be reused
+        assert result.table["entries"] == 0
+
+
+def test_unbudgeted_search_is_repeatable():
+    instance = generate_instance(2000, seed=2)
+    runs = [lookahead_route(instance.graph, instance.depot, 3) for _ in range(2)]
+    assert [node.id for node in runs[0].route] == [node.id for node in runs[1].route]
+    assert (runs[0].depths == 3).all()
+    assert runs[0].table["entries"] > 0
+
+
+@pytest.mark.parametrize("recover", [False, True])
+@pytest.mark.parametrize("objective", OBJECTIVES, ids=OBJECTIVE_IDS)
+def test_lookahead_not_worse_than_greedy(objective, recover):
+    route, total = greedy_route(MN_GRAPH, MN_DEPOT, objective, recover=recover)
+    for depth in (2, 3, 4, 5):
+        result = lookahead_route(MN_GRAPH, MN_DEPOT, depth, objective, recover=recover)
+        assert result.total >= total - 1e-9
+
+
+@pytest.mark.parametrize("recover", [False, True])
+def test_budgeted_search_on_a_large_graph(recover):
+    instance = generate_instance(1500, seed=0)
+    graph, depot = instance.graph, instance.depot
+    _, total = greedy_route(graph, depot, DriverEarnings(), recover=recover)
+    result = lookahead_route(graph, depot, 3, recover=recover, budget=0.001)
+    assert result.total >= total - 1e-6
+    assert result.route[-1].id == depot.id
+    assert result.table["entries"] > 0
@@ -0,0 +1,64 @@
+"""
+Greedy Algorithm Assignment - Core Class Tests
+
+NodeStore rows, Node views and the indexed RoadGraph.
+"""
+
+import gc
+import pickle
+import weakref
+
+import main
+from main import Edge, Node, NodeStore, RoadGraph, get_neighbors
+
+
+def test_standalone_nodes_share_a_chunked_store():
+    a = Node(1, 0.0, 0.0)
+    b = Node(2, 3.0, 4.0)
+    assert a.store is b.store
+    assert a != b and a.distance_to(b) == 5.0
+    rest = [Node(i, 0.0, 0.0) for i in range(main._CHUNK_ROWS)]
+    assert rest[-1].store is not a.store
+    assert len(a.store) == main._CHUNK_ROWS
+
+
+def test_standalone_chunk_is_freed_with_its_nodes():
+    nodes = [Node(i, 0.0, 0.0) for i in range(main._CHUNK_ROWS + 1)]
+    chunk = weakref.ref(nodes[0].store)
+    del nodes
+    gc.collect()
+    assert chunk() is None
+
+
+def test_pickled_node_carries_only_its_row():
+    store = NodeStore()
+    nodes = [Node(i, float(i), 0.0, delivery_fee=i / 2, store=store) for i in range(1000)]
+    node = nodes[7]
+    node.region = "rural"
+    data = pickle.dumps(node)
+    assert len(data) < 200
+    copy = pickle.loads(data)
+    assert copy.store is not store
+    assert (copy.id, copy.x, copy.delivery_fee, copy.region) == (7, 7.0, 3.5, "rural")
+
+
+def test_setter_records_the_column_change():
+    store = NodeStore()
+    node = Node(1, 0.0, 0.0, store=store)
+    graph = RoadGraph([], [node])
+    before = graph.node_version("delivery_fee")
+    node.delivery_fee = 9.0
+    assert graph.node_version("delivery_fee") == before + 1
+    assert graph.node_version("x") == 0
+
+
+def test_graph_neighbors_match_the_edge_scan():
+    nodes = [Node(i, float(i), 0.0) for i in range(5)]
+    edges = [Edge(nodes[0], nodes[1]), Edge(nodes[1], nodes[2]), Edge(nodes[2], nodes[0]),
+             Edge(nodes[1], nodes[0]), Edge(nodes[3], nodes[3])]
+    graph = RoadGraph(edges, nodes)
+    for node in nodes:
+        scanned = list(dict.fromkeys(n.id for n in get_neighbors(node, edges) if n.id != node.id))
+        assert [n.id for n in get_neighbors(node, graph)] == scanned
+    assert graph.num_edges == 3
+    assert graph.degree(nodes[4]) == 0
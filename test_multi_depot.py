@@ -0,0 +1,70 @@
+"""
+Greedy Algorithm Assignment - Multi-Depot Planning Tests
+"""
+
+import numpy as np
+import pytest
+
+from greedy_engine import DriverEarnings, greedy_route
+from multi_depot import nearest_depots, plan_depots
+from shortest_paths import ShortestPathCache
+from synthetic_dataset import generate_instance
+
+
+def _depot_instance():
+    """A synthetic network with depots at rows 0, 120 and 250."""
+    instance = generate_instance(400, seed=5)
+    for row in (120, 250):
+        instance.nodes[row].is_depot = True
+    return instance.graph, np.array([0, 120, 250])
+
+
+def test_assignment_matches_dijkstra_from_each_depot():
+    graph, depots = _depot_instance()
+    owner, distance = nearest_depots(graph, depots)
+    paths = ShortestPathCache.for_graph(graph)
+    each = np.array([[paths.distance(d, v) for v in range(len(graph))] for d in depots.tolist()])
+    assert np.allclose(distance, each.min(axis=0))
+    reachable = np.isfinite(distance)
+    assert np.allclose(each[owner[reachable], np.flatnonzero(reachable)], distance[reachable])
+    assert (owner[~reachable] == -1).all()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_partitioned_routes_stop_only_at_their_own_customers(workers):
+    graph, depots = _depot_instance()
+    plan = plan_depots(graph, workers=workers, recover=False)
+    for k, result in enumerate(plan.depots):
+        # Without recovery every hop is a stop, and only the final one goes home
+        stops = [graph.index(node) for node in result.route[1:-1]]
+        assert (plan.assignment[stops] == k).all()
+        assert result.served == len(stops) <= result.assigned
+
+
+def test_recovered_partition_serves_every_assigned_customer_once():
+    graph, depots = _depot_instance()
+    plan = plan_depots(graph, workers=1)
+    assert plan.partitioned
+    for k, result in enumerate(plan.depots):
+        assert result.served == result.assigned
+        customers = plan.assignment == k
+        route, total = greedy_route(graph, result.depot, DriverEarnings(), recover=True, customers=customers)
+        assert [node.id for node in result.route] == [node.id for node in route]
+        assert result.total == pytest.approx(total)
+    assert sum(result.assigned for result in plan.depots) + len(plan.unreachable) == len(graph) - len(depots)
+
+
+def test_competing_depots_pick_the_best_hub():
+    graph, depots = _depot_instance()
+    plan = plan_depots(graph, workers=1, partition=False)
+    totals = [greedy_route(graph, graph.nodes[d], DriverEarnings(), recover=True,
+                           customers=~np.isin(np.arange(len(graph)), depots))[1] for d in depots.tolist()]
+    assert [result.total for result in plan.depots] == pytest.approx(totals)
+    assert plan.best.total == pytest.approx(max(totals))
+
+
+def test_needs_a_depot():
+    instance = generate_instance(50, seed=1)
+    instance.nodes[0].is_depot = False
+    with pytest.raises(ValueError):
+        plan_depots(instance.graph, workers=1)
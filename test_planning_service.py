@@ -0,0 +1,95 @@
+"""
+Greedy Algorithm Assignment - Planning Service Tests
+"""
+
+import asyncio
+
+import pytest
+
+from greedy_approach import greedy_driver_route, greedy_ethical_route
+from mn_dataset import MN_DEPOT, MN_GRAPH, MN_NODES
+from planning_service import PlanningService
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_batch_is_deduplicated_and_reported():
+    async def scenario():
+        async with PlanningService(MN_GRAPH, batch_window=0.05) as service:
+            results = await asyncio.gather(
+                *[service.plan(MN_DEPOT, "driver", recover=True) for _ in range(5)],
+                service.plan(MN_DEPOT.id, "ethical", short_hop_limit=2.0))
+            return results, service.stats()
+
+    results, stats = _run(scenario())
+    route, total = greedy_driver_route(MN_NODES, MN_DEPOT, MN_GRAPH, recover=True)
+    for planned, planned_total in results[:5]:
+        assert [node.id for node in planned] == [node.id for node in route]
+        assert planned_total == pytest.approx(total)
+    ethical = greedy_ethical_route(MN_NODES, MN_DEPOT, MN_GRAPH, short_hop_limit=2.0)
+    assert [node.id for node in results[5][0]] == [node.id for node in ethical[0]]
+    assert (stats["requests"], stats["completed"], stats["batches"]) == (6, 6, 1)
+    assert stats["deduplicated"] == 4 and stats["mean_batch"] == 6.0
+    assert stats["max_queue_depth"] == 6 and stats["queue_depth"] == 0
+    assert stats["p50_ms"] <= stats["p99_ms"]
+
+
+def test_batches_are_capped_and_errors_stay_per_request():
+    async def scenario():
+        async with PlanningService(MN_GRAPH, max_batch=2) as service:
+            results = await asyncio.gather(
+                service.plan(MN_DEPOT, "driver"),
+                service.plan(MN_DEPOT, "ethical", ethical_rule="nonsense"),
+                service.plan(MN_DEPOT, "company"),
+                return_exceptions=True)
+            return results, service.stats()
+
+    results, stats = _run(scenario())
+    assert isinstance(results[1], ValueError)
+    assert not isinstance(results[0], Exception) and not isinstance(results[2], Exception)
+    assert stats["batches"] == 2 and stats["completed"] == 3
+
+
+def test_list_and_bad_parameters_fail_only_their_request():
+    async def scenario():
+        async with PlanningService(MN_GRAPH, batch_window=0.05) as service:
+            results = await asyncio.gather(
+                service.plan(MN_DEPOT, "driver"),
+                service.plan(MN_DEPOT, "ethical", long_hop_threshold=[1, 2]),
+                service.plan(MN_DEPOT, "ethical", long_hop_threshold=(1, 2)),
+                service.plan(MN_DEPOT, "driver", recover=object()),
+                return_exceptions=True)
+            return results, service.stats()
+
+    results, stats = _run(scenario())
+    route, total = greedy_driver_route(MN_NODES, MN_DEPOT, MN_GRAPH)
+    assert [node.id for node in results[0][0]] == [node.id for node in route]
+    assert results[0][1] == pytest.approx(total)
+    # The list is planned (and fails in the strategy) once for both spellings
+    assert isinstance(results[1], Exception) and type(results[2]) is type(results[1])
+    assert isinstance(results[3], TypeError)
+    assert (stats["requests"], stats["completed"], stats["deduplicated"]) == (3, 3, 1)
+
+
+def test_rejects_unknown_strategy_and_stopped_service():
+    async def scenario():
+        service = PlanningService(MN_GRAPH)
+        with pytest.raises(RuntimeError):
+            await service.plan(MN_DEPOT)
+        async with service:
+            with pytest.raises(ValueError):
+                await service.plan(MN_DEPOT, "fastest")
+
+    _run(scenario())
+
+
+def test_worker_processes_give_the_same_routes():
+    async def scenario(workers):
+        async with PlanningService(MN_GRAPH, workers=workers) as service:
+            return await service.plan(MN_DEPOT, "company", recover=True)
+
+    one, two = _run(scenario(1)), _run(scenario(2))
+    assert [node.id for node in one[0]] == [node.id for node in two[0]]
+    assert one[1] == pytest.approx(two[1])
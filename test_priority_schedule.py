@@ -0,0 +1,115 @@
+"""
+Greedy Algorithm Assignment - Priority Scheduling Tests
+"""
+
+import heapq
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import priority_schedule
+from greedy_engine import DriverEarnings, greedy_route
+from main import Edge, Node, NodeStore, RoadGraph
+from mn_dataset import MN_DEPOT, MN_GRAPH
+from priority_schedule import TimeWindows, priority_route, schedule_metrics
+from synthetic_dataset import generate_instance
+
+
+def _line():
+    """Depot 0 in the middle of a road 2 - 1 - 0 - 3 - 4, one mile apart."""
+    store = NodeStore()
+    nodes = [Node(0, 0.0, 0.0, is_depot=True, store=store),
+             Node(1, -1.0, 0.0, delivery_fee=5.0, priority=5, store=store),
+             Node(2, -2.0, 0.0, delivery_fee=5.0, priority=5, store=store),
+             Node(3, 1.0, 0.0, delivery_fee=4.0, priority=1, store=store),
+             Node(4, 2.0, 0.0, delivery_fee=4.0, priority=1, store=store)]
+    edges = [Edge(nodes[0], nodes[1]), Edge(nodes[1], nodes[2]),
+             Edge(nodes[0], nodes[3]), Edge(nodes[3], nodes[4])]
+    return nodes, RoadGraph(edges, nodes)
+
+
+def _roads_joined(route, graph):
+    return all(graph.index(b) in graph.neighbor_indices(graph.index(a)) or a.id == b.id
+               for a, b in zip(route, route[1:]))
+
+
+def _multi_depot():
+    """A synthetic network with two more depots besides the start."""
+    instance = generate_instance(300, seed=3)
+    for row in (5, 40):
+        instance.nodes[row].is_depot = True
+    return instance.graph, instance.depot
+
+
+@pytest.mark.parametrize("network", ["mn", "multi_depot"])
+def test_zero_weights_match_recovered_greedy(network):
+    graph, depot = (MN_GRAPH, MN_DEPOT) if network == "mn" else _multi_depot()
+    route, total = greedy_route(graph, depot, DriverEarnings(), recover=True)
+    report = priority_route(graph, depot, priority_weight=0.0, deadline_weight=0.0)
+    assert [node.id for node in report.route] == [node.id for node in route]
+    assert report.total == pytest.approx(total)
+
+
+def test_other_depots_are_counted_as_stops():
+    graph, depot = _multi_depot()
+    report = priority_route(graph, depot)
+    ids = [node.id for node in report.route]
+    assert graph.nodes[5].id in ids and graph.nodes[40].id in ids
+    assert report.served == len(set(ids) - {depot.id})
+    # A depot stop whose window has closed is late like any other stop
+    windows = TimeWindows.from_priority(graph)
+    windows.latest[[5, 40]] = -1.0
+    late = schedule_metrics(report.route, report.total, graph, windows)
+    assert late.late_stops == report.late_stops + 2
+
+
+def test_urgent_side_goes_first():
+    nodes, graph = _line()
+    plain = priority_route(graph, nodes[0], priority_weight=0.0, deadline_weight=0.0)
+    urgent = priority_route(graph, nodes[0])
+    assert [node.id for node in plain.route] == [0, 1, 2, 1, 0, 3, 4, 3, 0]
+    assert [node.id for node in urgent.route] == [0, 3, 4, 3, 0, 1, 2, 1, 0]
+    assert urgent.priority_inversions < plain.priority_inversions
+    assert urgent.total == pytest.approx(plain.total)
+    assert _roads_joined(urgent.route, graph)
+
+
+def test_frontier_is_pushed_once_per_road(monkeypatch):
+    nodes, graph = _line()
+    pushes, heapified = [], []
+    counted = SimpleNamespace(
+        heappush=lambda heap, item: pushes.append(item) or heapq.heappush(heap, item),
+        heapify=lambda heap: heapified.append(len(heap)) or heapq.heapify(heap),
+        heappop=heapq.heappop)
+    monkeypatch.setattr(priority_schedule, "heapq", counted)
+    priority_route(graph, nodes[0])
+    # One push per road from a stop to a customer not served yet, and the
+    # only heapify is the one of every customer at departure
+    assert sorted(entry[1] for entry in pushes) == sorted(graph.index(nodes[i]) for i in (1, 2, 3, 4))
+    assert heapified == [4]
+
+
+@pytest.mark.parametrize("opens, first", [(1.0, 1), (600.0, 3)])
+def test_closed_window_charges_the_wait(opens, first):
+    nodes, graph = _line()
+    earliest = np.zeros(len(graph))
+    earliest[graph.index(nodes[1])] = opens
+    windows = TimeWindows(earliest, np.full(len(graph), np.inf))
+    report = priority_route(graph, nodes[0], windows=windows, priority_weight=0.0)
+    # A one-minute wait costs less than the mile to 1; ten hours does not
+    assert report.route[1].id == first
+    assert report.served == 4 and report.late_stops == 0
+    assert report.finish_time >= opens
+
+
+def test_metrics_on_a_known_route():
+    nodes, graph = _line()
+    windows = TimeWindows.from_priority(graph, minutes_per_level=1.0, service=0.0)
+    route = [nodes[i] for i in (0, 1, 0, 3, 0)]
+    report = schedule_metrics(route, 0.0, graph, windows, speed=60.0)
+    # Miles driven equal minutes at 60 mph; 3 is due at minute 1, reached at 3
+    assert (report.served, report.late_stops) == (2, 1)
+    assert report.total_lateness == pytest.approx(2.0)
+    assert report.finish_time == pytest.approx(4.0)
+    assert report.priority_violations == report.priority_inversions == 1
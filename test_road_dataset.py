@@ -0,0 +1,66 @@
+"""
+Greedy Algorithm Assignment - Road Dataset Tests
+"""
+
+import numpy as np
+import pytest
+
+from greedy_engine import DriverEarnings, greedy_route
+from mn_dataset import MN_DEPOT, MN_GRAPH
+from road_dataset import FLAG_DENSE_IDS, MappedDataset, open_dataset, write_dataset
+from synthetic_dataset import generate_instance
+
+
+def _attributes(graph):
+    return [(node.id, node.x, node.y, node.delivery_fee, node.estimated_tip, node.region,
+             node.priority, node.is_depot) for node in graph.nodes]
+
+
+@pytest.mark.parametrize("source", ["mn", "synthetic"])
+def test_write_and_map_round_trip(tmp_path, source):
+    graph = MN_GRAPH if source == "mn" else generate_instance(500, seed=2).graph
+    depot = MN_DEPOT if source == "mn" else graph.nodes[0]
+    path = str(tmp_path / "graph.roads")
+    write_dataset(path, graph)
+    dataset = open_dataset(path)
+    assert isinstance(dataset, MappedDataset) and len(dataset) == len(graph)
+    assert _attributes(dataset.graph) == _attributes(graph)
+    assert list(dataset.graph.offsets) == list(graph.offsets)
+    assert list(dataset.graph.targets) == list(graph.targets)
+    route, total = greedy_route(graph, depot, DriverEarnings(), recover=True)
+    mapped, mapped_total = greedy_route(dataset.graph, dataset.graph[depot.id], DriverEarnings(), recover=True)
+    assert [node.id for node in mapped] == [node.id for node in route]
+    assert mapped_total == pytest.approx(total)
+    assert dataset.graph.derived["dataset_path"] == path
+
+
+def test_dense_ids_are_flagged(tmp_path):
+    path = str(tmp_path / "synthetic.roads")
+    write_dataset(path, generate_instance(100, seed=0).graph)
+    with open(path, "rb") as f:
+        flags = int.from_bytes(f.read(16)[12:16], "little")
+    assert flags & FLAG_DENSE_IDS
+
+
+def test_read_only_unless_writable(tmp_path):
+    path = str(tmp_path / "mn.roads")
+    write_dataset(path, MN_GRAPH)
+    with pytest.raises(TypeError):
+        open_dataset(path).nodes[1].delivery_fee = 1.0
+    dataset = open_dataset(path, writable=True)
+    dataset.nodes[1].delivery_fee = 99.0
+    assert dataset.nodes[1].delivery_fee == 99.0
+    assert open_dataset(path).nodes[1].delivery_fee == MN_GRAPH.nodes[1].delivery_fee
+
+
+def test_rejects_other_and_truncated_files(tmp_path):
+    other = tmp_path / "other.roads"
+    other.write_bytes(b"not a road graph" * 8)
+    with pytest.raises(ValueError, match="bad magic"):
+        open_dataset(str(other))
+    path = tmp_path / "mn.roads"
+    write_dataset(str(path), MN_GRAPH)
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) // 2])
+    with pytest.raises(ValueError, match="truncated"):
+        open_dataset(str(path))
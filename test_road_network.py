@@ -0,0 +1,91 @@
+"""
+Greedy Algorithm Assignment - Road Network Tests
+"""
+
+import numpy as np
+import pytest
+
+from greedy_engine import DriverEarnings, NodeArrays, greedy_route
+from main import Edge, RoadGraph
+from mn_dataset import MN_DEPOT, MN_EDGES, MN_NODES
+from road_network import RoadNetwork
+
+
+def _warm(network: RoadNetwork):
+    """Settle a full tree from every node."""
+    for u in MN_NODES:
+        for v in MN_NODES:
+            network.distance(u, v)
+
+
+def _assert_distances_match_a_fresh_network(network: RoadNetwork, edges):
+    fresh = RoadNetwork(edges, MN_NODES)
+    for u in MN_NODES:
+        for v in MN_NODES:
+            assert network.distance(u, v) == pytest.approx(fresh.distance(u, v))
+
+
+@pytest.mark.parametrize("road", [7, 18, 22])
+def test_remove_edge_drops_only_the_trees_that_used_it(road):
+    network = RoadNetwork(MN_EDGES, MN_NODES)
+    _warm(network)
+    edge = MN_EDGES[road]
+    users = [source for source, tree in network._trees.items() if tree.uses(edge.u.id, edge.v.id)]
+    before = network.cached_trees
+    network.remove_edge(edge.u, edge.v)
+    assert 0 < len(users) < before
+    assert network.cached_trees == before - len(users)
+    assert network.trees_dropped == len(users)
+    assert not network.has_road(edge.u, edge.v)
+    _assert_distances_match_a_fresh_network(network, [e for e in MN_EDGES if e is not edge])
+
+
+def test_closures_and_reopenings_keep_distances_exact():
+    rng = np.random.default_rng(0)
+    network = RoadNetwork(MN_EDGES, MN_NODES)
+    open_roads = list(MN_EDGES)
+    for _ in range(12):
+        _warm(network)
+        if len(open_roads) > len(MN_EDGES) - 4 or rng.random() < 0.5:
+            edge = open_roads.pop(int(rng.integers(len(open_roads))))
+            network.remove_edge(edge.u, edge.v)
+        else:
+            closed = [e for e in MN_EDGES if e not in open_roads]
+            edge = closed[int(rng.integers(len(closed)))]
+            network.add_edge(edge)
+            open_roads.append(edge)
+        _assert_distances_match_a_fresh_network(network, open_roads)
+
+
+def test_closure_reports_tracked_routes_and_their_impact():
+    network = RoadNetwork(MN_EDGES, MN_NODES)
+    route, _ = greedy_route(MN_EDGES, MN_DEPOT, DriverEarnings(), MN_NODES, recover=True)
+    network.track("van", route)
+    a, b = route[2], route[3]
+    assert network.remove_edge(a, b) == ["van"]
+    impact = network.impact("van")
+    assert impact.broken_hops == [(a, b)] and not impact.ok
+    assert impact.replan[0].id == b.id
+    network.add_edge(Edge(a, b))
+    network.advance("van", 3)
+    assert network.remove_edge(a, b) == []
+    assert network.impact("van").broken_hops == []
+
+
+def test_fee_change_patches_the_snapshot():
+    network = RoadNetwork(MN_EDGES, MN_NODES)
+    graph = network.graph
+    node = MN_NODES[5]
+    old = node.delivery_fee
+    try:
+        network.set_fee(node, old + 50.0)
+        assert network.graph is graph
+        arrays = NodeArrays.cached(graph)
+        assert arrays is not None and arrays.fees[graph.index(node)] == old + 50.0
+        fresh = RoadGraph(MN_EDGES, MN_NODES)
+        assert greedy_route(graph, MN_DEPOT, DriverEarnings())[1] == \
+            pytest.approx(greedy_route(fresh, MN_DEPOT, DriverEarnings())[1])
+        network.remove_edge(MN_EDGES[0].u, MN_EDGES[0].v)
+        assert network.graph is not graph
+    finally:
+        node.delivery_fee = old
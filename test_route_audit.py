@@ -0,0 +1,80 @@
+"""
+Greedy Algorithm Assignment - Route Audit Tests
+"""
+
+import numpy as np
+import pytest
+
+from greedy_approach import _route_cost, greedy_company_route, greedy_driver_route
+from greedy_engine import DriverEarnings, greedy_route
+from main import get_neighbors
+from mn_dataset import MN_DEPOT, MN_EDGES, MN_GRAPH, MN_NODES
+from route_audit import EdgeSet, audit_routes, served_stops
+from synthetic_dataset import generate_instance
+
+
+def test_edge_set_matches_the_edge_list():
+    roads = {frozenset((edge.u.id, edge.v.id)) for edge in MN_EDGES}
+    index = EdgeSet(MN_GRAPH)
+    ids = [node.id for node in MN_GRAPH.nodes]
+    a, b = np.meshgrid(np.arange(len(ids)), np.arange(len(ids)))
+    found = index.contains(a.ravel(), b.ravel())
+    expected = [frozenset((ids[i], ids[j])) in roads for i, j in zip(a.ravel(), b.ravel())]
+    assert found.tolist() == expected
+    assert len(index) == len(roads)
+
+
+def test_edge_set_on_a_large_graph():
+    instance = generate_instance(5000, seed=1)
+    index = EdgeSet(instance.graph)
+    a, b = instance.road_pairs[:, 0], instance.road_pairs[:, 1]
+    assert index.contains(a, b).all() and index.contains(b, a).all()
+    rng = np.random.default_rng(0)
+    x, y = rng.integers(0, 5000, 2000), rng.integers(0, 5000, 2000)
+    expected = [int(w) in instance.graph.neighbor_indices(int(v)).tolist() for v, w in zip(x, y)]
+    assert index.contains(x, y).tolist() == expected
+
+
+def test_columns_match_the_strategies():
+    company, profit = greedy_company_route(MN_NODES, MN_DEPOT, MN_GRAPH, recover=True)
+    driver, earnings = greedy_driver_route(MN_NODES, MN_DEPOT, MN_GRAPH)
+    audit = audit_routes(MN_GRAPH, {"company": company, "driver": driver})
+    assert audit.row("company")["profit"] == pytest.approx(profit)
+    assert audit.row("driver")["earnings"] == pytest.approx(earnings)
+    assert audit.row("driver")["travel_cost"] == pytest.approx(_route_cost(driver, MN_GRAPH))
+    # The recovered route follows roads home; the other drives straight back
+    assert audit.invalid() == ["driver"]
+    last = len(driver) - 2
+    assert audit.row("driver")["first_invalid"] == last
+    assert MN_DEPOT not in get_neighbors(driver[last], MN_GRAPH)
+    assert audit.table["closed"].all()
+
+
+def test_masked_routes_and_index_arrays():
+    instance = generate_instance(400, seed=2)
+    graph = instance.graph
+    mask = np.zeros(len(graph), dtype=bool)
+    mask[1::2] = True
+    route, total = greedy_route(graph, graph.nodes[0], DriverEarnings(), recover=True, customers=mask)
+    stops = np.array([graph.index(node) for node in route])
+    audit = audit_routes(graph, [route, stops], customers=[mask, mask])
+    assert audit.table["earnings"] == pytest.approx([total, total])
+    assert audit.valid.all()
+    assert audit.totals()["customers"] == 2 * len(set(stops[mask[stops]].tolist()))
+
+
+def test_stops_match_greedy_with_other_depots_and_masks():
+    instance = generate_instance(300, seed=3)
+    for row in (5, 40):
+        instance.nodes[row].is_depot = True
+    graph, depot = instance.graph, instance.depot
+    route, total = greedy_route(graph, depot, DriverEarnings(), recover=True)
+    audit = audit_routes(graph, {"route": route})
+    assert audit.row("route")["earnings"] == pytest.approx(total)
+    stops = np.array([graph.index(node) for node in route] + [graph.index(node) for node in route[:4]])
+    owner = np.repeat([0, 1], [len(route), 4])
+    mask = np.zeros(len(graph), dtype=bool)
+    mask[stops[len(route) + 2]] = True
+    route_of, node_of = served_stops(len(graph), stops, owner, ["all", "masked"], {"masked": mask})
+    assert np.count_nonzero(route_of == 0) == len(set(stops[:len(route)].tolist()) - {graph.index(depot)})
+    assert node_of[route_of == 1].tolist() == [stops[len(route) + 2]]
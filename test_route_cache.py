@@ -0,0 +1,105 @@
+"""
+Greedy Algorithm Assignment - Route Cache Tests
+"""
+
+import pytest
+
+import route_cache
+from greedy_approach import greedy_driver_route
+from main import Edge, Node, NodeStore, RoadGraph
+from mn_dataset import MN_DEPOT, MN_EDGES, MN_NODES
+from route_cache import RouteCache, graph_fingerprint
+
+
+def _network():
+    store = NodeStore()
+    nodes = [Node(0, 0.0, 0.0, is_depot=True, store=store)]
+    nodes += [Node(i, float(i), float(i % 3), delivery_fee=10.0 + i, estimated_tip=2.0, store=store)
+              for i in range(1, 8)]
+    edges = [Edge(nodes[i], nodes[i + 1]) for i in range(7)] + [Edge(nodes[7], nodes[0])]
+    return nodes, edges
+
+
+def test_fingerprint_ignores_order_duplicates_and_objects():
+    nodes, edges = _network()
+    again, again_edges = _network()
+    shuffled = list(reversed(again_edges)) + [Edge(again[2], again[1])]
+    assert graph_fingerprint(edges) == graph_fingerprint(shuffled)
+    assert graph_fingerprint(edges) == graph_fingerprint(RoadGraph(edges, nodes))
+    again[3].estimated_tip = 9.0
+    assert graph_fingerprint(edges) != graph_fingerprint(again_edges)
+
+
+def test_hit_after_miss_and_invalidation_on_change():
+    nodes, edges = _network()
+    graph = RoadGraph(edges, nodes)
+    cache = RouteCache()
+    first = cache.route("driver", nodes, nodes[0], graph, recover=True)
+    second = cache.route("driver", nodes, nodes[0], graph, recover=True)
+    assert second == first
+    assert (cache.misses, cache.hits) == (1, 1)
+    nodes[4].delivery_fee = 100.0
+    changed = cache.route("driver", nodes, nodes[0], graph, recover=True)
+    assert cache.misses == 2
+    assert changed == greedy_driver_route(nodes, nodes[0], graph, recover=True)
+
+
+def test_edge_list_is_hashed_once(monkeypatch):
+    nodes, edges = _network()
+    cache = RouteCache()
+    hashes = []
+    original = route_cache._hash_network
+    monkeypatch.setattr(route_cache, "_hash_network", lambda *args: hashes.append(1) or original(*args))
+    route, total = cache.route("company", nodes, nodes[0], edges)
+    for _ in range(3):
+        assert cache.route("company", nodes, nodes[0], edges) == (route, total)
+    assert len(hashes) == 1 and cache.hits == 3
+    nodes[2].x = 1.5
+    cache.route("company", nodes, nodes[0], edges)
+    assert len(hashes) == 2 and cache.misses == 2
+    edges.append(Edge(nodes[1], nodes[5]))
+    cache.route("company", nodes, nodes[0], edges)
+    assert len(hashes) == 3 and cache.misses == 3
+
+
+def test_road_replaced_in_place_is_reindexed():
+    edges = list(MN_EDGES)
+    by_id = {node.id: node for node in MN_NODES}
+    cache = RouteCache()
+    before, _ = cache.route("driver", MN_NODES, MN_DEPOT, edges)
+    assert [node.id for node in before[:2]] == [0, 1]
+    # Same list object, same length, road 0-1 swapped for 0-2
+    k = next(i for i, edge in enumerate(edges) if {edge.u.id, edge.v.id} == {0, 1})
+    edges[k] = Edge(by_id[0], by_id[2])
+    route, total = cache.route("driver", MN_NODES, MN_DEPOT, edges)
+    expected, expected_total = greedy_driver_route(MN_NODES, MN_DEPOT, edges)
+    assert cache.misses == 2
+    assert [node.id for node in route] == [node.id for node in expected]
+    assert total == pytest.approx(expected_total)
+    assert [node.id for node in route[:2]] != [0, 1]
+
+
+def test_parameter_types():
+    key = RouteCache.key
+    depot = Node(0, 0.0, 0.0)
+    assert key("f", "ethical", depot, {"a": 0.1 + 0.2}) == key("f", "ethical", depot, {"a": 0.3})
+    assert key("f", "driver", depot, {"a": (1, 2.0)}) == key("f", "driver", depot, {"a": [1, 2.0]})
+    assert key("f", "driver", depot, {"a": {"y": 1, "x": None}}) == \
+        key("f", "driver", depot, {"a": {"x": None, "y": 1}})
+    assert key("f", "driver", depot, {"a": True}) != key("f", "driver", depot, {"a": "True"})
+    for bad in (object(), {1: 2}, [set()]):
+        with pytest.raises(TypeError):
+            key("f", "driver", depot, {"a": bad})
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    nodes, edges = _network()
+    graph = RoadGraph(edges, nodes)
+    path = str(tmp_path / "routes.sqlite")
+    cache = RouteCache(disk_path=path)
+    expected = cache.route("driver", nodes, nodes[0], graph)
+    cache.close()
+    reopened = RouteCache(max_entries=1, disk_path=path)
+    assert reopened.route("driver", nodes, nodes[0], graph) == expected
+    assert (reopened.disk_hits, reopened.misses) == (1, 0)
+    reopened.close()
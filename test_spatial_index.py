@@ -0,0 +1,94 @@
+"""
+Greedy Algorithm Assignment - Spatial Index Tests
+"""
+
+import numpy as np
+import pytest
+
+from greedy_approach import greedy_driver_route, greedy_ethical_route
+from greedy_engine import DriverEarnings, FatigueEarnings, greedy_route
+from main import Edge, Node, NodeStore, RoadGraph
+from mn_dataset import MN_DEPOT, MN_EDGES, MN_NODES
+from spatial_index import SpatialIndex, spatial_greedy_route
+
+
+def _scatter(n: int = 40, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    store = NodeStore()
+    nodes = [Node(0, 0.0, 0.0, is_depot=True, store=store)]
+    nodes += [Node(i, float(rng.uniform(-10, 10)), float(rng.uniform(-10, 10)),
+                   delivery_fee=float(rng.uniform(5, 15)), estimated_tip=float(rng.uniform(0, 4)),
+                   store=store) for i in range(1, n)]
+    return nodes
+
+
+@pytest.mark.parametrize("radius", [0.5, 3.0, 40.0])
+def test_within_matches_a_scan_after_removals(radius):
+    rng = np.random.default_rng(1)
+    x, y = rng.uniform(0, 50, 500), rng.uniform(0, 50, 500)
+    index = SpatialIndex(x, y, radius)
+    for i in rng.choice(500, 300, replace=False):
+        index.remove(int(i))
+    for qx, qy in rng.uniform(0, 50, (20, 2)):
+        points, distances = index.within(qx, qy, radius)
+        near = np.flatnonzero((np.hypot(x - qx, y - qy) <= radius) & index.alive)
+        assert sorted(points.tolist()) == near.tolist()
+        assert np.allclose(distances, np.hypot(x[points] - qx, y[points] - qy))
+
+
+def test_top_k_matches_a_scan():
+    rng = np.random.default_rng(2)
+    x, y, values = rng.uniform(0, 50, 400), rng.uniform(0, 50, 400), rng.uniform(0, 20, 400)
+    index = SpatialIndex(x, y, 2.0)
+    for qx, qy in rng.uniform(0, 50, (10, 2)):
+        points, scores = index.top_k(qx, qy, 5, values, 1.5)
+        expected = values - np.hypot(x - qx, y - qy) * 1.5
+        assert np.allclose(scores, np.sort(expected)[::-1][:5])
+
+
+def test_wide_radius_matches_greedy_on_every_pair():
+    nodes = _scatter()
+    edges = [Edge(a, b) for k, a in enumerate(nodes) for b in nodes[k + 1:]]
+    route, total = greedy_route(RoadGraph(edges, nodes), nodes[0], DriverEarnings())
+    spatial, spatial_total = spatial_greedy_route(nodes, nodes[0], DriverEarnings(), radius=100.0)
+    assert [node.id for node in spatial] == [node.id for node in route]
+    assert spatial_total == pytest.approx(total)
+
+
+def test_other_depots_are_stops_as_in_greedy():
+    nodes = _scatter()
+    for node in nodes[5:8]:
+        node.is_depot = True
+    edges = [Edge(a, b) for k, a in enumerate(nodes) for b in nodes[k + 1:]]
+    route, total = greedy_route(RoadGraph(edges, nodes), nodes[0], DriverEarnings())
+    spatial, spatial_total = spatial_greedy_route(nodes, nodes[0], DriverEarnings(), radius=100.0)
+    assert [node.id for node in spatial] == [node.id for node in route]
+    assert spatial_total == pytest.approx(total)
+    assert {5, 6, 7} <= {node.id for node in spatial[1:-1]}
+
+
+def test_fatigue_limits_hops_after_a_long_one():
+    nodes = _scatter(200)
+    objective = FatigueEarnings(long_hop_threshold=2.0, short_hop_limit=1.0)
+    route, _ = spatial_greedy_route(nodes, nodes[0], objective, radius=4.0)
+    points = np.array([(node.x, node.y) for node in route[:-1]])
+    hops = np.hypot(*np.diff(points, axis=0).T)
+    visited = {route[0].id}
+    for k in range(1, len(hops)):
+        visited.add(route[k].id)
+        if hops[k - 1] > 2.0:
+            here = route[k]
+            short = [node for node in nodes if node.id not in visited and not node.is_depot
+                     and here.distance_to(node) <= 1.0]
+            assert not short or hops[k] <= 1.0
+
+
+def test_strategies_take_the_index_as_candidate_generator():
+    route, total = greedy_ethical_route(MN_NODES, MN_DEPOT, MN_EDGES, radius=15.0, recover=True)
+    expected = spatial_greedy_route(MN_NODES, MN_DEPOT, FatigueEarnings(), 15.0, recover=True)
+    assert [node.id for node in route] == [node.id for node in expected[0]]
+    assert total == pytest.approx(expected[1])
+    with pytest.raises(ValueError):
+        greedy_ethical_route(MN_NODES, MN_DEPOT, MN_EDGES, radius=15.0, ethical_rule="fairness")
+    with pytest.raises(ValueError):
+        greedy_driver_route(MN_NODES, MN_DEPOT, MN_EDGES, radius=15.0, lookahead=2)
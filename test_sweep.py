@@ -0,0 +1,51 @@
+"""
+Greedy Algorithm Assignment - Threshold Sweep Tests
+"""
+
+import numpy as np
+import pytest
+
+from greedy_approach import greedy_driver_route, greedy_ethical_route
+from mn_dataset import MN_DEPOT, MN_GRAPH, MN_NODES
+from sweep import pareto_front, random_thresholds, sweep_thresholds, threshold_grid
+
+
+@pytest.mark.parametrize("recover", [False, True])
+def test_rows_match_the_ethical_strategy(recover):
+    pairs = threshold_grid([2.0, 6.0, 12.0], [1.0, 3.0])
+    result = sweep_thresholds(MN_GRAPH, MN_DEPOT, pairs, recover=recover, workers=1, batch=4)
+    _, baseline = greedy_driver_route(MN_NODES, MN_DEPOT, MN_GRAPH, recover=recover)
+    assert result.baseline == pytest.approx(baseline)
+    for i, (long_hop, short_hop) in enumerate(pairs):
+        route, total = greedy_ethical_route(MN_NODES, MN_DEPOT, MN_GRAPH, long_hop, short_hop, recover=recover)
+        row = result.row(i)
+        assert (row["long_hop_threshold"], row["short_hop_limit"]) == (long_hop, short_hop)
+        assert row["earnings"] == pytest.approx(total)
+        assert row["delta"] == pytest.approx(total - baseline)
+        assert row["stops"] == len({node.id for node in route}) - 1
+
+
+def test_worker_count_does_not_change_the_table():
+    pairs = random_thresholds(10, (1.0, 15.0), (0.5, 5.0), seed=3)
+    one = sweep_thresholds(MN_GRAPH, MN_DEPOT, pairs, workers=1, batch=3)
+    two = sweep_thresholds(MN_GRAPH, MN_DEPOT, pairs, workers=2, batch=3)
+    for name in one.table:
+        assert np.array_equal(one.table[name], two.table[name])
+    assert one.pareto.tolist() == two.pareto.tolist()
+
+
+def test_pareto_front_matches_pairwise_dominance():
+    rng = np.random.default_rng(0)
+    earnings = rng.integers(0, 20, 200).astype(float)
+    longest = rng.integers(0, 20, 200).astype(float)
+    front = pareto_front(earnings, longest)
+    undominated = {(earnings[i], longest[i]) for i in range(200)
+                   if not any(earnings[j] >= earnings[i] and longest[j] <= longest[i]
+                              and (earnings[j] > earnings[i] or longest[j] < longest[i])
+                              for j in range(200))}
+    assert [(earnings[i], longest[i]) for i in front] == sorted(undominated, key=lambda row: row[1])
+
+
+def test_random_thresholds_are_seeded():
+    assert random_thresholds(5, (1, 2), (0, 1), seed=7) == random_thresholds(5, (1, 2), (0, 1), seed=7)
+    assert random_thresholds(5, (1, 2), (0, 1), seed=7) != random_thresholds(5, (1, 2), (0, 1), seed=8)
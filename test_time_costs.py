@@ -0,0 +1,113 @@
+"""
+Greedy Algorithm Assignment - Time-Dependent Cost Tests
+"""
+
+import numpy as np
+import pytest
+
+from greedy_approach import greedy_driver_route
+from greedy_engine import CompanyProfit, DriverEarnings, NodeArrays, greedy_route
+from mn_dataset import MN_DEPOT, MN_EDGES, MN_GRAPH, MN_NODES
+from synthetic_dataset import generate_instance
+from time_costs import MINUTES_PER_DAY, TimeCosts, rush_hour_profile
+from travel_costs import TravelCosts
+
+
+def _ids(route):
+    return [node.id for node in route]
+
+
+@pytest.mark.parametrize("recover", [False, True])
+@pytest.mark.parametrize("objective", [CompanyProfit, DriverEarnings])
+def test_flat_roads_match_greedy_route(objective, recover):
+    costs = TimeCosts(MN_GRAPH)
+    route, total = greedy_route(MN_GRAPH, MN_DEPOT, objective(), recover=recover)
+    timed, timed_total = greedy_route(MN_GRAPH, MN_DEPOT, objective(), recover=recover,
+                                      time_costs=costs, departure=7 * 60.0)
+    assert _ids(timed) == _ids(route)
+    assert timed_total == pytest.approx(total)
+
+
+def test_uniform_multiplier_scales_the_travel_cost():
+    instance = generate_instance(300, seed=4)
+    graph, depot = instance.graph, instance.depot
+    costs = TimeCosts(graph)
+    costs.set_profile("double", np.full(costs.buckets, 2.0))
+    costs.set_roads(instance.edges(), profile="double")
+    travel = TravelCosts.for_graph(graph)
+    assert np.allclose(costs.table, 2.0 * travel.costs)
+    route, total = greedy_route(graph, depot, CompanyProfit(), recover=True, time_costs=costs)
+    stops = np.array([graph.index(node) for node in route])
+    assert all(b in graph.neighbor_indices(a) for a, b in zip(stops, stops[1:]))
+    # Every hop is a road, so each mile is charged twice the flat rate
+    served = np.unique(stops[~NodeArrays.for_graph(graph).is_depot[stops]])
+    rewards = CompanyProfit().rewards(NodeArrays.for_graph(graph))
+    driven = float(np.hypot(np.diff(travel.x[stops]), np.diff(travel.y[stops])).sum())
+    assert total == pytest.approx(rewards[served].sum() - 2.0 * driven * costs.base_cost_per_mile)
+
+
+def test_profile_changes_rewrite_only_their_roads():
+    instance = generate_instance(200, seed=5)
+    costs = TimeCosts(instance.graph)
+    flat = costs.table.copy()
+    rush = rush_hour_profile(peak=3.0)
+    costs.set_profile("rush", rush)
+    roads = instance.edges()[:10]
+    costs.set_roads(roads, profile="rush", cost_per_mile=1.0)
+    index = instance.graph.index
+    slots = sorted({costs._slot(a, b) for road in roads
+                    for a, b in ((index(road.u), index(road.v)), (index(road.v), index(road.u)))})
+    others = np.setdiff1d(np.arange(len(costs.lengths)), slots)
+    assert np.array_equal(costs.table[:, others], flat[:, others])
+    expected = rush[:, None] * costs.lengths[slots]
+    assert np.allclose(costs.table[:, slots], expected)
+    costs.set_profile("rush", np.ones(costs.buckets))
+    assert np.allclose(costs.table[:, slots], costs.lengths[slots])
+
+
+def test_hop_costs_follow_the_clock():
+    instance = generate_instance(200, seed=6)
+    costs = TimeCosts(instance.graph)
+    costs.set_profile("rush", rush_hour_profile())
+    costs.set_roads(instance.edges(), profile="rush")
+    assert np.allclose(costs.hop_costs(8 * 60.0), 1.8 * costs.hop_costs(12 * 60.0))
+    # The day wraps around
+    assert np.array_equal(costs.hop_costs(8 * 60.0 + MINUTES_PER_DAY), costs.hop_costs(8 * 60.0))
+    # A path starting just before the rush pays peak rates once the clock reaches it
+    a, b = instance.graph.index(instance.edges()[0].u), instance.graph.index(instance.edges()[0].v)
+    hop = float(costs.lengths[costs._slot(a, b)])
+    start = 7 * 60.0 - costs.minutes(hop) / 2
+    total, end = costs.path_cost([a, b, a], start)
+    assert total == pytest.approx(2.8 * hop * costs.base_cost_per_mile)
+    assert end == pytest.approx(start + 2 * costs.minutes(hop))
+
+
+def test_sync_reprices_moved_nodes_and_keeps_profiles():
+    instance = generate_instance(200, seed=7)
+    graph = instance.graph
+    costs = TimeCosts.for_graph(graph)
+    assert TimeCosts.for_graph(graph) is costs
+    costs.set_profile("rush", rush_hour_profile())
+    costs.set_roads(instance.edges(), profile="rush")
+    instance.nodes[1].x += 3.0
+    costs.sync()
+    travel = TravelCosts.for_graph(graph)
+    assert np.allclose(costs.table, costs.profiles[costs.profile].T * travel.costs)
+
+
+def test_rejects_uneven_buckets_and_wrong_profile_length():
+    with pytest.raises(ValueError):
+        TimeCosts(MN_GRAPH, bucket_minutes=7.0)
+    costs = TimeCosts(MN_GRAPH)
+    with pytest.raises(ValueError):
+        costs.set_profile("short", [1.0, 2.0])
+    with pytest.raises(KeyError):
+        costs.path_cost([0, 0], 0.0)
+
+
+def test_model_of_another_graph_is_rejected():
+    other = TimeCosts.for_graph(generate_instance(200, seed=8).graph)
+    with pytest.raises(ValueError):
+        greedy_driver_route(MN_NODES, MN_DEPOT, MN_GRAPH, time_costs=other)
+    with pytest.raises(ValueError):
+        greedy_route(MN_EDGES, MN_DEPOT, DriverEarnings(), time_costs=TimeCosts(MN_GRAPH))
@@ -0,0 +1,49 @@
+"""
+Greedy Algorithm Assignment - Tip Uncertainty Tests
+"""
+
+import numpy as np
+import pytest
+
+from greedy_approach import greedy_company_route, greedy_driver_route
+from mn_dataset import MN_DEPOT, MN_GRAPH, MN_NODES
+from tip_uncertainty import TipModel, evaluate_routes
+
+
+def _routes():
+    company, _ = greedy_company_route(MN_NODES, MN_DEPOT, MN_GRAPH, recover=True)
+    driver, total = greedy_driver_route(MN_NODES, MN_DEPOT, MN_GRAPH, recover=True)
+    return {"company": company, "driver": driver}, total
+
+
+def test_fixed_tips_reproduce_the_driver_total():
+    routes, total = _routes()
+    report = evaluate_routes(MN_GRAPH, routes, scenarios=50, model=TipModel(tip_cv=0.0, no_tip=0.0))
+    assert report.row("driver")["expected"] == pytest.approx(total)
+    assert np.allclose(report.earnings, report.expected, rtol=1e-5)
+    assert report.row("company")["p_beat"] == 0.0
+
+
+def test_same_seed_same_scenarios():
+    routes, _ = _routes()
+    first = evaluate_routes(MN_GRAPH, routes, scenarios=200, seed=4)
+    second = evaluate_routes(MN_GRAPH, routes, scenarios=200, seed=4)
+    assert np.array_equal(first.earnings, second.earnings)
+    assert first.row("driver")["q05"] <= first.row("driver")["q50"] <= first.row("driver")["q95"]
+
+
+def test_masked_customers_earn_nothing():
+    routes, _ = _routes()
+    model = TipModel(tip_cv=0.0, no_tip=0.0)
+    nobody = np.zeros(len(MN_GRAPH), dtype=bool)
+    report = evaluate_routes(MN_GRAPH, routes, scenarios=10, model=model, customers={"driver": nobody})
+    full = evaluate_routes(MN_GRAPH, routes, scenarios=10, model=model)
+    assert report.row("driver")["expected"] < 0
+    assert report.row("company")["expected"] == pytest.approx(full.row("company")["expected"])
+
+
+@pytest.mark.parametrize("scenarios", [0, -1])
+def test_needs_a_scenario(scenarios):
+    routes, _ = _routes()
+    with pytest.raises(ValueError):
+        evaluate_routes(MN_GRAPH, routes, scenarios=scenarios)
@@ -0,0 +1,241 @@
+"""
+Greedy Algorithm Assignment - Time-Dependent Travel Costs
+
+calculate_travel_cost charges distance * base_cost_per_mile on every road
+at every hour. Real costs depend on the road and the time of day: the
+I-94 corridor is slow at rush hour, a rural road is not.
+
+Every road here has a cost per mile and follows one multiplier profile,
+which gives a factor per time bucket of the day (e.g. per hour). The cost
+of leaving by each road slot in each bucket is precomputed into a tensor
+stored bucket-major, table[bucket, slot], so the greedy engine reads the
+costs of the whole frontier for the current departure time as one slice,
+aligned with the graph's CSR arrays just like TravelCosts.costs. Changing
+a profile or a road rewrites only the tensor columns of the roads
+concerned.
+
+The driver's clock is minutes after midnight and advances with each hop
+at a fixed speed; profiles wrap around at the end of the day.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from main import Edge, RoadGraph
+from travel_costs import TravelCosts
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def rush_hour_profile(bucket_minutes: float = 60.0, peak: float = 1.8,
+                      windows: Sequence[Tuple[float, float]] = ((7.0, 9.0), (16.0, 18.0))) -> np.ndarray:
+    """
+    Multipliers that are peak inside the rush-hour windows and 1 elsewhere.
+
+    Args:
+        bucket_minutes (float): Length of a time bucket
+        peak (float): Multiplier during rush hour
+        windows (Sequence[Tuple[float, float]]): (start, end) hours of each rush
+
+    Returns:
+        np.ndarray: One multiplier per bucket of the day
+    """
+    starts = np.arange(0.0, MINUTES_PER_DAY, bucket_minutes) / 60.0
+    profile = np.ones(len(starts))
+    for begin, end in windows:
+        profile[(starts >= begin) & (starts < end)] = peak
+    return profile
+
+
+class TimeCosts:
+    """
+    Precomputed per-road, per-time-bucket travel costs for a RoadGraph.
+
+    table[b, slot] is the cost of driving the road in CSR slot `slot` when
+    departing in time bucket b: its length times its cost per mile times its
+    profile's multiplier for b. Profile 0, "flat", is all ones; every road
+    starts on it at base_cost_per_mile, which makes the table equal to
+    TravelCosts.costs in every bucket.
+
+    Attributes:
+        graph (RoadGraph): The indexed road network
+        bucket_minutes (float): Length of a time bucket
+        buckets (int): Buckets per day
+        speed (float): Driving speed in distance units per hour
+        base_cost_per_mile (float): Cost per mile of roads not given their own
+            rate, and of straight-line drives where there is no road
+        rate (np.ndarray): Cost per mile for every CSR slot
+        profile (np.ndarray): Profile number for every CSR slot
+        profiles (np.ndarray): (profiles, buckets) multipliers
+        names (List[str]): Profile names, by number
+        table (np.ndarray): (buckets, slots) costs
+        node_version (int): graph.node_version of the coordinates the lengths came from
+    """
+
+    def __init__(self, graph: RoadGraph, bucket_minutes: float = 60.0,
+                 base_cost_per_mile: float = 0.50, speed: float = 30.0):
+        if MINUTES_PER_DAY % bucket_minutes:
+            raise ValueError("bucket_minutes must divide the day evenly")
+        travel = TravelCosts.for_graph(graph, base_cost_per_mile)
+        self.graph = graph
+        self.bucket_minutes = float(bucket_minutes)
+        self.buckets = int(MINUTES_PER_DAY // bucket_minutes)
+        self.speed = speed
+        self.base_cost_per_mile = base_cost_per_mile
+        self.node_version = travel.node_version
+        self.lengths = travel.lengths
+        self.rate = np.full(len(self.lengths), base_cost_per_mile)
+        self.profile = np.zeros(len(self.lengths), dtype=np.intp)
+        self.profiles = np.ones((1, self.buckets))
+        self.names: List[str] = ["flat"]
+        self._members: Dict[int, np.ndarray] = {}
+        self.table = np.empty((self.buckets, len(self.lengths)))
+        self.table[:] = travel.costs
+
+    @classmethod
+    def for_graph(cls, graph: RoadGraph, bucket_minutes: float = 60.0,
+                  base_cost_per_mile: float = 0.50, speed: float = 30.0) -> "TimeCosts":
+        """
+        Return the time-dependent cost model for a graph, building it on first use.
+
+        The model is kept in graph.derived, so profiles and road settings
+        made through it are seen by every strategy routed on the graph.
+        """
+        key = ("time_costs", bucket_minutes, base_cost_per_mile, speed)
+        costs = graph.derived.get(key)
+        if costs is None:
+            costs = cls(graph, bucket_minutes, base_cost_per_mile, speed)
+            graph.derived[key] = costs
+        return costs.sync()
+
+    def sync(self) -> "TimeCosts":
+        """
+        Recompute the road lengths and the whole table if a node has moved.
+
+        Profiles and per-road rates are kept. The greedy engine calls this
+        before routing, so a model built earlier never prices stale lengths.
+
+        Returns:
+            TimeCosts: self
+        """
+        travel = TravelCosts.for_graph(self.graph, self.base_cost_per_mile)
+        if travel.node_version != self.node_version:
+            self.node_version = travel.node_version
+            self.lengths = travel.lengths
+            self.table[:] = self.profiles[self.profile].T * (self.lengths * self.rate)
+        return self
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def bucket(self, minutes: float) -> int:
+        """Time bucket of a clock time in minutes after midnight (wrapping daily)."""
+        return int(minutes // self.bucket_minutes) % self.buckets
+
+    def hop_costs(self, minutes: float) -> np.ndarray:
+        """Cost of every CSR slot for a departure at the given clock time."""
+        return self.table[int(minutes // self.bucket_minutes) % self.buckets]
+
+    def minutes(self, distance: float) -> float:
+        """Driving time of a distance, in minutes."""
+        return distance * 60.0 / self.speed
+
+    def straight_cost(self, distance: float, minutes: float) -> float:
+        """Cost of a straight-line drive (no road) departing at the given time."""
+        return distance * self.base_cost_per_mile * self.profiles[0, self.bucket(minutes)]
+
+    def path_cost(self, path: Sequence[int], minutes: float) -> Tuple[float, float]:
+        """
+        Cost of driving a road path hop by hop, each hop at its own departure time.
+
+        Args:
+            path (Sequence[int]): Dense node indices, consecutive ones joined by roads
+            minutes (float): Clock time at the start of the path
+
+        Returns:
+            Tuple[float, float]: (total cost, clock time at the end)
+        """
+        total = 0.0
+        for u, v in zip(path, path[1:]):
+            slot = self._slot(u, v)
+            total += float(self.table[self.bucket(minutes), slot])
+            minutes += self.minutes(float(self.lengths[slot]))
+        return total, minutes
+
+    def _slot(self, u: int, v: int) -> int:
+        offsets = self.graph.offsets
+        for slot in range(offsets[u], offsets[u + 1]):
+            if self.graph.targets[slot] == v:
+                return slot
+        raise KeyError(f"no road between dense indices {u} and {v}")
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def set_profile(self, name: str, multipliers: Sequence[float]) -> int:
+        """
+        Add a profile, or replace the multipliers of an existing one.
+
+        Only the tensor columns of roads on the profile are rewritten.
+
+        Args:
+            name (str): Profile name
+            multipliers (Sequence[float]): One factor per time bucket
+
+        Returns:
+            int: Profile number
+        """
+        multipliers = np.asarray(multipliers, dtype=np.float64)
+        if multipliers.shape != (self.buckets,):
+            raise ValueError(f"need one multiplier per bucket ({self.buckets})")
+        if name in self.names:
+            number = self.names.index(name)
+            self.profiles[number] = multipliers
+            slots = self._members_of(number)
+            self.table[:, slots] = multipliers[:, None] * (self.lengths[slots] * self.rate[slots])
+        else:
+            number = len(self.names)
+            self.names.append(name)
+            self.profiles = np.vstack([self.profiles, multipliers])
+        return number
+
+    def set_roads(self, roads: Sequence[Edge], profile: Optional[str] = None,
+                  cost_per_mile: Optional[float] = None):
+        """
+        Put roads on a profile and/or give them their own cost per mile.
+
+        Both directions of each road change. Only their tensor columns are
+        rewritten.
+
+        Args:
+            roads (Sequence[Edge]): Roads of the graph
+            profile (str): Name of a profile added with set_profile
+            cost_per_mile (float): New cost per mile
+        """
+        index = self.graph.index
+        slots = np.array([self._slot(a, b) for road in roads
+                          for a, b in ((index(road.u), index(road.v)), (index(road.v), index(road.u)))],
+                         dtype=np.intp)
+        if profile is not None:
+            self.profile[slots] = self.names.index(profile)
+            self._members.clear()
+        if cost_per_mile is not None:
+            self.rate[slots] = cost_per_mile
+        self._refresh(slots)
+
+    def _members_of(self, number: int) -> np.ndarray:
+        slots = self._members.get(number)
+        if slots is None:
+            slots = np.flatnonzero(self.profile == number)
+            self._members[number] = slots
+        return slots
+
+    def _refresh(self, slots: np.ndarray):
+        self.table[:, slots] = self.profiles[self.profile[slots]].T * (self.lengths[slots] * self.rate[slots])
+
+    def __repr__(self):
+        return (f"TimeCosts({len(self.lengths)} slots x {self.buckets} buckets, "
+                f"profiles={self.names})")
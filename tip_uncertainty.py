@@ -0,0 +1,200 @@
+"""
+Greedy Algorithm Assignment - Monte Carlo Tip Uncertainty
+
+estimated_tip is a point estimate; real tips vary a lot, and some
+customers do not tip at all. This module scores a set of finished routes
+(for example one per strategy) under thousands of sampled tip and fee
+scenarios and reports each route's earnings distribution: mean, spread,
+quantiles and the chance of beating a baseline route in the same
+scenario.
+
+Routes are reduced once to a stop-incidence matrix over the customers
+any of them serves, plus a fixed travel cost per route (travel does not
+depend on tips). Each chunk of scenarios is then sampled as a (scenarios
+x customers) matrix and multiplied by the incidence matrix, giving every
+route's earnings in every scenario in one NumPy product.
+"""
+
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from main import Node, Edge, RoadGraph, as_road_graph
+from greedy_engine import NodeArrays
+from route_audit import served_stops
+from travel_costs import TravelCosts
+
+# Sampled values held in memory per chunk of scenarios
+_CHUNK_VALUES = 1 << 22
+
+
+class TipModel:
+    """
+    How tips and fees vary around their estimates.
+
+    A customer tips nothing with probability no_tip; otherwise the tip is
+    lognormal, scaled so the expected tip (zeros included) is still
+    estimated_tip, with coefficient of variation tip_cv. Fees are normal
+    around delivery_fee with coefficient of variation fee_cv, cut off at 0.
+
+    Attributes:
+        tip_cv (float): Spread of a paid tip relative to its mean
+        no_tip (float): Probability that a customer does not tip
+        fee_cv (float): Spread of the fee relative to delivery_fee (0 = fixed)
+    """
+
+    def __init__(self, tip_cv: float = 0.6, no_tip: float = 0.1, fee_cv: float = 0.0):
+        if not 0.0 <= no_tip < 1.0:
+            raise ValueError("no_tip must be in [0, 1)")
+        self.tip_cv = tip_cv
+        self.no_tip = no_tip
+        self.fee_cv = fee_cv
+
+    def sample(self, fees: np.ndarray, tips: np.ndarray, scenarios: int,
+               rng: np.random.Generator) -> np.ndarray:
+        """
+        Sampled fee + tip per scenario (rows) and customer (columns).
+
+        Args:
+            fees (np.ndarray): Estimated fee per customer
+            tips (np.ndarray): Estimated tip per customer
+            scenarios (int): Rows to sample
+            rng (np.random.Generator): Random source
+
+        Returns:
+            np.ndarray: (scenarios, customers) float32 array of rewards
+        """
+        shape = (scenarios, len(tips))
+        sigma = np.sqrt(np.log1p(self.tip_cv ** 2))
+        paid = (np.maximum(tips, 0.0) / (1.0 - self.no_tip)).astype(np.float32)
+        # Lognormal with mean 1, scaled per customer (single precision halves the sampling time)
+        rewards = rng.standard_normal(shape, dtype=np.float32)
+        rewards *= sigma
+        rewards -= sigma * sigma / 2
+        np.exp(rewards, out=rewards)
+        rewards *= paid
+        if self.no_tip > 0:
+            rewards[rng.random(shape, dtype=np.float32) < self.no_tip] = 0.0
+        if self.fee_cv > 0:
+            rewards += np.maximum(rng.normal(fees, self.fee_cv * np.abs(fees), size=shape), 0.0)
+        else:
+            rewards += fees.astype(np.float32)
+        return rewards
+
+
+class TipRiskReport:
+    """
+    Earnings distributions of several routes over the same scenarios.
+
+    Attributes:
+        names (List[str]): Route names, in input order
+        earnings (np.ndarray): (scenarios, routes) earnings per scenario
+        expected (np.ndarray): Earnings per route at the point estimates
+        baseline (str | float): Route name or fixed earnings compared against
+        table (Dict[str, np.ndarray]): One array per statistic, one entry per
+            route: mean, std, the requested quantiles (as "q05" etc.),
+            expected, and p_beat (share of scenarios in which the route
+            earns strictly more than the baseline)
+    """
+
+    def __init__(self, names: List[str], earnings: np.ndarray, expected: np.ndarray,
+                 baseline: Union[str, float], quantiles: Sequence[float]):
+        self.names = names
+        self.earnings = earnings
+        self.expected = expected
+        self.baseline = baseline
+        reference = earnings[:, names.index(baseline)] if isinstance(baseline, str) \
+            else np.full(len(earnings), float(baseline))
+        self.table: Dict[str, np.ndarray] = {
+            "mean": earnings.mean(axis=0),
+            "std": earnings.std(axis=0),
+            "expected": expected,
+        }
+        for q, values in zip(quantiles, np.quantile(earnings, quantiles, axis=0)):
+            self.table[f"q{round(q * 100):02d}"] = values
+        self.table["p_beat"] = (earnings > reference[:, None]).mean(axis=0)
+
+    def row(self, name: str) -> dict:
+        """One route's statistics as a dict."""
+        i = self.names.index(name)
+        return {column: values[i].item() for column, values in self.table.items()}
+
+    def __len__(self) -> int:
+        return len(self.earnings)
+
+    def __repr__(self):
+        return f"TipRiskReport({len(self.names)} routes, {len(self)} scenarios)"
+
+
+def evaluate_routes(edges: Union[List[Edge], RoadGraph], routes: Dict[str, List[Node]],
+                    scenarios: int = 10_000, model: Optional[TipModel] = None,
+                    baseline: Union[str, float, None] = None,
+                    quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95),
+                    seed: int = 0, nodes: Optional[List[Node]] = None,
+                    customers: Union[np.ndarray, Dict[str, np.ndarray], None] = None) -> TipRiskReport:
+    """
+    Score routes under sampled tip and fee scenarios.
+
+    A route earns the sampled fee and tip of every stop route_audit's
+    served_stops() finds in it, minus the travel cost of every hop: the
+    same accounting as the driver strategy's total.
+
+    Args:
+        edges (List[Edge] | RoadGraph): Road connections, or their index
+        routes (Dict[str, List[Node]]): Routes to compare, by name
+        scenarios (int): Scenarios to sample
+        model (TipModel): Tip and fee variation (default: TipModel())
+        baseline (str | float): Name of the route to compare against, or fixed
+            earnings (default: the first route)
+        quantiles (Sequence[float]): Quantiles to report, between 0 and 1
+        seed (int): Seed for the scenarios; the same seed gives the same scenarios
+        nodes (List[Node]): Optional nodes to index along with the edges
+        customers (np.ndarray | Dict[str, np.ndarray]): Boolean mask by dense
+            index of the nodes a route may stop at, for every route or by
+            route name (routes not named count every customer); None counts
+            every customer
+
+    Returns:
+        TipRiskReport: Per-route earnings distributions
+    """
+    if not routes:
+        raise ValueError("need at least one route")
+    if scenarios < 1:
+        raise ValueError("need at least one scenario")
+    graph = as_road_graph(edges, nodes)
+    model = model if model is not None else TipModel()
+    baseline = baseline if baseline is not None else next(iter(routes))
+    if isinstance(baseline, str) and baseline not in routes:
+        raise KeyError(f"baseline route {baseline!r} not among the routes")
+    travel = TravelCosts.for_graph(graph)
+    arrays = NodeArrays.for_graph(graph)
+
+    names = list(routes)
+    stops = [np.fromiter((graph.index(node) for node in routes[name]), dtype=np.intp,
+                         count=len(routes[name])) for name in names]
+    lengths = np.array([len(route) for route in stops])
+    everything = np.concatenate(stops) if stops else np.zeros(0, dtype=np.intp)
+    owner = np.repeat(np.arange(len(names)), lengths)
+
+    # Travel cost per route: every hop, with no hop across two routes
+    hops = np.hypot(np.diff(travel.x[everything]), np.diff(travel.y[everything]))
+    same = owner[1:] == owner[:-1]
+    travel_cost = np.bincount(owner[1:][same], weights=hops[same], minlength=len(names)) \
+        * travel.base_cost_per_mile
+
+    # Stop incidence over the customers any route serves
+    route_of, node_of = served_stops(len(graph), everything, owner, names, customers)
+    served, column = np.unique(node_of, return_inverse=True)
+    incidence = np.zeros((len(served), len(names)))
+    incidence[column, route_of] = 1.0
+
+    fees, tips = arrays.fees[served], arrays.tips[served]
+    expected = (fees + tips) @ incidence - travel_cost
+    rng = np.random.default_rng(seed)
+    chunk = max(1, _CHUNK_VALUES // max(len(served), 1))
+    earnings = np.empty((scenarios, len(names)))
+    for start in range(0, scenarios, chunk):
+        count = min(chunk, scenarios - start)
+        earnings[start:start + count] = model.sample(fees, tips, count, rng) @ incidence
+    earnings -= travel_cost
+    return TipRiskReport(names, earnings, expected, baseline, quantiles)
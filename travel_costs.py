@@ -0,0 +1,193 @@
+"""
+Greedy Algorithm Assignment - Precomputed Travel Costs
+
+NumPy-backed store of road lengths and travel costs for a RoadGraph.
+Every directed road slot in the graph's CSR arrays gets its length and
+cost computed in one batched pass from the node coordinate arrays, so the
+greedy loops can read hop costs instead of calling distance_to per pair.
+"""
+
+import math
+from array import array
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from main import Node, NodeStore, RoadGraph
+
+
+class TravelCosts:
+    """
+    Per-road lengths and travel costs aligned with a RoadGraph's CSR arrays.
+
+    lengths[slot] and costs[slot] describe the road from the node owning
+    the slot to graph.targets[slot]. Costs use the same formula as
+    calculate_travel_cost: distance * base_cost_per_mile.
+
+    Attributes:
+        graph (RoadGraph): The indexed road network
+        base_cost_per_mile (float): Cost per unit distance
+        x (np.ndarray): X-coordinates by dense node index
+        y (np.ndarray): Y-coordinates by dense node index
+        targets (np.ndarray): Copy of graph.targets as an index array
+        lengths (np.ndarray): Road length for every CSR slot
+        costs (np.ndarray): Travel cost for every CSR slot
+        node_version (int): graph.node_version(*COLUMNS) the coordinates were read at
+    """
+
+    COLUMNS = ("x", "y")
+
+    def __init__(self, graph: RoadGraph, base_cost_per_mile: float = 0.50):
+        self.graph = graph
+        self.base_cost_per_mile = base_cost_per_mile
+        n = len(graph)
+        self.node_version = graph.node_version(*self.COLUMNS)
+        self.x = node_column(graph.nodes, "x", np.float64)
+        self.y = node_column(graph.nodes, "y", np.float64)
+
+        offsets = np.array(graph.offsets, dtype=np.intp)
+        self.targets = np.array(graph.targets, dtype=np.intp)
+        sources = np.repeat(np.arange(n, dtype=np.intp), np.diff(offsets))
+        dx = self.x[sources] - self.x[self.targets]
+        dy = self.y[sources] - self.y[self.targets]
+        self.lengths = np.sqrt(dx * dx + dy * dy)
+        self.costs = self.lengths * base_cost_per_mile
+
+    @classmethod
+    def for_graph(cls, graph: RoadGraph, base_cost_per_mile: float = 0.50) -> "TravelCosts":
+        """
+        Return the cost store for a graph, building it on first use.
+
+        The store is kept in graph.derived, so every strategy run on the
+        same RoadGraph shares one batched computation. It is built again
+        once a node of the graph has moved.
+        """
+        key = ("travel_costs", base_cost_per_mile)
+        costs = graph.derived.get(key)
+        if costs is None or costs.node_version != graph.node_version(*cls.COLUMNS):
+            costs = cls(graph, base_cost_per_mile)
+            graph.derived[key] = costs
+        return costs
+
+    def hops(self, i: int) -> Iterator[Tuple[int, float, float]]:
+        """
+        Iterate over the roads leaving the node at dense index i.
+
+        Yields:
+            Tuple[int, float, float]: (neighbor index, road length, travel cost)
+        """
+        start, end = self.graph.offsets[i], self.graph.offsets[i + 1]
+        return zip(self.graph.targets[start:end],
+                   self.lengths[start:end].tolist(),
+                   self.costs[start:end].tolist())
+
+    def distance(self, i: int, j: int) -> float:
+        """Straight-line distance between two nodes given by dense index."""
+        dx = float(self.x[i] - self.x[j])
+        dy = float(self.y[i] - self.y[j])
+        return math.sqrt(dx * dx + dy * dy)
+
+    def cost(self, i: int, j: int) -> float:
+        """Travel cost of the straight line between two nodes given by dense index."""
+        return self.distance(i, j) * self.base_cost_per_mile
+
+    def hop_minutes(self, stops: np.ndarray, speed: float) -> np.ndarray:
+        """
+        Driving minutes of each hop of a route given by dense indices.
+
+        A hop takes its straight-line length at the given speed (distance
+        units per hour), which for consecutive nodes joined by a road is the
+        road length.
+        """
+        return np.hypot(np.diff(self.x[stops]), np.diff(self.y[stops])) * (60.0 / speed)
+
+    def route_cost(self, route: List[Node]) -> float:
+        """Total travel cost along a route, summed hop by hop."""
+        if len(route) < 2:
+            return 0.0
+        index = self.graph.index
+        stops = np.fromiter((index(node) for node in route), dtype=np.intp, count=len(route))
+        return _sum_hop_costs(self.x[stops], self.y[stops], self.base_cost_per_mile)
+
+
+def route_travel_cost(route: List[Node], base_cost_per_mile: float = 0.50) -> float:
+    """
+    Total travel cost along a route without a prebuilt graph.
+
+    Args:
+        route (List[Node]): The sequence of nodes visited
+        base_cost_per_mile (float): Cost per unit distance
+
+    Returns:
+        float: Sum of straight-line hop costs
+    """
+    if len(route) < 2:
+        return 0.0
+    x = np.fromiter((node.x for node in route), dtype=np.float64, count=len(route))
+    y = np.fromiter((node.y for node in route), dtype=np.float64, count=len(route))
+    return _sum_hop_costs(x, y, base_cost_per_mile)
+
+
+def _sum_hop_costs(x: np.ndarray, y: np.ndarray, base_cost_per_mile: float) -> float:
+    dx = np.diff(x)
+    dy = np.diff(y)
+    return float((np.sqrt(dx * dx + dy * dy) * base_cost_per_mile).sum())
+
+
+# ============================================================================
+# NUMPY BRIDGES
+# ============================================================================
+
+def node_column(nodes: Sequence[Node], name: str, dtype) -> np.ndarray:
+    """
+    Gather one NodeStore column for a sequence of nodes as a NumPy array.
+
+    Nodes backed by a single NodeStore are gathered straight from the
+    store's typed array; otherwise the attribute is read node by node.
+
+    Args:
+        nodes (Sequence[Node]): Nodes in the order wanted (a list or a NodeStore)
+        name (str): NodeStore column name (e.g. "x", "delivery_fee", "region_code")
+        dtype: NumPy dtype matching the column's typecode
+
+    Returns:
+        np.ndarray: One value per node
+    """
+    n = len(nodes)
+    if isinstance(nodes, NodeStore):
+        return _frombuffer(getattr(nodes, name), dtype).copy()
+    store = common_store(nodes)
+    if store is not None:
+        rows = np.fromiter((node.row for node in nodes), dtype=np.intp, count=n)
+        return _frombuffer(getattr(store, name), dtype)[rows]
+    attribute = _ATTRIBUTE_OF_COLUMN.get(name, name)
+    return np.fromiter((getattr(node, attribute) for node in nodes), dtype=dtype, count=n)
+
+
+_ATTRIBUTE_OF_COLUMN = {"ids": "id"}
+
+
+def common_store(nodes: Sequence[Node]) -> Optional[NodeStore]:
+    """The NodeStore behind every node in the sequence, or None if they differ."""
+    if isinstance(nodes, NodeStore):
+        return nodes
+    store = None
+    for node in nodes:
+        if store is None:
+            store = node.store
+        elif node.store is not store:
+            return None
+    return store
+
+
+def _frombuffer(column: array, dtype) -> np.ndarray:
+    if len(column) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.frombuffer(column, dtype=dtype)
+
+
+def typed_array(values: np.ndarray, typecode: str) -> array:
+    """Copy a NumPy array into a stdlib array of the given typecode in one block."""
+    out = array(typecode)
+    out.frombytes(np.ascontiguousarray(values, dtype=np.dtype(typecode)).tobytes())
+    return out
@@ -0,0 +1,128 @@
+"""
+Greedy Algorithm Assignment - Process Pool over a Shared Road Graph
+
+Parallel planners (fleets, multi-start, sweeps, multi-depot) run many
+independent greedy passes over one road network. A GraphPool gives every
+worker process the graph once, through a memory-mapped dataset file
+(road_dataset.py), so the pages are shared by all workers and no node or
+edge list is pickled per task. Tasks carry only their own parameters and
+return dense node indices, which the caller maps back to its own Nodes.
+
+A task is a module-level function fn(graph, task) -> result. With a
+single worker the tasks run in-process on the caller's graph.
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from main import RoadGraph
+from road_dataset import open_dataset, write_dataset
+
+# The graph mapped by this worker process (set by the pool initializer)
+_worker_graph: Optional[RoadGraph] = None
+
+
+def _load_graph(path: str):
+    global _worker_graph
+    _worker_graph = open_dataset(path).graph
+
+
+def _run(fn: Callable[[RoadGraph, Any], Any], task: Any) -> Any:
+    return fn(_worker_graph, task)
+
+
+def default_workers() -> int:
+    """Number of CPUs this process may use."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class GraphPool:
+    """
+    A pool of worker processes sharing one read-only road graph.
+
+    Usage:
+        with GraphPool(graph, workers=8) as pool:
+            results = pool.map(plan_one, tasks)
+
+    Attributes:
+        graph (RoadGraph): The caller's graph
+        workers (int): Number of worker processes (1 runs tasks in-process)
+    """
+
+    def __init__(self, graph: RoadGraph, workers: Optional[int] = None):
+        """
+        Args:
+            graph (RoadGraph): Road network every task runs on
+            workers (int): Worker processes (default: one per available CPU)
+        """
+        self.graph = graph
+        self.workers = max(1, workers if workers is not None else default_workers())
+        self._executor = None
+        self._tmpdir = None
+        if self.workers > 1:
+            path = graph.derived.get("dataset_path")
+            if path is None:
+                self._tmpdir = tempfile.mkdtemp(prefix="graph-pool-")
+                path = os.path.join(self._tmpdir, "graph.roads")
+                write_dataset(path, graph)
+            self._executor = ProcessPoolExecutor(self.workers, initializer=_load_graph,
+                                                 initargs=(path,))
+
+    def map(self, fn: Callable[[RoadGraph, Any], Any], tasks: Iterable[Any],
+            chunksize: int = 1) -> List[Any]:
+        """
+        Run fn(graph, task) for every task.
+
+        Args:
+            fn (Callable): Module-level function (it is sent to workers by name)
+            tasks (Iterable): Task parameters; each must be picklable
+            chunksize (int): Tasks sent to a worker at a time
+
+        Returns:
+            List[Any]: Results in task order
+        """
+        return list(self.imap(fn, tasks, chunksize))
+
+    def imap(self, fn: Callable[[RoadGraph, Any], Any], tasks: Iterable[Any],
+             chunksize: int = 1) -> Iterator[Any]:
+        """Like map(), but yields results in task order as they become available."""
+        if self._executor is None:
+            return (fn(self.graph, task) for task in tasks)
+        tasks = list(tasks)
+        return self._executor.map(_run, [fn] * len(tasks), tasks, chunksize=chunksize)
+
+    def submit(self, fn: Callable[[RoadGraph, Any], Any], task: Any) -> Future:
+        """
+        Start fn(graph, task) and return a Future for its result.
+
+        With a single worker the task runs immediately, in the calling thread.
+        """
+        if self._executor is not None:
+            return self._executor.submit(_run, fn, task)
+        future: Future = Future()
+        try:
+            future.set_result(fn(self.graph, task))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+    def close(self):
+        """Shut the workers down and remove any temporary dataset file."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+
+    def __enter__(self) -> "GraphPool":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()